@@ -29,9 +29,6 @@ from datetime import datetime, timedelta
 # pip install puresnmp
 import puresnmp
 
-# pip install pyzmq
-import zmq
-
 from flask import has_app_context
 
 import queue
@@ -40,26 +37,34 @@ import threading
 
 # LLM 초기화
 from .scripts.llm_loader_2 import (
-    get_llm_pipeline,
-    initialize_llm,
+    start_llm_loading,
 )
 from .scripts.fault_prediction_core_4 import (
     set_guksa_id,
     run_query,
     get_vector_db_collection,
+    get_vector_db_handle,
 )
+from .scripts.vector_db_versions import activate_version, list_versions, read_active_version
 from .scripts.llm_response_generator_3 import (
     analyze_query_type,
     generate_response_with_llm,
 )
+from .scripts.mw_status_provider import (
+    MwStatusTimeout,
+    check_mw_status as check_mw_status_in_process,
+)
+from .scripts.snmp_credential_cache import invalidate_snmp_credentials
+from .scripts.network_map import get_network_map_snapshot_store
+from .scripts.topology_graph import (
+    TRAVERSAL_DIRECTIONS,
+    TRAVERSAL_MAX_DEPTH,
+    get_topology_graph,
+    traverse_connected_links,
+)
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
-MW_SOCKET_SERVER = "tcp://192.168.147.78:5555"
-context = zmq.Context()
-zmq_socket = context.socket(zmq.REQ)
-
-
 # 장애점 추정 단계별 진행 상황을 저장할 큐
 progress_queues = {}
 
@@ -504,9 +509,8 @@ async def rag_query():
     guksa_id = data.get("guksa_id")
 
     try:
-        if get_llm_pipeline() is None:
-            print("LLM 모델이 로드되어 있지 않아 초기화합니다...")
-            initialize_llm()
+        # LLM은 백그라운드에서 로딩 (장애점 찾기/유사사례 검색은 LLM 없이 동작하므로 기다리지 않음)
+        start_llm_loading()
 
         user_id = f"web_user_{request.remote_addr}_{int(time.time())}"
 
@@ -1100,128 +1104,41 @@ def get_network_map():
         equip_id = request.args.get('equip_id')
         sector = request.args.get('sector')
 
-        # 1. 기본 쿼리 - 모든 국사 정보 가져오기
-        guksa_query = db.session.query(TblGuksa)
-
-        # 필터링 적용
-        if guksa_id:
-            guksa_query = guksa_query.filter(TblGuksa.guksa_id == guksa_id)
+        # 토폴로지 버전별 스냅샷 조회 (전체 맵은 백그라운드에서 미리 구성)
+        app = current_app._get_current_object()
+        snapshot_store = get_network_map_snapshot_store()
+        snapshot_store.start_background_refresh(app)
 
-        # 국사 정보 조회
-        guksas = guksa_query.all()
+        snapshot = snapshot_store.get(app, guksa_id, equip_id, sector)
 
-        if not guksas:
+        if snapshot is None:
             return jsonify({"error": "해당 조건의 국사가 없습니다."}), 404
 
-        # 2. 노드 데이터 구성
-        nodes = []
-        guksa_ids = []
-
-        for guksa in guksas:
-            guksa_ids.append(guksa.guksa_id)
-
-            # 해당 국사의 장비 분야 확인 (대표 색상 결정)
-            equipments = TblEquipment.query.filter_by(
-                guksa_id=guksa.guksa_id).all()
-
-            # 분야별 장비 수 카운트
-            sector_counts = {}
-            for eq in equipments:
-                if eq.sector:
-                    sector_counts[eq.sector] = sector_counts.get(
-                        eq.sector, 0) + 1
-
-            # 가장 많은 장비가 있는 분야 선택
-            main_sector = max(sector_counts.items(), key=lambda x: x[1])[
-                0] if sector_counts else 'default'
-
-            # 국사 노드 데이터 구성
-            node = {
-                "id": guksa.guksa_id,
-                "label": guksa.guksa,
-                "type": "guksa",
-                "field": main_sector,
-                "equipment_count": len(equipments)
-            }
-            nodes.append(node)
-
-            # 특정 국사의 장비만 노드로 추가 (옵션)
-            if equip_id or guksa_id:
-                equip_query = TblEquipment.query.filter_by(
-                    guksa_id=guksa.guksa_id)
-
-                if equip_id:
-                    equip_query = equip_query.filter(
-                        TblEquipment.id == equip_id)
-
-                if sector:
-                    equip_query = equip_query.filter(
-                        TblEquipment.sector == sector)
-
-                equip_nodes = equip_query.all()
-
-                for eq in equip_nodes:
-                    equip_node = {
-                        "id": f"e{eq.id}",  # 장비 ID가 국사 ID와 겹치지 않도록 접두어 추가
-                        "label": eq.equip_name,
-                        "type": "equipment",
-                        "field": eq.sector,
-                        "parent": guksa.guksa_id,
-                        "equip_model": eq.equip_model
-                    }
-                    nodes.append(equip_node)
-
-        # 3. 링크 데이터 구성
-        links_query = db.session.query(TblLink)
+        # 변경 없으면 304, 그 외에는 미리 압축된 본문 응답
+        return snapshot.make_response(request)
 
-        if guksa_id:
-            # 특정 국사와 연결된 링크만 가져오기
-            guksa_obj = TblGuksa.query.filter_by(guksa_id=guksa_id).first()
-            if guksa_obj:
-                links_query = links_query.filter(
-                    (TblLink.local_guksa_name == guksa_obj.guksa_t) |
-                    (TblLink.remote_guksa_name == guksa_obj.guksa_t)
-                )
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
-        links_data = links_query.all()
-
-        # 링크 데이터 변환
-        edges = []
-
-        for link in links_data:
-            # 로컬 국사 ID 찾기
-            local_guksa = TblGuksa.query.filter_by(
-                guksa_t=link.local_guksa_name).first()
-            remote_guksa = TblGuksa.query.filter_by(
-                guksa=link.remote_guksa_name).first()
-
-            if local_guksa and remote_guksa:
-                edge = {
-                    "id": link.id,
-                    "from": local_guksa.guksa_id,
-                    "to": remote_guksa.guksa_id,
-                    "type": link.link_type,
-                    "updown": link.updown_type,
-                    "link_name": link.link_name if hasattr(link, 'link_name') else None
-                }
-                edges.append(edge)
 
-        # 4. 전체 네트워크 맵 데이터 반환
-        response_data = {
-            "nodes": nodes,
-            "edges": edges,
-            "filtered": {
-                "guksa_id": guksa_id,
-                "equip_id": equip_id,
-                "sector": sector
-            }
-        }
+# 네트워크 맵 스냅샷 무효화 (국사/장비/링크 행 수정 후 호출, 다른 워커는 NETWORK_MAP_MAX_SNAPSHOT_AGE 이내 반영)
+@api_bp.route('/network_map/invalidate', methods=['POST'])
+def invalidate_network_map():
+    try:
+        count = get_network_map_snapshot_store().invalidate()
 
-        return jsonify(response_data)
+        return jsonify({
+            'success': True,
+            'invalidated': count
+        }), 200
 
     except Exception as e:
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        logging.error(f"네트워크 맵 스냅샷 무효화 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
 
 # 분야(sector)에 따른 장비 목록
@@ -1584,6 +1501,18 @@ def alarm_dashboard_equip():
 
         equip_id = data.get('equip_id')
         guksa_name = data.get('guksa_name')
+        direction = data.get('direction', 'both')  # both / up / down
+        max_depth = data.get('max_depth', 50)
+
+        if direction not in TRAVERSAL_DIRECTIONS:
+            return jsonify({"error": f"지원하지 않는 direction: {direction}"}), 400
+
+        try:
+            max_depth = int(max_depth)
+        except (TypeError, ValueError):
+            max_depth = None
+        if max_depth is None or not 1 <= max_depth <= TRAVERSAL_MAX_DEPTH:
+            return jsonify({"error": f"max_depth는 1~{TRAVERSAL_MAX_DEPTH} 사이의 정수여야 합니다: {data.get('max_depth')}"}), 400
 
         print(
             f"🚀🚀🚀🚀🚀 [NEW VERSION] 요청 파라미터: equip_id={equip_id}, guksa_name={guksa_name}")
@@ -1606,7 +1535,8 @@ def alarm_dashboard_equip():
         link_map = load_links_by_guksa(guksa_name)
 
         # 3. 연결된 장비 탐색
-        connected_links = find_all_connected_equip(equip_id, link_map)
+        connected_links = find_all_connected_equip(
+            equip_id, link_map, direction, max_depth)
 
         print(f"[DEBUG] 연결된 링크 수: {len(connected_links)}")
 
@@ -1672,42 +1602,17 @@ def alarm_dashboard_equip():
 
         print(f"[DEBUG] 연결 링크에서 추출된 장비 ID 목록: {list(equipment_ids)}")
 
-        # 장비 정보 조회 및 추가
+        # 장비 정보 조회 및 추가 (토폴로지 그래프 캐시, DB 조회 없음)
+        topology_graph = get_topology_graph()
         for eq_id in equipment_ids:
             if eq_id not in equipment_dict:
-                print(f"[DEBUG] 장비 정보 조회 중: {eq_id}")
-                # TblSubLink에서 장비 정보 조회
-                link_info = TblSubLink.query.filter(
-                    or_(TblSubLink.equip_id == eq_id,
-                        TblSubLink.link_equip_id == eq_id)
-                ).first()
-
-                if link_info:
-                    # 해당 장비가 source인지 target인지 확인하여 정보 설정
-                    if link_info.equip_id == eq_id:
-                        equipment_dict[eq_id] = {
-                            "id": len(equipment_dict) + 1,
-                            "equip_id": eq_id,
-                            "equip_type": link_info.equip_type or "UNKNOWN",
-                            "equip_name": link_info.equip_name or eq_id,
-                            "equip_field": link_info.equip_field or "UNKNOWN",
-                            "guksa_name": link_info.guksa_name or "UNKNOWN",
-                            "up_down": link_info.up_down or "unknown"
-                        }
-                        print(
-                            f"[DEBUG] 장비 정보 추가 (source): {eq_id} -> {equipment_dict[eq_id]}")
-                    else:
-                        equipment_dict[eq_id] = {
-                            "id": len(equipment_dict) + 1,
-                            "equip_id": eq_id,
-                            "equip_type": link_info.link_equip_type or "UNKNOWN",
-                            "equip_name": link_info.link_equip_name or eq_id,
-                            "equip_field": link_info.link_equip_field or "UNKNOWN",
-                            "guksa_name": link_info.link_guksa_name or "UNKNOWN",
-                            "up_down": "down" if link_info.up_down == "up" else "up"  # 반대 관계
-                        }
-                        print(
-                            f"[DEBUG] 장비 정보 추가 (target): {eq_id} -> {equipment_dict[eq_id]}")
+                equip_info = topology_graph.get_equipment_info(eq_id)
+
+                if equip_info:
+                    equipment_dict[eq_id] = {
+                        "id": len(equipment_dict) + 1,
+                        **equip_info
+                    }
                 else:
                     print(f"[DEBUG] 장비 정보를 찾을 수 없음: {eq_id}")
 
@@ -1802,75 +1707,15 @@ def get_guksa_info(guksa_id):
 
 # TblSubLink에서 국사명으로 전체 링크 정보 메모리 로딩
 def load_links_by_guksa(guksa_name):
-    """국사별 링크 정보를 로드 (중복 제거)"""
+    """국사별 링크 정보를 로드 (중복 제거, 프로세스 단위 토폴로지 그래프 캐시 사용)"""
     print(f"[DEBUG] load_links_by_guksa 호출: guksa_name={guksa_name}")
 
     try:
-        # TblSubLink에서 해당 국사의 모든 링크 조회
-        links = TblSubLink.query.filter(
-            or_(
-                TblSubLink.guksa_name == guksa_name,
-                TblSubLink.link_guksa_name == guksa_name
-            )
-        ).all()
-
-        print(f"[DEBUG] TblSubLink에서 조회된 링크 수: {len(links)}")
-
-        # 중복 제거를 위한 세트
-        processed_pairs = set()
-        link_map = {}
-
-        for link in links:
-            # 중복 링크 방지를 위한 유니크 키 생성 (장비 ID 정렬 + 링크명)
-            equip_pair = tuple(sorted([link.equip_id, link.link_equip_id]))
-            pair_key = f"{equip_pair[0]}:::{equip_pair[1]}:::{link.link_name}"
-
-            # 이미 처리된 링크 쌍인지 확인
-            if pair_key in processed_pairs:
-                print(
-                    f"[DEBUG] 중복 링크 제거: {link.equip_id} <-> {link.link_equip_id} ({link.link_name})")
-                continue
-
-            # 처리된 링크 쌍으로 표시
-            processed_pairs.add(pair_key)
-
-            print(
-                f"[DEBUG] 링크 처리: {link.equip_id} -> {link.link_equip_id}, up_down: {link.up_down}")
-
-            # 양방향 링크 생성 (중복 제거 후)
-            if link.equip_id not in link_map:
-                link_map[link.equip_id] = []
-            if link.link_equip_id not in link_map:
-                link_map[link.link_equip_id] = []
-
-            # 원본 방향
-            link_map[link.equip_id].append({
-                'target_equip_id': link.link_equip_id,
-                'up_down': link.up_down,
-                'link_name': link.link_name
-            })
-            print(
-                f"[DEBUG] 원본 방향 추가: {link.equip_id} -> {link.link_equip_id} (up_down: {link.up_down})")
-
-            # 역방향 (up_down 반대로)
-            reverse_up_down = 'down' if link.up_down == 'up' else 'up'
-            link_map[link.link_equip_id].append({
-                'target_equip_id': link.equip_id,
-                'up_down': reverse_up_down,
-                'link_name': link.link_name
-            })
-            print(
-                f"[DEBUG] 역방향 추가: {link.link_equip_id} -> {link.equip_id} (up_down: {reverse_up_down})")
+        # 반환된 link_map은 캐시와 공유되므로 읽기 전용으로 사용
+        link_map = get_topology_graph().get_link_map(guksa_name)
 
-        print(f"[DEBUG] 중복 제거 후 링크 쌍 수: {len(processed_pairs)}")
         print(f"[DEBUG] 생성된 link_map 키 수: {len(link_map)}")
 
-        for equip_id, connections in link_map.items():
-            print(f"[DEBUG] {equip_id}: {len(connections)}개 연결")
-            for conn in connections:
-                print(
-                    f"[DEBUG]   -> {conn['target_equip_id']} (up_down: {conn['up_down']})")
-
         return link_map
 
     except Exception as e:
@@ -1878,87 +1723,18 @@ def load_links_by_guksa(guksa_name):
         return {}
 
 
-# 모든 상/하위 장비 찾기: 장비 ID로 연결된 모든 장비들을 재귀적으로 찾기
+# 모든 상/하위 장비 찾기: 장비 ID로 연결된 모든 장비들을 반복 탐색으로 찾기
 # (load_links_by_guksa에서 link_map에 중복 이미 제거됨)
-def find_all_connected_equip(equip_id, link_map):
+def find_all_connected_equip(equip_id, link_map, direction='both', max_depth=50):
     try:
         print(
-            f"[DEBUG] find_all_connected_equip 호출: equip_id={equip_id} (중앙노드)")
-
-        result = {}
-        visited = set()  # 중복 방문 방지
-
-        # 재귀적으로 연결된 장비들 탐색
-        def traverse_connections(current_equip_id, depth=0, parent_equip_id=None):
-            # 무한 루프 방지 (최대 50까지 링크 정보 탐색)
-            if current_equip_id in visited or depth > 50:
-                return
-
-            visited.add(current_equip_id)
-
-            if current_equip_id in link_map:
-                connections = link_map[current_equip_id]
-                print(
-                    f"[DEBUG] {current_equip_id}의 연결 수: {len(connections)} (깊이: {depth})")
+            f"[DEBUG] find_all_connected_equip 호출: equip_id={equip_id} (중앙노드), direction={direction}")
 
-                for connection in connections:
-                    target_equip_id = connection['target_equip_id']
-                    up_down = connection['up_down']
-                    link_name = connection['link_name']
-
-                    # 부모 노드로의 역방향 연결은 건너뛰기 (무한 루프 방지)
-                    if target_equip_id == parent_equip_id:
-                        print(
-                            f"[DEBUG] 부모 노드로의 역방향 연결 건너뛰기: {current_equip_id} -> {target_equip_id}")
-                        continue
-
-                    print(
-                        f"[DEBUG] 연결 처리: {current_equip_id} -> {target_equip_id}, up_down: {up_down}, link: {link_name}")
-
-                    # 중앙 노드를 기준으로 한 up_down 결정
-                    if depth == 0:
-                        # 중앙 노드에서 직접 연결된 경우
-                        final_up_down = up_down
-                    else:
-                        # 재귀적으로 찾은 경우 (depth > 0)
-                        # 중앙 노드로부터의 방향성을 유지
-                        final_up_down = up_down
-
-                    # 링크 키 생성 (source:::target:::link_name:::up_down 형식)
-                    link_key = f"{current_equip_id}:::{target_equip_id}:::{link_name}:::{final_up_down}"
-
-                    # 이미 같은 링크가 있는지 확인 (다른 방향으로)
-                    reverse_key = f"{target_equip_id}:::{current_equip_id}:::{link_name}:::"
-                    reverse_found = False
-                    for existing_key in result.keys():
-                        if existing_key.startswith(reverse_key):
-                            print(f"[DEBUG] 역방향 링크 이미 존재, 건너뛰기: {link_key}")
-                            reverse_found = True
-                            break
-
-                    if not reverse_found:
-                        result[link_key] = {
-                            'source': current_equip_id,
-                            'target': target_equip_id,
-                            'link_name': link_name,
-                            'up_down': final_up_down
-                        }
-
-                    # 재귀적으로 하위 노드들 탐색 (현재 노드를 부모로 전달)
-                    traverse_connections(
-                        target_equip_id, depth + 1, current_equip_id)
-
-        # 시작 장비부터 재귀 탐색 시작
-        traverse_connections(equip_id)
+        result = traverse_connected_links(
+            link_map, equip_id, direction=direction, max_depth=max_depth)
 
         print(
-            f"[DEBUG] find_all_connected_equip 결과: {len(result)}개 연결된 링크 (방문한 노드: {len(visited)}개)")
-
-        # 결과 확인을 위한 로그
-        if len(result) > 0:
-            print(f"[DEBUG] 최종 링크 목록:")
-            for key, value in result.items():
-                print(f"  - {key}")
+            f"[DEBUG] find_all_connected_equip 결과: {len(result)}개 연결된 링크")
 
         return result
 
@@ -2027,209 +1803,14 @@ def check_mw_status():
         logging.info(
             f">> MW 상태 확인 요청: 국사={guksa_id}, 장비 수={len(equipment_list)}개")
 
-        # 소켓 서버로 요청
-        payload = {
-            "guksa_id": guksa_id,
-            "data": equipment_list
-        }
-
+        # MW 상태 제공자 직접 호출 (sample/zmq 백엔드)
         try:
-            #             # ZMQ 소켓 연결 및 요청
-            #             context = zmq.Context()
-            #             socket = context.socket(zmq.REQ)
-            #             socket.connect(MW_SOCKET_SERVER)
-            #             socket.setsockopt(zmq.RCVTIMEO, 60000)  # 60초 타임아웃
-
-            #             # 요청 전송
-            #             logging.debug(
-            #                 f"요청 JSON: {json.dumps(payload, ensure_ascii=False)}")
-            #             socket.send_string(json.dumps(payload))
-            #             logging.info(f">> 소켓 서버로 MW 상태 요청 전송: {len(equipment_list)}개 장비")
-
-            #             # 응답 수신
-            #             response_str = socket.recv_string()
-            #             logging.debug(f"응답 JSON: {response_str}")
-            #             socket.close()
-            #             context.term()
-
-            # 임시 테스트용 코드
-            response_str = '''[
-                    {
-                    "id": 209,
-                    "equip_type": "IP-20",
-                    "data": {
-                    "interfaces": {
-                    "Radio: Slot 3, Port 1": {
-                    "RSL": {
-                    "value": "-45",
-                    "min": "0",
-                    "max": "-99",
-                    "threshold": "-50"
-                    },
-                    "TSL": {
-                    "value": "22",
-                    "min": "1",
-                    "max": "22",
-                    "threshold": "25"
-                    },
-                    "SNR": {
-                    "value": "39.98",
-                    "min": "39.31",
-                    "max": "40.21",
-                    "threshold": "34"
-                    },
-
-                    "XPI": {
-                    "value": "0",
-                    "min": "0",
-                    "max": "0",
-                    "threshold": "15"
-                    },
-
-                    "ERR": {
-                    "BER": "13",
-                    "ES": "0",
-                    "SES": "0",
-                    "UAS": "0",
-                    "BBE": "0"
-                    }
-
-                    },
-
-                    "Radio: Slot 4, Port 1": {
-
-                    "RSL": {
-                    "value": "-99",
-                    "min": "0",
-                    "max": "-99",
-                    "threshold": "-50"
-                    },
-
-                    "TSL": {
-                    "value": "0",
-                    "min": "-50",
-                    "max": "50",
-                    "threshold": "25"
-                    },
-
-                    "SNR": {
-                    "value": "99.0",
-                    "min": "error",
-                    "max": "error",
-                    "threshold": "34"
-                    },
-
-                    "XPI": {
-                    "value": "9900",
-                    "min": "error",
-                    "max": "error",
-                    "threshold": "15"
-                    },
-
-                    "ERR": {
-                    "BER": "0",
-                    "ES": "error",
-                    "SES": "error",
-                    "UAS": "error",
-                    "BBE": "error"
-                    }
-                    },
-
-                    "Radio: Slot 5, Port 1": {
-                    "RSL": {
-                    "value": "-45",
-                    "min": "0",
-                    "max": "-99",
-                    "threshold": "-50"
-                    },
-
-                    "TSL": {
-                    "value": "22",
-                    "min": "1",
-                    "max": "22",
-                    "threshold": "25"
-                    },
-
-                    "SNR": {
-                    "value": "41.01",
-                    "min": "40.06",
-                    "max": "41.14",
-                    "threshold": "34"
-                    },
-
-                    "XPI": {
-                    "value": "0",
-                    "min": "0",
-                    "max": "0",
-                    "threshold": "15"
-                    },
-
-                    "ERR": {
-                    "BER": "13",
-                    "ES": "0",
-                    "SES": "0",
-                    "UAS": "0",
-                    "BBE": "0"
-                    }
-                    },
-
-                    "Radio: Slot 6, Port 1": {
-                    "RSL": {
-                    "value": "-45",
-                    "min": "0",
-                    "max": "-99",
-                    "threshold": "-50"
-                    },
-
-                    "TSL": {
-                    "value": "22",
-                    "min": "1",
-                    "max": "22",
-                    "threshold": "25"
-                    },
-
-                    "SNR": {
-                    "value": "40.11",
-                    "min": "39.11",
-                    "max": "40.26",
-                    "threshold": "34"
-                    },
-
-                    "XPI": {
-                    "value": "0",
-                    "min": "0",
-                    "max": "0",
-                    "threshold": "15"
-                    },
-
-                    "ERR": {
-                    "BER": "13",
-                    "ES": "0",
-                    "SES": "0",
-                    "UAS": "0",
-                    "BBE": "0"
-                    }
-                    }
-                    },
-
-                    "VOLT": {
-                    "value": "45",
-                    "min": "50",
-                    "max": "51",
-                    "threshold": "38"
-                    }
-                    },
-
-                    "get_datetime": "2025-06-10 16:20:39"
-                    }
-                    ]'''
-            # JSON 파싱
-            response_data = json.loads(response_str)
+            response_data = check_mw_status_in_process(guksa_id, equipment_list)
             logging.info(f"소켓 서버로부터 MW 상태 응답 수신 완료")
 
             return jsonify(response_data), 200
 
-        except zmq.error.Again:
+        except MwStatusTimeout:
             logging.error("소켓 서버 응답 타임아웃")
             return jsonify({
                 'success': False,
@@ -2253,6 +1834,101 @@ def check_mw_status():
             'error': error_message
         }), 500
 
+# 토폴로지 그래프 무효화 (tbl_sub_link 행 수정 후 호출, 다른 워커는 TOPOLOGY_FULL_RELOAD_INTERVAL 이내 반영)
+@api_bp.route("/topology/invalidate", methods=["POST"])
+def invalidate_topology_graph():
+    try:
+        get_topology_graph().invalidate()
+
+        return jsonify({
+            'success': True
+        }), 200
+
+    except Exception as e:
+        logging.error(f"토폴로지 그래프 무효화 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# MW 장비 SNMP 접속 정보 캐시 무효화 (tbl_snmp_info 변경 후 호출, 다른 워커는 다음 조회 시 표시 파일로 반영)
+@api_bp.route("/snmp_info_cache/invalidate", methods=["POST"])
+def invalidate_snmp_info_cache():
+    try:
+        data = request.get_json(silent=True) or {}
+        equip_names = data.get('equip_names')  # 미지정 시 전체 무효화
+
+        count = invalidate_snmp_credentials(equip_names)
+
+        return jsonify({
+            'success': True,
+            'invalidated': count
+        }), 200
+
+    except Exception as e:
+        logging.error(f"SNMP 접속 정보 캐시 무효화 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# 벡터DB 버전 목록 (활성 버전, 이 프로세스가 사용 중인 버전)
+@api_bp.route("/vector_db/versions", methods=["GET"])
+def vector_db_versions():
+    try:
+        _, loaded_version, error = get_vector_db_handle()
+
+        return jsonify({
+            'success': True,
+            'active': read_active_version(),
+            'loaded_version': loaded_version,
+            'load_error': error,
+            'versions': list_versions()
+        }), 200
+
+    except Exception as e:
+        logging.error(f"벡터DB 버전 조회 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# 벡터DB 활성 버전 전환 (version 미지정 시 active.json 즉시 다시 확인, 다른 워커는 확인 주기에 따라 교체)
+@api_bp.route("/vector_db/activate", methods=["POST"])
+def activate_vector_db_version():
+    try:
+        data = request.get_json(silent=True) or {}
+        version = data.get('version')
+
+        if version:
+            activate_version(version)
+
+        _, loaded_version, error = get_vector_db_handle(force_check=True)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 500
+
+        return jsonify({
+            'success': True,
+            'loaded_version': loaded_version
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+
+    except Exception as e:
+        logging.error(f"벡터DB 버전 전환 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 # AI RAG 장애분석 팝업 API 엔드포인트 추가
 
 
@@ -3,29 +3,314 @@
 """
 
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from types import MappingProxyType
+from typing import List, Dict, Any, Tuple
 from collections import defaultdict
 
 import json
-import requests
+
+from .mw_status_provider import MwStatusError, get_mw_status_provider
+from .snmp_credential_cache import get_snmp_credential_cache
 
 HR_LINE_HTML = '<hr style="border: none; border-top: 1px solid #f2bbb5; margin: 10px 0;">\n'
 
+# 5단계 장애점 분석 정의: (단계 키, 메서드명, 선행 단계 키 목록)
+# - 각 단계는 입력 데이터와 공유 인덱스만 읽으므로 선행 단계 없이 동시 실행 가능
+# - 최종 장애점 목록은 완료 순서와 관계없이 아래 정의 순서대로 병합
+ANALYSIS_STAGES = (
+    ('link', 'analyze_link_failures', ()),               # 1. 선로
+    ('mw', 'analyze_mw_equipment_status', ()),           # 2. MW (SNMP 조회, I/O 대기)
+    ('upper', 'analyze_upper_node_failures', ()),        # 3. 상위 장비
+    ('exchange', 'analyze_exchange_failures', ()),       # 4. 교환
+    ('transmission', 'analyze_transmission_failures', ()),  # 5. 전송
+)
+
+# 경보 코드별 서브 인덱스 정의 (코드: 대소문자 무시 여부)
+# - 교환(4단계): A1395, A1930 / 전송(5단계): LOS, LOF
+ALARM_CODE_INDEX = {
+    'A1395': False,
+    'A1930': False,
+    'LOS': True,
+    'LOF': True,
+}
+
+
+class NodeAlarmIndex:
+    """
+    노드별 경보 인덱스 (analyze() 1회 호출당 1번만 생성, 생성 후 변경 불가)
+
+    - 노드 ID → 경보 목록
+    - 노드 ID → 경보 코드(A1395/A1930/LOS/LOF)별 경보 목록
+    - 분야(대문자) → 전역 경보 목록
+    """
+
+    def __init__(self, nodes: List[Dict], alarms: List[Dict] = None):
+        node_alarms = {}
+        code_alarms = {code: {} for code in ALARM_CODE_INDEX}
+
+        for node in nodes:
+            node_id = node.get('id')
+            raw_alarms = node.get('alarms', [])
+
+            if not node_id or not raw_alarms:
+                continue
+
+            # 모든 경보 포함 (빈 경보만 제외)
+            all_alarms = tuple(alarm for alarm in raw_alarms if alarm)
+            node_alarms[node_id] = all_alarms
+
+            # 경보 메시지를 1회만 읽어 코드별 서브 인덱스 구성
+            matched = {code: [] for code in ALARM_CODE_INDEX}
+            for alarm in all_alarms:
+                message = alarm.get('alarm_message', '') or ''
+                message_upper = message.upper()
+                for code, ignore_case in ALARM_CODE_INDEX.items():
+                    if code in (message_upper if ignore_case else message):
+                        matched[code].append(alarm)
+
+            for code, alarms_by_code in matched.items():
+                code_alarms[code][node_id] = tuple(alarms_by_code)
+
+        # 전역 경보의 분야별 인덱스 (타 분야 경보 조회용)
+        sector_alarms = defaultdict(list)
+        for alarm in alarms or []:
+            sector_alarms[alarm.get('sector', '').upper()].append(alarm)
+
+        self._node_alarms = MappingProxyType(node_alarms)
+        self._sector_alarms = MappingProxyType(
+            {sector: tuple(items) for sector, items in sector_alarms.items()})
+        self._code_alarms = MappingProxyType(
+            {code: MappingProxyType(index) for code, index in code_alarms.items()})
+
+    @property
+    def node_alarm_map(self):
+        """노드 ID → 경보 목록 (읽기 전용)"""
+        return self._node_alarms
+
+    def get(self, node_id) -> Tuple[Dict, ...]:
+        """노드 경보 조회"""
+        return self._node_alarms.get(node_id, ())
+
+    def get_by_code(self, node_id, code) -> Tuple[Dict, ...]:
+        """노드의 경보 코드별 경보 조회 (ALARM_CODE_INDEX에 정의된 코드만)"""
+        return self._code_alarms[code].get(node_id, ())
+
+    def get_by_sectors(self, sectors) -> List[Dict]:
+        """분야 목록에 해당하는 전역 경보 조회"""
+        sector_alarms = []
+        for sector in dict.fromkeys(sector.upper() for sector in sectors):
+            sector_alarms.extend(self._sector_alarms.get(sector, ()))
+        return sector_alarms
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._node_alarms
+
+    def __len__(self) -> int:
+        return len(self._node_alarms)
+
+
+class NodeHierarchy:
+    """
+    링크 기반 장비 계위 구조 (3단계 상위 장비 분석용)
+
+    - 요청의 links(source/target)로 인접 구조를 1회 구성
+    - 링크 양 끝 중 Level이 작은 장비를 상위, 큰 장비를 하위로 판단 (같은 Level 링크는 계위 관계 아님)
+    - 노드 간 링크가 하나도 없으면 기존과 같이 Level 기준으로 상/하위를 판단
+    """
+
+    def __init__(self, nodes: List[Dict], links: List[Dict]):
+        self.nodes_by_id = {node['id']: node for node in nodes if node.get('id')}
+        self.children = defaultdict(list)
+        self.parents = defaultdict(list)
+
+        edges = set()
+        for link in links:
+            source_id = link.get('source')
+            target_id = link.get('target')
+
+            if source_id not in self.nodes_by_id or target_id not in self.nodes_by_id:
+                continue
+
+            source_level = self.nodes_by_id[source_id].get('level', 0)
+            target_level = self.nodes_by_id[target_id].get('level', 0)
+
+            if source_level < target_level:
+                edges.add((source_id, target_id))
+            elif target_level < source_level:
+                edges.add((target_id, source_id))
+
+        for upper_id, lower_id in edges:
+            self.children[upper_id].append(lower_id)
+            self.parents[lower_id].append(upper_id)
+
+        self.edge_count = len(edges)
+        self.use_links = self.edge_count > 0
+
+    def find_lower_nodes(self, node_id) -> List[Dict]:
+        """하위 노드 전체 조회"""
+        if not self.use_links:
+            current_level = self.nodes_by_id[node_id].get('level', 0)
+            return [node for node in self.nodes_by_id.values()
+                    if node.get('level', 0) > current_level]
+        return [self.nodes_by_id[found_id]
+                for found_id in self._traverse(node_id, self.children)]
+
+    def find_upper_nodes(self, node_id) -> List[Dict]:
+        """상위 노드 전체 조회"""
+        if not self.use_links:
+            current_level = self.nodes_by_id[node_id].get('level', 0)
+            return [node for node in self.nodes_by_id.values()
+                    if 0 <= node.get('level', 0) < current_level]
+        return [self.nodes_by_id[found_id]
+                for found_id in self._traverse(node_id, self.parents)]
+
+    def _traverse(self, start_id, adjacency) -> List[str]:
+        """인접 구조를 따라 도달 가능한 노드 ID 목록 (시작 노드 제외)"""
+        visited = {start_id}
+        stack = [start_id]
+        found = []
+
+        while stack:
+            for next_id in adjacency.get(stack.pop(), ()):
+                if next_id not in visited:
+                    visited.add(next_id)
+                    found.append(next_id)
+                    stack.append(next_id)
+
+        return found
+
+    def find_upper_failure_nodes(self, node_alarm_map) -> set:
+        """
+        상위 장비 장애 후보 노드 ID 집합
+
+        - 노드 자신에 경보가 있고
+        - 하위 노드가 1개 이상이며 모두 경보가 있고
+        - 상위 노드에는 경보가 없는 경우
+        """
+        if not self.use_links:
+            return self._find_upper_failure_nodes_by_level(node_alarm_map)
+
+        # Level 순서가 곧 위상 순서 (링크는 항상 작은 Level → 큰 Level)
+        ordered_ids = sorted(self.nodes_by_id,
+                             key=lambda node_id: self.nodes_by_id[node_id].get('level', 0))
+
+        # 상향식 1회 탐색: 하위 노드 존재 여부 / 하위 노드 전체 경보 여부
+        all_lower_alarmed = {}
+        for node_id in reversed(ordered_ids):
+            all_lower_alarmed[node_id] = all(
+                child_id in node_alarm_map and all_lower_alarmed[child_id]
+                for child_id in self.children.get(node_id, ()))
+
+        # 하향식 1회 탐색: 상위 노드 중 경보 존재 여부
+        any_upper_alarmed = {}
+        for node_id in ordered_ids:
+            any_upper_alarmed[node_id] = any(
+                parent_id in node_alarm_map or any_upper_alarmed[parent_id]
+                for parent_id in self.parents.get(node_id, ()))
+
+        return {
+            node_id for node_id in ordered_ids
+            if node_id in node_alarm_map
+            and self.children.get(node_id)
+            and all_lower_alarmed[node_id]
+            and not any_upper_alarmed[node_id]
+        }
+
+    def _find_upper_failure_nodes_by_level(self, node_alarm_map) -> set:
+        """링크 정보가 없는 경우 Level 기준 판단 (Level별 집계로 선형 처리)"""
+        level_total = defaultdict(int)
+        level_alarmed = defaultdict(int)
+        for node_id, node in self.nodes_by_id.items():
+            level = node.get('level', 0)
+            level_total[level] += 1
+            if node_id in node_alarm_map:
+                level_alarmed[level] += 1
+
+        levels = sorted(level_total)
+
+        # Level L보다 깊은 Level의 (전체 노드 수, 경보 없는 노드 수)
+        deeper_total, deeper_normal = {}, {}
+        total, normal = 0, 0
+        for level in reversed(levels):
+            deeper_total[level], deeper_normal[level] = total, normal
+            total += level_total[level]
+            normal += level_total[level] - level_alarmed[level]
+
+        # Level 0 ~ L-1 구간의 경보 노드 수
+        upper_alarmed = {}
+        alarmed = 0
+        for level in levels:
+            upper_alarmed[level] = alarmed
+            if level >= 0:
+                alarmed += level_alarmed[level]
+
+        return {
+            node_id for node_id, node in self.nodes_by_id.items()
+            if node_id in node_alarm_map
+            and deeper_total[node.get('level', 0)] > 0
+            and deeper_normal[node.get('level', 0)] == 0
+            and upper_alarmed[node.get('level', 0)] == 0
+        }
+
 
 class InferFailurePoint:
-    def __init__(self, progress_callback=None):
+    def __init__(self, progress_callback=None, parallel_stages=True):
         self.nodes = []
         self.links = []
         self.alarms = []
         self.failure_points = []
+        self.alarm_index = None
+        self.hierarchy = None
         self.logger = logging.getLogger(__name__)
         self.progress_callback = progress_callback
+        self.parallel_stages = parallel_stages
+        self._progress_lock = threading.Lock()
+        self._stage_context = threading.local()  # 현재 스레드가 실행 중인 단계
+        self._stage_messages = None  # 단계 동시 실행 중: 단계 → 보류된 진행 메시지
+        self._stage_head = 0  # 진행 메시지를 바로 전달하는 단계 (ANALYSIS_STAGES 인덱스)
+        self._stages_done = set()
 
     def send_progress(self, message):
-        """진행 상황을 콜백으로 전달"""
-        if self.progress_callback:
+        """
+        진행 상황을 콜백으로 전달
+
+        단계 동시 실행 시에는 단계 정의 순서대로 전달합니다 (순차 실행과 같은 스트림 순서).
+        앞 단계가 모두 끝난 단계의 메시지는 바로 전달하고, 나머지는 앞 단계가 끝날 때까지 보류합니다.
+        """
+        if not self.progress_callback:
+            return
+
+        with self._progress_lock:
+            key = getattr(self._stage_context, 'key', None)
+            if (self._stage_messages is not None and key is not None
+                    and key != ANALYSIS_STAGES[self._stage_head][0]):
+                self._stage_messages[key].append(message)
+                return
             self.progress_callback(message)
 
+    def _finish_stage_progress(self, key):
+        """단계 완료 처리: 앞 단계부터 완료된 만큼 다음 단계의 보류 메시지 전달"""
+        if self._stage_messages is None:
+            return
+
+        with self._progress_lock:
+            self._stages_done.add(key)
+            while (self._stage_head < len(ANALYSIS_STAGES)
+                   and ANALYSIS_STAGES[self._stage_head][0] in self._stages_done):
+                self._stage_head += 1
+                if self._stage_head < len(ANALYSIS_STAGES):
+                    self._flush_stage_messages(ANALYSIS_STAGES[self._stage_head][0])
+
+    def _flush_stage_messages(self, key):
+        """보류된 단계 메시지 전달 (_progress_lock 보유 상태에서 호출)"""
+        for message in self._stage_messages[key]:
+            if self.progress_callback:
+                self.progress_callback(message)
+        self._stage_messages[key] = []
+
     # 장애점 찾기 Main 함수
     def analyze(self, nodes: List[Dict], links: List[Dict], alarms: List[Dict]) -> Dict[str, Any]:
         try:
@@ -39,6 +324,10 @@ class InferFailurePoint:
             self.alarms = alarms or []
             self.failure_points = []
 
+            # 노드별 경보 인덱스 / 계위 구조 생성 (1~5단계 공유, 읽기 전용)
+            self.alarm_index = NodeAlarmIndex(self.nodes, self.alarms)
+            self.hierarchy = NodeHierarchy(self.nodes, self.links)
+
             # 진행 상황 전송
             self.send_progress(
                 f"📌 NW 장애점 분석을 시작합니다. (1~5단계) <br><br> • AI 분석 입력 데이터: 장비 {len(self.nodes)}대, 링크 {len(self.links)}구간, 경보 {len(self.alarms)}건")
@@ -84,31 +373,7 @@ class InferFailurePoint:
             # 5단계 장애점 분석 ######################################################
             self.logger.info("📌 단계별 장애점 분석 시작")
 
-            self.analyze_link_failures()      # 1. 링크 선로 장애점
-            self.logger.info(
-                f"• 분석 완료 - 현재 발견된 장애점: {len(self.failure_points)}개")
-            self.logger.info("-------------------------------")
-
-            # 2. MW 장비 상태 점검
-            self.analyze_mw_equipment_status()
-            self.logger.info(
-                f"• 분석 완료 - 현재 발견된 장애점: {len(self.failure_points)}개")
-            self.logger.info("-------------------------------")
-
-            self.analyze_upper_node_failures()  # 3. 상위 장비 장애점
-            self.logger.info(
-                f"• 분석 완료 - 현재 발견된 장애점: {len(self.failure_points)}개")
-            self.logger.info("-------------------------------")
-
-            self.analyze_exchange_failures()   # 4. 교환 장비 장애점
-            self.logger.info(
-                f"• 분석 완료 - 현재 발견된 장애점: {len(self.failure_points)}개")
-            self.logger.info("-------------------------------")
-
-            self.analyze_transmission_failures()  # 5. 전송 장비 장애점
-            self.logger.info(
-                f"• 분석 완료 - 현재 발견된 장애점: {len(self.failure_points)}개")
-            self.logger.info("-------------------------------")
+            self.run_analysis_stages()
 
             # 결과 생성
             result = self.create_analysis_result()
@@ -131,6 +396,94 @@ class InferFailurePoint:
             self.send_progress(f"❌ 장애점 분석 중 오류가 발생했습니다: {str(e)}")
             return self.create_error_result(str(e))
 
+    # 단계별 분석 실행 (선행 단계가 끝난 단계부터 동시 실행)
+    def run_analysis_stages(self):
+        stage_failure_points = {key: [] for key, _, _ in ANALYSIS_STAGES}
+        start_time = time.time()
+
+        if not self.parallel_stages:
+            for key, method_name, _ in ANALYSIS_STAGES:
+                self.run_stage(key, method_name, stage_failure_points[key])
+        else:
+            run_stage = self.bind_app_context(self.run_stage)
+            waiting = list(ANALYSIS_STAGES)
+            completed = set()
+            running = {}
+
+            # 진행 메시지는 단계 순서대로 전달 (동시 실행 단계의 메시지는 앞 단계가 끝날 때까지 보류)
+            with self._progress_lock:
+                self._stage_messages = {key: [] for key, _, _ in ANALYSIS_STAGES}
+                self._stage_head = 0
+                self._stages_done = set()
+
+            try:
+                with ThreadPoolExecutor(max_workers=len(ANALYSIS_STAGES),
+                                        thread_name_prefix='infer-stage') as executor:
+                    while waiting or running:
+                        ready = [stage for stage in waiting if set(stage[2]) <= completed]
+                        for stage in ready:
+                            waiting.remove(stage)
+                            key, method_name = stage[0], stage[1]
+                            future = executor.submit(
+                                run_stage, key, method_name, stage_failure_points[key])
+                            running[future] = key
+
+                        if not running:
+                            raise RuntimeError(
+                                f"선행 단계를 만족할 수 없는 분석 단계: {[stage[0] for stage in waiting]}")
+
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            completed.add(running.pop(future))
+                            future.result()  # 단계 내부 예외는 analyze()에서 처리
+            finally:
+                # 오류로 중단된 경우에도 보류된 메시지를 단계 순서대로 전달한 뒤 보류 해제
+                with self._progress_lock:
+                    for key, _, _ in ANALYSIS_STAGES[self._stage_head + 1:]:
+                        self._flush_stage_messages(key)
+                    self._stage_messages = None
+
+        # 단계 정의 순서대로 병합 (완료 순서와 무관하게 항상 같은 결과)
+        self.failure_points = [
+            failure_point
+            for key, _, _ in ANALYSIS_STAGES
+            for failure_point in stage_failure_points[key]
+        ]
+
+        self.logger.info(
+            f"• 전체 단계 분석 완료 - 발견된 장애점: {len(self.failure_points)}개 ({time.time() - start_time:.2f}초)")
+        self.logger.info("-------------------------------")
+
+    def run_stage(self, key, method_name, failure_points):
+        """단일 분석 단계 실행 (단계 전용 장애점 목록에 결과 저장)"""
+        start_time = time.time()
+        self._stage_context.key = key
+        try:
+            getattr(self, method_name)(failure_points)
+        finally:
+            self._stage_context.key = None
+            self._finish_stage_progress(key)
+        self.logger.info(
+            f"• [{key}] 분석 완료 - 발견된 장애점: {len(failure_points)}개 ({time.time() - start_time:.2f}초)")
+
+    def bind_app_context(self, func):
+        """작업 스레드에서도 현재 Flask 앱 컨텍스트(DB 조회용)를 사용하도록 감싸기"""
+        try:
+            from flask import current_app, has_app_context
+        except ImportError:
+            return func
+
+        if not has_app_context():
+            return func
+
+        app = current_app._get_current_object()
+
+        def run_in_app_context(*args, **kwargs):
+            with app.app_context():
+                return func(*args, **kwargs)
+
+        return run_in_app_context
+
     # 입력 데이터 검증
     def validate_input_data(self) -> bool:
         if not self.nodes:
@@ -166,7 +519,9 @@ class InferFailurePoint:
         return True
 
     # 1. 선로 장애점 분석: 선로에 경보가 있는 경우 (Dr. Cable 경보는 선로 피해 장애임)
-    def analyze_link_failures(self):
+    def analyze_link_failures(self, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         self.logger.info("-------------------------------")
         self.logger.info("[1단계] 선로 분야 장애점 분석 시작")
 
@@ -189,7 +544,7 @@ class InferFailurePoint:
             self.logger.info(f"• ❌ 선로 경보 수: {len(link_alarms)}개")
 
             if link_alarms:
-                self.failure_points.append({
+                failure_points.append({
                     'type': 'link',
                     'id': link.get('id'),
                     'name': link_name,
@@ -229,7 +584,9 @@ class InferFailurePoint:
         self.logger.info("-------------------------------")
 
     # 2. MW 장비 상태 점검
-    def analyze_mw_equipment_status(self):
+    def analyze_mw_equipment_status(self, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         self.logger.info("[2단계] MW 장비 상태 점검 시작")
 
         # MW 노드 필터링
@@ -305,7 +662,7 @@ class InferFailurePoint:
 
             # MW 장애점 분석 (요청/응답 ID 매칭 개선)
             mw_failure_count, mw_details = self.analyze_mw_status_data(
-                mw_status_data, mw_nodes, mw_equipment_data)
+                mw_status_data, mw_nodes, mw_equipment_data, failure_points)
 
             step_message += "\n".join(mw_details)
             step_message += f"\n<br><br>• 장애점 발견: {mw_failure_count}개"
@@ -324,7 +681,6 @@ class InferFailurePoint:
     # 2-1. DB에서 MW 노드들의 SNMP 접속 정보 수집
     def get_mw_snmp_db(self, mw_nodes) -> tuple:
         try:
-            from db.models import TblSnmpInfo
             from flask import current_app
 
             # Flask 컨텍스트 확인
@@ -339,15 +695,16 @@ class InferFailurePoint:
             failed_equipments = []  # TblSnmpInfo DB 테이블 내 조회 실패 장비 목록
             success_equipments = []  # 성공한 장비 목록
 
-            for node in mw_nodes:
-                # 노드 정보 디버깅 출력
-                self.logger.info(f"• 🔍 MW 노드 정보 디버깅:")
-                self.logger.info(f"  - node ID: {node.get('id')}")  # equip_id
-                self.logger.info(
-                    f"  - node name: {node.get('name')}")  # equip_name
-                self.logger.info(f"  - field: {node.get('field')}")
-                self.logger.info(f"  - level: {node.get('level')}")
+            # 전체 MW 장비를 한 번에 조회
+            # (tbl_snmp_info.equip_name IN (...), SNMP 접속 정보 캐시 경유)
+            equip_names = [str(node.get('name'))
+                           for node in mw_nodes if node.get('name')]
+            snmp_infos = get_snmp_credential_cache().get_many(equip_names)
 
+            self.logger.info(
+                f"• 🔍 MW 장비 SNMP 정보 일괄 검색: {len(equip_names)}개 장비")
+
+            for node in mw_nodes:
                 equip_name = node.get('name')  # or node.get('id')
 
                 if not equip_name:
@@ -356,37 +713,17 @@ class InferFailurePoint:
                     failed_equipments.append(f"<br>&nbsp; - {error_msg}")
                     continue
 
-                self.logger.info(
-                    f"• 🔍 MW 장비 SNMP 정보 검색: equip_name='{equip_name}'")
-
-                # ORM으로 정확히 일치하는 장비 조회
-                # (tbl_snmp_info.equip_name == node.equip_name)
-                snmp_info = TblSnmpInfo.query.filter_by(
-                    equip_name=str(equip_name)).first()
+                snmp_info = snmp_infos.get(str(equip_name))
 
                 if snmp_info:
-                    # SNMP 정보 디버깅 출력
-                    self.logger.info(f"• ✅ TblSnmpInfo 매칭 성공:")
-                    self.logger.info(f"  - SNMP ID: {snmp_info.id}")
-                    self.logger.info(f"  - SNMP IP: {snmp_info.snmp_ip}")
-                    self.logger.info(f"  - Community: {snmp_info.community}")
-                    self.logger.info(f"  - Equip Type: {snmp_info.equip_type}")
-                    self.logger.info(f"  - Equip Name: {snmp_info.equip_name}")
-
                     # SNMP API 요청을 위한 JSON 데이터 생성
-                    equipment_info = {
-                        'id': snmp_info.id,  # TblSnmpInfo의 Primary Key
-                        'snmp_ip': snmp_info.snmp_ip,
-                        'community': snmp_info.community,
-                        'equip_type': snmp_info.equip_type,
-                        'equip_name': snmp_info.equip_name
-                    }
+                    equipment_info = dict(snmp_info)
 
                     mw_equipment_data.append(equipment_info)
                     success_equipments.append(equipment_info)
 
-                    self.logger.info(
-                        f"• ✅ MW 장비 정보 수집 성공: {snmp_info.equip_name} (ID: {snmp_info.id}, IP: {snmp_info.snmp_ip})")
+                    self.logger.debug(
+                        f"• ✅ MW 장비 정보 수집 성공: {equipment_info['equip_name']} (ID: {equipment_info['id']}, IP: {equipment_info['snmp_ip']})")
                 else:
                     error_msg = f"MW 장비 '{node.get('name', 'Unknown')}' (equip_name: '{equip_name}'): TblSnmpInfo에서 매칭되는 SNMP 정보 없음"
                     self.logger.warning(f"• ⚠️ {error_msg}")
@@ -399,7 +736,7 @@ class InferFailurePoint:
             self.logger.error(f"• ❌ MW 장비 정보 수집 실패: {e}")
             return [], [], []
 
-    # 2-2. MW 상태 확인 API 호출 (전체 장비를 한꺼번에)
+    # 2-2. MW 상태 조회 (전체 장비를 한꺼번에, 프로세스 내부 제공자 직접 호출)
     def call_mw_snmp_api(self, guksa_id, mw_equipment_data) -> List[Dict]:
         try:
             # 요청 페이로드 생성 (전체 MW 장비를 한꺼번에)
@@ -408,47 +745,43 @@ class InferFailurePoint:
                 "data": mw_equipment_data  # 전체 성공한 장비들의 SNMP 정보
             }
 
+            provider = get_mw_status_provider()
+
             # 요청 JSON 디버깅 출력 (상세)
             self.logger.info(
-                f"• MW 상태 확인 API 호출: {len(mw_equipment_data)}개 장비, guksa_id={guksa_id}")
+                f"• MW 상태 조회 ({provider.name}): {len(mw_equipment_data)}개 장비, guksa_id={guksa_id}")
             self.logger.info("=" * 80)
-            self.logger.info("📤 MW API 요청 JSON (상세) - 전체 장비:")
+            self.logger.info("📤 MW 상태 요청 JSON (상세) - 전체 장비:")
             self.logger.info("=" * 80)
             self.logger.info(json.dumps(payload, indent=2, ensure_ascii=False))
             self.logger.info("=" * 80)
 
-            # API 호출
-            response = requests.post(
-                'http://localhost:5000/api/check_mw_status',
-                json=payload,
-                timeout=30
-            )
+            # /api/check_mw_status 라우트와 같은 제공자 호출 (HTTP 왕복 없음)
+            result = provider.check_status(guksa_id, mw_equipment_data)
 
-            if response.status_code == 200:
-                result = response.json()
+            # 응답 JSON 디버깅 출력 (상세)
+            self.logger.info(f"• ✅ MW 상태 데이터 수신 완료")
+            self.logger.info("=" * 80)
+            self.logger.info("📥 MW 상태 응답 JSON (상세) - 전체 장비:")
+            self.logger.info("=" * 80)
+            self.logger.info(json.dumps(
+                result, indent=2, ensure_ascii=False))
+            self.logger.info("=" * 80)
 
-                # 응답 JSON 디버깅 출력 (상세)
-                self.logger.info(f"• ✅ MW 상태 데이터 수신 완료")
-                self.logger.info("=" * 80)
-                self.logger.info("📥 MW API 응답 JSON (상세) - 전체 장비:")
-                self.logger.info("=" * 80)
-                self.logger.info(json.dumps(
-                    result, indent=2, ensure_ascii=False))
-                self.logger.info("=" * 80)
+            return result
 
-                return result
-            else:
-                self.logger.error(
-                    f"• ❌ MW 상태 API 호출 실패: {response.status_code}")
-                self.logger.error(f"• 응답 내용: {response.text}")
-                return []
+        except MwStatusError as e:
+            self.logger.error(f"• ❌ MW 상태 조회 실패: {str(e)}")
+            return []
 
         except Exception as e:
-            self.logger.error(f"• ❌ MW 상태 확인 API 호출 실패: {str(e)}")
+            self.logger.error(f"• ❌ MW 상태 확인 호출 실패: {str(e)}")
             return []
 
     # 2-3. MW 상태 데이터 분석 (요청/응답 ID 매칭 개선)
-    def analyze_mw_status_data(self, mw_status_data, mw_nodes, mw_equipment_data) -> tuple:
+    def analyze_mw_status_data(self, mw_status_data, mw_nodes, mw_equipment_data, failure_points=None) -> tuple:
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         failure_count = 0
         details = []
 
@@ -619,7 +952,7 @@ class InferFailurePoint:
                         equipment_failures['voltage_issues'])
 
                 # 장애점 추가 (통합된 하나의 장애점)
-                self.failure_points.append({
+                failure_points.append({
                     'type': 'node',  # mw_equipment -> node로 변경하여 애니메이션 처리 가능
                     # equip_name을 id로 사용
                     'id': requested_equip.get('equip_name', requested_id),
@@ -796,20 +1129,30 @@ class InferFailurePoint:
         return "전압 정보 없음"
 
     # 3. 상위 장비 장애점 분석
-    def analyze_upper_node_failures(self):
+    def analyze_upper_node_failures(self, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         self.logger.info("[3단계] 상위 장비 장애점 분석 시작")
 
-        # 노드별 경보 정보 매핑
-        node_alarm_map = self.create_node_alarm_map()
+        # 노드별 경보 정보 매핑 (analyze()에서 생성한 인덱스 재사용)
+        node_alarm_map = self.get_alarm_index().node_alarm_map
 
         # 계층별 장비 그룹화
         level_nodes = self.group_nodes_by_level()
 
+        # 링크 기반 계위 구조 구성 후 상향식 1회 탐색으로 장애 후보 산출
+        hierarchy = self.get_hierarchy()
+        upper_failure_ids = hierarchy.find_upper_failure_nodes(node_alarm_map)
+
         # 단계별 메시지 구성
         step_message = "🚩 [3단계] 상위 장비 장애점 분석 (계위별 경보 Tree 탐색)<br>\n"
         step_message += HR_LINE_HTML
         step_message += f"<br>• 전체 장비: {len(self.nodes)}대, 경보발생 장비: {len(node_alarm_map)}대\n"
         step_message += f"<br>&nbsp; - 하위 장비 모두 경보인 경우 상위 장비 장애 의심 탐색\n"
+        if hierarchy.use_links:
+            step_message += f"<br>&nbsp; - 링크 기준 상/하위 연결: {hierarchy.edge_count}구간\n"
+        else:
+            step_message += "<br>&nbsp; - 계위 링크 정보가 없어 Level 기준으로 상/하위 판단\n"
 
         level_info = []
         for level, nodes in level_nodes.items():
@@ -844,10 +1187,10 @@ class InferFailurePoint:
 
                 self.logger.info(f">>>>>>>>>>>>>>>>>>> 노드 전체: {node}")
 
-                if self.is_upper_node_failure(node, node_alarm_map, level_nodes):
-                    node_alarms = node_alarm_map.get(node['id'], [])
+                if node['id'] in upper_failure_ids:
+                    node_alarms = list(node_alarm_map.get(node['id'], ()))
 
-                    self.failure_points.append({
+                    failure_points.append({
                         'type': 'node',
                         'id': node['id'],
                         'name': node_name,
@@ -891,7 +1234,9 @@ class InferFailurePoint:
         self.logger.info("-------------------------------")
 
     # 4. 교환 노드 장애점 분석
-    def analyze_exchange_failures(self):
+    def analyze_exchange_failures(self, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         self.logger.info("[4단계] 교환 장비 장애점 분석 시작")
 
         exchange_nodes = [node for node in self.nodes if node.get(
@@ -923,13 +1268,13 @@ class InferFailurePoint:
             self.logger.info(f"• 교환 노드 경보 수: {len(node_alarms)}개")
 
             # 4-1: A1395 경보 체크 (100개 이상)
-            a1395_alarms = [alarm for alarm in node_alarms
-                            if 'A1395' in alarm.get('alarm_message', '')]
+            a1395_alarms = list(
+                self.get_alarm_index().get_by_code(node['id'], 'A1395'))
 
             self.logger.info(f"• A1395 경보 수: {len(a1395_alarms)}개")
 
             if len(a1395_alarms) >= 100:
-                self.failure_points.append({
+                failure_points.append({
                     'type': 'node',
                     'id': node['id'],
                     'name': node_name,
@@ -949,17 +1294,17 @@ class InferFailurePoint:
                 continue
 
             # 4-2: A1930 경보 분석
-            a1930_alarms = [alarm for alarm in node_alarms
-                            if 'A1930' in alarm.get('alarm_message', '')]
+            a1930_alarms = list(
+                self.get_alarm_index().get_by_code(node['id'], 'A1930'))
 
             self.logger.info(f"• A1930 경보 수: {len(a1930_alarms)}개")
 
             if a1930_alarms:
                 self.logger.info(f"• 🔍 A1930 경보 분석 진행: {node_name}")
-                before_count = len(self.failure_points)
+                before_count = len(failure_points)
                 a1930_result = self.analyze_a1930_failures_detailed(
-                    node, a1930_alarms)
-                after_count = len(self.failure_points)
+                    node, a1930_alarms, failure_points)
+                after_count = len(failure_points)
 
                 if after_count > before_count:
                     exchange_failure_count += (after_count - before_count)
@@ -985,13 +1330,15 @@ class InferFailurePoint:
         self.logger.info("-------------------------------")
 
     # 4-2. 교환 노드 장애점 분석 (상세 버전)
-    def analyze_a1930_failures_detailed(self, exchange_node, a1930_alarms):
+    def analyze_a1930_failures_detailed(self, exchange_node, a1930_alarms, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         # 타 분야 경보 내역 확인
         other_sector_alarms = self.get_other_sector_alarms(['IP', '전송'])
 
         if len(a1930_alarms) <= 10 and not other_sector_alarms:
             # Case 1: 다른 분야 경보 없고 A1930 10개 이하인 경우
-            self.failure_points.append({
+            failure_points.append({
                 'type': 'node',
                 'id': exchange_node['id'],
                 'name': exchange_node.get('name', exchange_node['id']),
@@ -1011,7 +1358,7 @@ class InferFailurePoint:
             for upper_node in upper_exchange_nodes:
                 upper_alarms = self.get_node_alarms(upper_node['id'])
                 if upper_alarms:
-                    self.failure_points.append({
+                    failure_points.append({
                         'type': 'node',
                         'id': upper_node['id'],
                         'name': upper_node.get('name', upper_node['id']),
@@ -1028,7 +1375,9 @@ class InferFailurePoint:
             return "장애조건 불일치"
 
     # 5. 전송 노드 장애점 분석
-    def analyze_transmission_failures(self):
+    def analyze_transmission_failures(self, failure_points=None):
+        failure_points = self.failure_points if failure_points is None else failure_points
+
         self.logger.info("[5단계] 전송 장애점 분석 시작")
 
         transmission_nodes = [node for node in self.nodes
@@ -1060,13 +1409,13 @@ class InferFailurePoint:
             self.logger.info(f"• 전송 장비 경보 수: {len(node_alarms)}개")
 
             # 5-1: LOS 경보 체크
-            los_alarms = [alarm for alarm in node_alarms
-                          if 'LOS' in alarm.get('alarm_message', '').upper()]
+            los_alarms = list(
+                self.get_alarm_index().get_by_code(node['id'], 'LOS'))
 
             self.logger.info(f"• LOS 경보 수: {len(los_alarms)}건")
 
             if los_alarms:
-                self.failure_points.append({
+                failure_points.append({
                     'type': 'node',
                     'id': node['id'],
                     'name': node_name,
@@ -1096,13 +1445,13 @@ class InferFailurePoint:
                 continue
 
             # 5-2: LOF 경보 체크
-            lof_alarms = [alarm for alarm in node_alarms
-                          if 'LOF' in alarm.get('alarm_message', '').upper()]
+            lof_alarms = list(
+                self.get_alarm_index().get_by_code(node['id'], 'LOF'))
 
             self.logger.info(f"&nbsp;&nbsp; - LOF 경보 수: {len(lof_alarms)}건")
 
             if lof_alarms:
-                self.failure_points.append({
+                failure_points.append({
                     'type': 'node',
                     'id': node['id'],
                     'name': node_name,
@@ -1158,19 +1507,9 @@ class InferFailurePoint:
 
     def create_node_alarm_map(self) -> Dict[str, List[Dict]]:
         """노드별 경보 매핑"""
-        node_alarm_map = defaultdict(list)
-
-        # 전달받은 노드의 경보 정보 활용
-        for node in self.nodes:
-            node_id = node.get('id')
-            node_alarms = node.get('alarms', [])
-
-            if node_id and node_alarms:
-                # 수정: 모든 경보 포함
-                all_alarms = [alarm for alarm in node_alarms if alarm]
-                node_alarm_map[node_id] = all_alarms
-
-        return dict(node_alarm_map)
+        # 경보 인덱스의 노드별 매핑을 dict로 복사하여 반환
+        return {node_id: list(node_alarms)
+                for node_id, node_alarms in self.get_alarm_index().node_alarm_map.items()}
 
     def group_nodes_by_level(self) -> Dict[int, List[Dict]]:
         """레벨별 노드 그룹화"""
@@ -1182,7 +1521,7 @@ class InferFailurePoint:
 
         return dict(level_nodes)
 
-    def is_upper_node_failure(self, node, node_alarm_map, level_nodes) -> bool:
+    def is_upper_node_failure(self, node, node_alarm_map, level_nodes=None) -> bool:
         """상위 노드 장애 여부 판단"""
         node_id = node['id']
 
@@ -1208,42 +1547,34 @@ class InferFailurePoint:
 
         return True
 
-    def find_lower_nodes(self, node, level_nodes) -> List[Dict]:
-        """하위 노드 찾기"""
-        current_level = node.get('level', 0)
-        lower_nodes = []
-
-        for level in range(current_level + 1, max(level_nodes.keys()) + 1):
-            lower_nodes.extend(level_nodes.get(level, []))
+    def find_lower_nodes(self, node, level_nodes=None) -> List[Dict]:
+        """하위 노드 찾기 (링크 기반)"""
+        return self.get_hierarchy().find_lower_nodes(node['id'])
 
-        return lower_nodes
+    def find_upper_nodes(self, node, level_nodes=None) -> List[Dict]:
+        """상위 노드 찾기 (링크 기반)"""
+        return self.get_hierarchy().find_upper_nodes(node['id'])
 
-    def find_upper_nodes(self, node, level_nodes) -> List[Dict]:
-        """상위 노드 찾기"""
-        current_level = node.get('level', 0)
-        upper_nodes = []
+    def get_hierarchy(self) -> NodeHierarchy:
+        """링크 기반 장비 계위 구조 조회 (최초 호출 시 1회 생성)"""
+        if self.hierarchy is None:
+            self.hierarchy = NodeHierarchy(self.nodes, self.links)
+        return self.hierarchy
 
-        for level in range(0, current_level):
-            upper_nodes.extend(level_nodes.get(level, []))
-
-        return upper_nodes
+    def get_alarm_index(self) -> NodeAlarmIndex:
+        """노드별 경보 인덱스 조회 (analyze() 밖에서 단계 메서드를 직접 호출한 경우 생성)"""
+        if self.alarm_index is None:
+            self.alarm_index = NodeAlarmIndex(self.nodes, self.alarms)
+        return self.alarm_index
 
     def get_node_alarms(self, node_id) -> List[Dict]:
         """노드 경보 조회"""
-        # 노드별 경보 매핑을 생성하여 활용
-        node_alarm_map = self.create_node_alarm_map()
-        return node_alarm_map.get(node_id, [])
+        # 노드별 경보 인덱스를 재사용 (호출마다 매핑을 다시 만들지 않음)
+        return list(self.get_alarm_index().get(node_id))
 
     def get_other_sector_alarms(self, fields) -> List[Dict]:
         """다른 분야 경보 조회"""
-        other_alarms = []
-
-        for alarm in self.alarms:
-            alarm_sector = alarm.get('sector', '').upper()
-            if alarm_sector in [field.upper() for field in fields]:
-                other_alarms.append(alarm)
-
-        return other_alarms
+        return self.get_alarm_index().get_by_sectors(fields)
 
     def find_upper_exchange_nodes(self, exchange_node) -> List[Dict]:
         """상위 교환 노드 찾기"""
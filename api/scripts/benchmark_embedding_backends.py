@@ -0,0 +1,105 @@
+"""
+임베딩 백엔드 벤치마크 모듈
+
+합성 장애사례 문서/경보 질의로 embedding_backends의 백엔드(torch, torch-int8, onnx, onnx-int8)를 비교합니다.
+- 로드 시간, 문서 일괄 인코딩 처리량(docs/s), 단건 질의 지연(p50/p95)
+- 기준 백엔드(torch fp32) 대비 코사인 점수 일치 여부 (임베딩 코사인, 점수 최대 오차, 상위 5건 일치율)
+
+실행: python -m api.scripts.benchmark_embedding_backends [--backends torch,torch-int8,onnx,onnx-int8] [--docs 256] [--queries 50]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from api.scripts.embedding_backends import EMBEDDING_BACKENDS, compare_backend_scores, create_embedding_backend
+from api.scripts.fault_prediction_constants import DEFAULT_PROMPT_START_MESSAGE, FIELD_KEYWORDS
+
+# 합격 기준 (기준 백엔드 대비)
+MIN_VECTOR_COSINE = 0.99
+MIN_TOP_K_OVERLAP = 0.8
+
+
+def build_texts(doc_count, query_count, seed=42):
+    """합성 장애사례 문서와 경보 질의 생성"""
+    rng = random.Random(seed)
+    fields = list(FIELD_KEYWORDS)
+
+    def alarm_lines(count):
+        field = rng.choice(fields)
+        return "\n".join(f"{field} 경보 {rng.choice(FIELD_KEYWORDS[field])} 장비{rng.randrange(100)} "
+                         f"{rng.choice(FIELD_KEYWORDS[rng.choice(fields)])}" for _ in range(count))
+
+    documents = [f"장애명: 장애사례 {i}\n경보현황:\n{alarm_lines(rng.randrange(3, 12))}\n장애분석: 원인 분석 내용"
+                 for i in range(doc_count)]
+    queries = [DEFAULT_PROMPT_START_MESSAGE + alarm_lines(rng.randrange(2, 8)) for _ in range(query_count)]
+    return documents, queries
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", default=",".join(EMBEDDING_BACKENDS), help="비교할 백엔드 (쉼표 구분)")
+    parser.add_argument("--reference", default="torch", help="점수 비교 기준 백엔드")
+    parser.add_argument("--docs", type=int, default=256, help="일괄 인코딩 문서 수")
+    parser.add_argument("--queries", type=int, default=50, help="단건 질의 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    documents, queries = build_texts(args.docs, args.queries)
+    backend_names = [name.strip() for name in args.backends.split(",") if name.strip()]
+    if args.reference not in backend_names:
+        backend_names.insert(0, args.reference)
+
+    backends = {}
+    print(f"문서 {len(documents)}건, 질의 {len(queries)}건")
+    print(f"{'backend':<11} | {'load(s)':>7} | {'docs/s':>8} | {'p50(ms)':>8} | {'p95(ms)':>8}")
+    print("-" * 54)
+
+    for name in backend_names:
+        start = time.perf_counter()
+        backend = create_embedding_backend(name)
+        load_elapsed = time.perf_counter() - start
+        backends[name] = backend
+
+        backend.encode(queries[:2])  # 예열
+
+        start = time.perf_counter()
+        backend.encode(documents)
+        throughput = len(documents) / (time.perf_counter() - start)
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            backend.encode([query])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        print(f"{name:<11} | {load_elapsed:>7.1f} | {throughput:>8.1f} | "
+              f"{statistics.median(latencies):>8.1f} | {percentile(latencies, 0.95):>8.1f}")
+
+    print()
+    print(f"기준 백엔드({args.reference}) 대비 코사인 점수 일치 "
+          f"(기준: 임베딩 코사인 ≥ {MIN_VECTOR_COSINE}, 상위 5건 일치율 ≥ {MIN_TOP_K_OVERLAP})")
+    print(f"{'backend':<11} | {'min cos':>8} | {'mean cos':>8} | {'max diff':>8} | {'top5':>5} | {'pass':>5}")
+    print("-" * 60)
+
+    reference = backends[args.reference]
+    for name, backend in backends.items():
+        if name == args.reference:
+            continue
+        parity = compare_backend_scores(reference, backend, queries, documents)
+        passed = (parity['min_vector_cosine'] >= MIN_VECTOR_COSINE
+                  and parity['top_k_overlap'] >= MIN_TOP_K_OVERLAP)
+        print(f"{name:<11} | {parity['min_vector_cosine']:>8.4f} | {parity['mean_vector_cosine']:>8.4f} | "
+              f"{parity['max_score_diff']:>8.4f} | {parity['top_k_overlap']:>5.2f} | {str(passed):>5}")
+
+
+if __name__ == "__main__":
+    main()
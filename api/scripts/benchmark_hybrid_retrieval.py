@@ -0,0 +1,218 @@
+"""
+하이브리드 검색(벡터 + BM25/경보 코드 RRF) 벤치마크 모듈
+
+합성 장애사례를 rag_data.json 형식 임시 파일과 Chroma 메모리 컬렉션(vector_db_creation 청크 형식)에 적재하고
+사례 고유 경보 코드가 들어 있는 경보 질의로 다음 두 방식의 재현율과 지연 시간을 비교합니다.
+- vector: 기존 방식 (벡터 상위 15개 청크 → 장애번호 중복 제거 → 재순위)
+- hybrid-<max|sum|rrf>: retrieve_hybrid_candidates (사례 단위 벡터 검색 + 어휘 색인 RRF 결합 → 재순위)
+
+임베딩은 기본적으로 문자 3-gram 해싱 임베딩(--embedding hash, 모델 없이 실행 가능한 근사치)을 사용하며
+--embedding backend 지정 시 EMBEDDING_BACKEND 백엔드(e5 모델)를 사용합니다.
+
+실행: python -m api.scripts.benchmark_hybrid_retrieval [--cases 1000] [--queries 100] [--embedding hash]
+"""
+
+import os
+import json
+import math
+import time
+import zlib
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import functools
+import statistics
+
+import chromadb
+
+# api.scripts 모듈은 RAG_DOCUMENT(임시 rag_data.json) 설정 후 임포트 (어휘 색인 원본 경로가 임포트 시 결정됨)
+
+SECTORS = ["전송", "IP", "교환", "MW", "선로", "무선"]
+SHARED_CODES = ["OSC-LOS", "AU-AIS", "MS-AIS", "LINK-FAIL", "GFP-FAIL", "OPT-PWR-LOW", "STM64_LOS",
+                "MUT_LOS", "A6220", "A1930", "TU-AIS", "MEP_LSP_LOC"]
+HASH_DIMENSIONS = 384
+
+
+class HashingEmbeddingFunction:
+    """문자 3-gram 해싱 임베딩 (모델 없이 벤치마크를 실행하기 위한 근사치)"""
+
+    def __call__(self, input):
+        from api.scripts.fault_prediction_utils import normalize_text
+
+        embeddings = []
+        for text in input:
+            vector = [0.0] * HASH_DIMENSIONS
+            norm_text = normalize_text(text)
+            for i in range(len(norm_text) - 2):
+                vector[zlib.crc32(norm_text[i:i + 3].encode("utf-8")) % HASH_DIMENSIONS] += 1.0
+            length = math.sqrt(sum(value * value for value in vector)) or 1.0
+            embeddings.append([value / length for value in vector])
+        return embeddings
+
+
+def build_cases(count, seed=42):
+    """합성 장애사례 (사례마다 고유 경보 코드 1개 + 공통 경보 코드/분야 키워드)"""
+    from api.scripts.fault_prediction_constants import FIELD_KEYWORDS
+
+    rng = random.Random(seed)
+    cases = []
+    for i in range(count):
+        sector = rng.choice(SECTORS)
+        keywords = FIELD_KEYWORDS[sector]
+        unique_code = f"E{1000 + i:04d}"
+        alert_lines = [f"{rng.choice(keywords)} {rng.choice(SHARED_CODES)} 장비{rng.randrange(50)} 경보 발생"
+                       for _ in range(rng.randrange(3, 8))]
+        alert_lines.insert(rng.randrange(len(alert_lines) + 1), f"{unique_code} {rng.choice(keywords)} 경보 발생")
+
+        cases.append({
+            "장애번호": f"F{i:05d}",
+            "장애명": f"{sector} {rng.choice(keywords)} 장애",
+            "장애분야": sector,
+            "장애점": rng.choice(keywords),
+            "발생일자": f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "국사": f"국사{rng.randrange(100)}",
+            "장애접수내역": f"{rng.choice(keywords)} 관련 장애 접수, {rng.choice(keywords)} 확인 요청",
+            "경보현황": "\n".join(alert_lines),
+            "장애분석": f"{rng.choice(keywords)} 원인으로 {rng.choice(keywords)} 장애 발생",
+            "조치내역": f"{rng.choice(keywords)} 교체 후 정상화",
+        })
+    return cases
+
+
+def build_queries(cases, count, seed=7):
+    """질의: 대상 사례의 고유 경보 코드 + 다른 사례들의 경보 줄 (정답: 대상 장애번호)"""
+    from api.scripts.fault_prediction_constants import DEFAULT_PROMPT_START_MESSAGE
+
+    rng = random.Random(seed)
+    queries = []
+    for target in rng.sample(cases, count):
+        unique_line = next(line for line in target["경보현황"].splitlines() if line.startswith("E"))
+        noise = [line for case in rng.sample(cases, 3) for line in case["경보현황"].splitlines()[:2]
+                 if not line.startswith("E")]
+        lines = noise + [unique_line]
+        rng.shuffle(lines)
+        queries.append((DEFAULT_PROMPT_START_MESSAGE + "\n".join(lines), target["장애번호"]))
+    return queries
+
+
+def populate_collection(cases, embedding_function):
+    """vector_db_creation 청크 형식으로 Chroma 메모리 컬렉션 적재"""
+    from api.scripts.vector_db_creation import create_embedding_chunks
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(name="benchmark_nw_incidents", embedding_function=embedding_function)
+    chunks = create_embedding_chunks(cases)
+    for start in range(0, len(chunks), 500):
+        batch = chunks[start:start + 500]
+        collection.add(ids=[chunk["id"] for chunk in batch], documents=[chunk["text"] for chunk in batch],
+                       metadatas=[chunk["metadata"] for chunk in batch])
+    return collection, len(chunks)
+
+
+async def vector_candidates(query, collection, query_embedding, field_filter, top_k=5):
+    """기존 방식: 벡터 상위 청크만 후보로 사용"""
+    from api.scripts.fault_prediction_core_4 import build_candidate_info
+
+    params = {"query_embeddings": [query_embedding], "n_results": min(top_k * 3, 15),
+              "include": ["documents", "metadatas", "distances"]}
+    if field_filter:
+        params["where"] = field_filter
+    results = collection.query(**params)
+
+    candidates = {}
+    for doc, meta, distance in zip(results["documents"][0], results["metadatas"][0], results["distances"][0]):
+        fault_number = meta.get("장애번호")
+        if fault_number and fault_number not in candidates:
+            candidates[fault_number] = build_candidate_info(doc, meta, distance)
+    return list(candidates.values()), results
+
+
+async def run(queries, collection, embedding_function, top_k=5):
+    from api.scripts.case_retrieval import CASE_AGGREGATIONS
+    from api.scripts.fault_prediction_core_4 import (
+        create_field_filter, extract_fields_from_query, retrieve_hybrid_candidates)
+    from api.scripts.hybrid_reranker import score_documents
+
+    modes = [("vector", vector_candidates)] + [
+        (f"hybrid-{aggregation}", functools.partial(retrieve_hybrid_candidates, aggregation=aggregation))
+        for aggregation in CASE_AGGREGATIONS]
+
+    rows = {}
+    for label, retrieve in modes:
+        candidate_hits = 0
+        top_hits = 0
+        latencies = []
+        for query, target in queries:
+            field_filter = create_field_filter(extract_fields_from_query(query))
+            query_embedding = embedding_function([query])[0]
+
+            start = time.perf_counter()
+            candidates, _ = await retrieve(query, collection, query_embedding, field_filter, top_k)
+            scores = score_documents(query, candidates)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            ranked = [candidate["metadata"]["장애번호"] for _, candidate in
+                      sorted(zip(scores, candidates), key=lambda item: -item[0])]
+            candidate_hits += target in ranked
+            top_hits += target in ranked[:top_k]
+
+        latencies.sort()
+        rows[label] = (candidate_hits / len(queries), top_hits / len(queries),
+                       statistics.mean(latencies), latencies[int(len(latencies) * 0.95) - 1])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이브리드 검색 벤치마크")
+    parser.add_argument("--cases", type=int, default=1000, help="장애사례 수")
+    parser.add_argument("--queries", type=int, default=100, help="질의 수")
+    parser.add_argument("--embedding", choices=["hash", "backend"], default="hash",
+                        help="hash: 문자 3-gram 해싱 임베딩, backend: EMBEDDING_BACKEND 모델")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    cases = build_cases(args.cases)
+    queries = build_queries(cases, min(args.queries, args.cases))
+
+    # 어휘 색인은 서버와 같은 방식으로 rag_data.json(임시 파일)에서 생성
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rag_path = os.path.join(temp_dir, "rag_data.json")
+        with open(rag_path, "w", encoding="utf-8") as f:
+            json.dump(cases, f, ensure_ascii=False)
+        os.environ["RAG_DOCUMENT"] = rag_path
+
+        from api.scripts.lexical_index import get_lexical_index
+
+        if args.embedding == "hash":
+            embedding_function = HashingEmbeddingFunction()
+        else:
+            from api.scripts.embedding_backends import create_embedding_backend
+            embedding_function = create_embedding_backend()
+
+        start = time.perf_counter()
+        collection, chunk_count = populate_collection(cases, embedding_function)
+        load_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lexical_index = get_lexical_index()
+        lexical_index.load()  # 백그라운드 로딩 완료까지 대기
+        lexical_stats = lexical_index.stats()
+        index_elapsed = time.perf_counter() - start
+
+        rows = asyncio.run(run(queries, collection, embedding_function))
+
+    print(f"사례 {args.cases}건 (청크 {chunk_count}개, 적재 {load_elapsed:.1f}초), 질의 {len(queries)}건, "
+          f"임베딩 {args.embedding}")
+    print(f"어휘 색인: 토큰 {lexical_stats['tokens']}개, 경보 코드 {lexical_stats['codes']}개, "
+          f"생성 {index_elapsed * 1000:.0f}ms")
+    print(f"{'mode':<10} | {'candidate recall':>16} | {'recall@5':>8} | {'mean(ms)':>8} | {'p95(ms)':>8}")
+    print("-" * 64)
+    for label, (candidate_recall, top_recall, mean_ms, p95_ms) in rows.items():
+        print(f"{label:<10} | {candidate_recall:>16.2f} | {top_recall:>8.2f} | {mean_ms:>8.2f} | {p95_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+장애점 추정(InferFailurePoint) 벤치마크 모듈
+
+합성 토폴로지(1k/5k/20k 노드)를 생성하여 단계별 분석 시간을 측정하고
+노드 수 대비 처리 시간이 선형에 가깝게 증가하는지 확인합니다.
+MW 조회 지연을 모사하여 단계 순차 실행과 동시 실행의 전체 소요 시간도 비교합니다.
+
+실행: python -m api.scripts.benchmark_infer_failure_point [--sizes 1000 5000 20000] [--mw-delay 1.0]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from api.scripts.InferFailurePoint import InferFailurePoint, NodeAlarmIndex, NodeHierarchy
+
+DEFAULT_SIZES = [1000, 5000, 20000]
+
+# 합성 노드 분야 및 경보 메시지 샘플
+SYNTHETIC_FIELDS = ['교환', '전송', 'IP']
+SYNTHETIC_ALARM_MESSAGES = {
+    '교환': ['A1395 AGW DISCONNECTED', 'A1930 UP0 LINK FAIL', 'T1 TIME OUT'],
+    '전송': ['STM64_LOS', 'OTU4-LOF', 'AU-AIS'],
+    'IP': ['Port Down', 'Ping 무응답', 'OSPF Neighbor Down'],
+}
+
+
+def build_synthetic_topology(node_count, alarm_ratio=0.3, alarms_per_node=5, seed=42):
+    """합성 토폴로지 생성 (트리 구조, 노드 일부에 경보 부여)"""
+    rng = random.Random(seed)
+    nodes = []
+    links = []
+
+    for i in range(node_count):
+        field = SYNTHETIC_FIELDS[i % len(SYNTHETIC_FIELDS)]
+        node_id = f"N{i}"
+
+        # 부모 노드 선택 (이진 트리 형태의 계위)
+        parent = (i - 1) // 2 if i > 0 else None
+        level = 0 if parent is None else nodes[parent]['level'] + 1
+
+        alarms = []
+        if rng.random() < alarm_ratio:
+            for _ in range(alarms_per_node):
+                alarms.append({
+                    'alarm_message': rng.choice(SYNTHETIC_ALARM_MESSAGES[field]),
+                    'sector': field,
+                })
+
+        nodes.append({
+            'id': node_id,
+            'name': f"EQUIP-{i}",
+            'field': field,
+            'level': level,
+            'alarms': alarms,
+        })
+
+        if parent is not None:
+            links.append({
+                'id': f"L{i}",
+                'source': f"N{parent}",
+                'target': node_id,
+                'link_name': f"LINK-{parent}-{i}",
+                'alarms': [],
+            })
+
+    alarms = [alarm for node in nodes for alarm in node['alarms']]
+    return nodes, links, alarms
+
+
+def time_call(func, *args):
+    """함수 실행 시간(초) 측정"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_size(node_count):
+    """노드 수별 경보 인덱스 생성 및 3/4/5단계 분석 시간 측정"""
+    nodes, links, alarms = build_synthetic_topology(node_count)
+
+    analyzer = InferFailurePoint()
+    analyzer.nodes = nodes
+    analyzer.links = links
+    analyzer.alarms = alarms
+
+    results = {
+        'index': time_call(NodeAlarmIndex, nodes, alarms),
+    }
+    analyzer.alarm_index = NodeAlarmIndex(nodes, alarms)
+
+    results['hierarchy'] = time_call(NodeHierarchy, nodes, links)
+    results['upper'] = time_call(analyzer.analyze_upper_node_failures)
+    results['exchange'] = time_call(analyzer.analyze_exchange_failures)
+    results['transmission'] = time_call(analyzer.analyze_transmission_failures)
+    return results
+
+
+class DelayedMwInferFailurePoint(InferFailurePoint):
+    """MW 단계의 SNMP 조회 대기 시간을 sleep으로 모사한 분석기"""
+
+    mw_delay = 1.0
+
+    def analyze_mw_equipment_status(self, failure_points=None):
+        time.sleep(self.mw_delay)
+
+
+def benchmark_end_to_end(node_count, mw_delay):
+    """analyze() 전체 소요 시간: 단계 순차 실행 vs 동시 실행"""
+    nodes, links, alarms = build_synthetic_topology(node_count)
+    DelayedMwInferFailurePoint.mw_delay = mw_delay
+
+    results = {}
+    for label, parallel in (('sequential', False), ('parallel', True)):
+        analyzer = DelayedMwInferFailurePoint(parallel_stages=parallel)
+        results[label] = time_call(analyzer.analyze, nodes, links, alarms)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InferFailurePoint 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="측정할 노드 수 목록")
+    parser.add_argument("--mw-delay", type=float, default=1.0,
+                        help="모사할 MW SNMP 조회 지연(초)")
+    args = parser.parse_args()
+
+    # 단계별 상세 로그는 측정에서 제외
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'nodes':>8} | {'stage':<14} | {'total(ms)':>10} | {'us/node':>8}")
+    print("-" * 50)
+
+    for size in args.sizes:
+        results = benchmark_size(size)
+        for stage, elapsed in results.items():
+            print(
+                f"{size:>8} | {stage:<14} | {elapsed * 1000:>10.1f} | {elapsed * 1e6 / size:>8.2f}")
+        print("-" * 50)
+
+    print("us/node 값이 노드 수와 무관하게 비슷하면 선형 확장입니다.")
+
+    print()
+    print(f"analyze() 전체 소요 시간 (MW 지연 {args.mw_delay:.1f}초 모사)")
+    print(f"{'nodes':>8} | {'sequential(s)':>13} | {'parallel(s)':>11}")
+    print("-" * 40)
+
+    for size in args.sizes:
+        results = benchmark_end_to_end(size, args.mw_delay)
+        print(f"{size:>8} | {results['sequential']:>13.2f} | {results['parallel']:>11.2f}")
+
+    print("동시 실행 시간은 가장 느린 단계(MW)에 가까워야 합니다.")
+
+
+if __name__ == "__main__":
+    main()
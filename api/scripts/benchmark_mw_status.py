@@ -0,0 +1,195 @@
+"""
+MW 상태 조회 벤치마크 모듈
+
+InferFailurePoint의 MW 상태 조회를 프로세스 내부 제공자 직접 호출과
+로컬 HTTP 왕복(기존 /api/check_mw_status 호출 방식) 두 가지로 측정하여
+루프백 HTTP 홉 제거에 따른 호출당 지연 차이를 비교합니다.
+소켓 서버 대역(mw_zmq_standin_server)을 띄워 장비별 REQ 순차 요청과
+공용 DEALER 폴러(mw_zmq_poller) fan-out의 국사 단위 조회 시간도 비교합니다.
+
+실행: python -m api.scripts.benchmark_mw_status [--iterations 200] [--equipments 10] [--device-delay 0.2]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api.scripts.mw_status_provider import create_mw_status_provider
+
+# 벤치마크용 제공자 (기본 sample 백엔드)
+_provider = create_mw_status_provider("sample")
+
+
+class MwStatusHandler(BaseHTTPRequestHandler):
+    """/api/check_mw_status 라우트와 같은 제공자를 호출하는 로컬 HTTP 핸들러"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        result = _provider.check_status(
+            payload.get('guksa_id'), payload.get('data', []))
+
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_equipment_list(count):
+    """합성 MW 장비 목록 생성 (TblSnmpInfo 형식)"""
+    return [{
+        'id': i,
+        'snmp_ip': f"10.0.0.{i % 250 + 1}",
+        'community': 'public',
+        'equip_type': 'IP-20',
+        'equip_name': f"MW-EQUIP-{i}",
+    } for i in range(count)]
+
+
+def measure(func, iterations):
+    """호출별 소요 시간(ms) 목록 측정"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def benchmark(iterations, equipment_count):
+    """프로세스 내부 호출 vs 로컬 HTTP 왕복 지연 측정"""
+    equipment_list = build_equipment_list(equipment_count)
+    payload = json.dumps({"guksa_id": 1, "data": equipment_list}).encode('utf-8')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MwStatusHandler)
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/check_mw_status"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def call_http():
+        request = urllib.request.Request(
+            url, data=payload, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+
+    def call_in_process():
+        return _provider.check_status(1, equipment_list)
+
+    try:
+        return {
+            'in-process': measure(call_in_process, iterations),
+            'loopback-http': measure(call_http, iterations),
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def benchmark_zmq(equipment_count, device_delay, max_in_flight):
+    """장비별 REQ 순차 요청 vs DEALER 폴러 fan-out (느린 장비 1대 포함 부분 결과)"""
+    import zmq
+
+    from api.scripts.mw_zmq_poller import MwZmqPoller
+    from api.scripts.mw_zmq_standin_server import MwStandInServer
+
+    equipment_list = build_equipment_list(equipment_count)
+    slow_id = equipment_list[-1]['id']
+    timeout_ms = int(device_delay * 1000 * 5)
+
+    server = MwStandInServer(delay=device_delay, slow_ids=[slow_id], slow_delay=device_delay * 50)
+    endpoint = server.start()
+
+    def call_req_sequential(devices):
+        context = zmq.Context.instance()
+        results = []
+        for equipment in devices:
+            socket = context.socket(zmq.REQ)
+            socket.setsockopt(zmq.RCVTIMEO, timeout_ms)
+            socket.setsockopt(zmq.LINGER, 0)
+            socket.connect(endpoint)
+            try:
+                socket.send_string(json.dumps({"guksa_id": 1, "data": [equipment]}))
+                results.extend(json.loads(socket.recv_string()))
+            except zmq.Again:
+                pass
+            finally:
+                socket.close()
+        return results
+
+    poller = MwZmqPoller(endpoint, max_in_flight=max_in_flight, timeout_ms=timeout_ms)
+    fast_devices = equipment_list[:-1]
+
+    try:
+        results = {}
+        for label, func in (
+            ('req-sequential', lambda: call_req_sequential(fast_devices)),
+            ('dealer-fanout', lambda: poller.poll_devices(1, fast_devices)),
+            ('req+slow', lambda: call_req_sequential(equipment_list)),
+            ('dealer+slow', lambda: poller.poll_devices(1, equipment_list)),
+        ):
+            start = time.perf_counter()
+            output = func()
+            elapsed = time.perf_counter() - start
+            received = len(output[0]) if isinstance(output, tuple) else len(output)
+            results[label] = (elapsed, received)
+        return results
+    finally:
+        poller.close()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MW 상태 조회 벤치마크")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="측정 반복 횟수")
+    parser.add_argument("--equipments", type=int, default=10,
+                        help="요청당 MW 장비 수")
+    parser.add_argument("--device-delay", type=float, default=0.2,
+                        help="소켓 서버 대역의 장비별 응답 지연(초)")
+    parser.add_argument("--max-in-flight", type=int, default=16,
+                        help="DEALER 폴러 동시 요청 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    results = benchmark(args.iterations, args.equipments)
+
+    print(f"{'mode':<14} | {'mean(ms)':>9} | {'p50(ms)':>8} | {'p95(ms)':>8}")
+    print("-" * 48)
+    for mode, samples in results.items():
+        samples = sorted(samples)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{mode:<14} | {statistics.mean(samples):>9.3f} | "
+              f"{statistics.median(samples):>8.3f} | {p95:>8.3f}")
+
+    print("in-process 값이 루프백 HTTP 홉이 제거된 호출당 지연입니다.")
+
+    try:
+        import zmq  # noqa: F401
+    except ImportError:
+        print("pyzmq 미설치: ZMQ 폴러 벤치마크 생략")
+        return
+
+    print()
+    print(f"국사 단위 MW 조회 ({args.equipments}개 장비, 장비별 지연 {args.device_delay:.2f}초, "
+          f"마지막 장비는 응답 없음 수준으로 지연)")
+    print(f"{'mode':<16} | {'elapsed(s)':>10} | {'received':>8}")
+    print("-" * 42)
+    for mode, (elapsed, received) in benchmark_zmq(
+            args.equipments, args.device_delay, args.max_in_flight).items():
+        print(f"{mode:<16} | {elapsed:>10.2f} | {received:>8}")
+
+    print("dealer 결과는 장비 수와 무관하게 장비 1대 지연(+slow는 장비별 타임아웃)에 가까워야 합니다.")
+
+
+if __name__ == "__main__":
+    main()
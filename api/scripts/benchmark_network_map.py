@@ -0,0 +1,260 @@
+"""
+네트워크 맵(/api/network_map) 벤치마크 모듈
+
+SQLite 메모리 DB에 합성 국사/장비/링크 데이터를 적재하고
+기존 방식(국사별 장비 조회 + 링크별 국사 2회 조회)과 집계 쿼리 방식(build_network_map)의
+요청 처리 시간과 쿼리 수를 Flask 테스트 클라이언트로 비교합니다.
+버전별 스냅샷(ETag/gzip) 경로의 최초 구성, 메모리 응답, 304 응답 시간도 측정합니다.
+
+실행: python -m api.scripts.benchmark_network_map [--guksa 500] [--equipments 20] [--links 3000]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from flask import Flask, jsonify, request
+from sqlalchemy import event
+
+from db.models import db, TblGuksa, TblEquipment, TblLink
+from api.scripts.network_map import NetworkMapSnapshotStore, build_network_map
+
+SECTORS = ['IP', '전송', '교환', 'MW', '선로', '무선']
+
+
+def legacy_network_map(guksa_id=None, equip_id=None, sector=None):
+    """기존 /api/network_map 구현 (국사별/링크별 개별 조회)"""
+    guksa_query = db.session.query(TblGuksa)
+    if guksa_id:
+        guksa_query = guksa_query.filter(TblGuksa.guksa_id == guksa_id)
+    guksas = guksa_query.all()
+
+    if not guksas:
+        return None
+
+    nodes = []
+    for guksa in guksas:
+        equipments = TblEquipment.query.filter_by(guksa_id=guksa.guksa_id).all()
+
+        sector_counts = {}
+        for eq in equipments:
+            if eq.sector:
+                sector_counts[eq.sector] = sector_counts.get(eq.sector, 0) + 1
+
+        main_sector = max(sector_counts.items(), key=lambda x: x[1])[0] if sector_counts else 'default'
+
+        nodes.append({
+            "id": guksa.guksa_id,
+            "label": guksa.guksa,
+            "type": "guksa",
+            "field": main_sector,
+            "equipment_count": len(equipments)
+        })
+
+        if equip_id or guksa_id:
+            equip_query = TblEquipment.query.filter_by(guksa_id=guksa.guksa_id)
+            if equip_id:
+                equip_query = equip_query.filter(TblEquipment.id == equip_id)
+            if sector:
+                equip_query = equip_query.filter(TblEquipment.sector == sector)
+
+            for eq in equip_query.all():
+                nodes.append({
+                    "id": f"e{eq.id}",
+                    "label": eq.equip_name,
+                    "type": "equipment",
+                    "field": eq.sector,
+                    "parent": guksa.guksa_id,
+                    "equip_model": eq.equip_model
+                })
+
+    links_query = db.session.query(TblLink)
+    if guksa_id:
+        guksa_obj = TblGuksa.query.filter_by(guksa_id=guksa_id).first()
+        if guksa_obj:
+            links_query = links_query.filter(
+                (TblLink.local_guksa_name == guksa_obj.guksa_t) |
+                (TblLink.remote_guksa_name == guksa_obj.guksa_t)
+            )
+
+    edges = []
+    for link in links_query.all():
+        local_guksa = TblGuksa.query.filter_by(guksa_t=link.local_guksa_name).first()
+        remote_guksa = TblGuksa.query.filter_by(guksa=link.remote_guksa_name).first()
+
+        if local_guksa and remote_guksa:
+            edges.append({
+                "id": link.id,
+                "from": local_guksa.guksa_id,
+                "to": remote_guksa.guksa_id,
+                "type": link.link_type,
+                "updown": link.updown_type,
+                "link_name": link.link_name
+            })
+
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "filtered": {"guksa_id": guksa_id, "equip_id": equip_id, "sector": sector}
+    }
+
+
+def build_app():
+    """SQLite 메모리 DB + 기존/신규 network_map 라우트를 가진 Flask 앱 생성"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    for path, builder in (('/legacy_network_map', legacy_network_map),
+                          ('/network_map', build_network_map)):
+        def view(builder=builder):
+            data = builder(request.args.get('guksa_id'), request.args.get('equip_id'),
+                           request.args.get('sector'))
+            if data is None:
+                return jsonify({"error": "해당 조건의 국사가 없습니다."}), 404
+            return jsonify(data)
+
+        app.add_url_rule(path, endpoint=path, view_func=view)
+
+    # /api/network_map과 같은 스냅샷 응답 경로 (버전 재확인 간격 10초)
+    snapshot_store = NetworkMapSnapshotStore()
+
+    def snapshot_view():
+        snapshot = snapshot_store.get(app, request.args.get('guksa_id'), request.args.get('equip_id'),
+                                      request.args.get('sector'))
+        if snapshot is None:
+            return jsonify({"error": "해당 조건의 국사가 없습니다."}), 404
+        return snapshot.make_response(request)
+
+    app.add_url_rule('/snapshot_network_map', view_func=snapshot_view)
+    app.snapshot_store = snapshot_store
+
+    return app
+
+
+def populate(guksa_count, equipments_per_guksa, link_count, seed=42):
+    """합성 국사/장비/링크 적재"""
+    rng = random.Random(seed)
+
+    # SQLite는 복합 PK의 autoincrement를 지원하지 않으므로 id를 직접 지정하여 적재
+    TblEquipment.__table__.c.id.autoincrement = False
+    for table in (TblGuksa.__table__, TblEquipment.__table__, TblLink.__table__):
+        table.create(db.engine)
+
+    db.session.execute(TblGuksa.__table__.insert(), [{
+        'guksa_id': i + 1,
+        'guksa': f"국사{i}",
+        'guksa_t': f"국사{i}T",
+        'guksa_e': f"GUKSA{i}",
+        'is_mokuk': i % 2,
+    } for i in range(guksa_count)])
+
+    equipment_rows = []
+    for i in range(guksa_count):
+        for j in range(rng.randrange(equipments_per_guksa * 2)):
+            equipment_rows.append({
+                'id': len(equipment_rows) + 1,
+                'guksa_id': i + 1,
+                'sector': rng.choice(SECTORS),
+                'equip_type': 'TYPE',
+                'equip_model': 'MODEL',
+                'equip_name': f"EQUIP-{i}-{j}",
+                'equip_id': f"EQ{i}-{j}",
+            })
+    db.session.execute(TblEquipment.__table__.insert(), equipment_rows)
+
+    db.session.execute(TblLink.__table__.insert(), [{
+        'link_name': f"LINK-{i}",
+        'local_guksa_name': f"국사{rng.randrange(guksa_count)}T",
+        'remote_guksa_name': f"국사{rng.randrange(guksa_count)}",
+        'local_equip_id': '',
+        'remote_equip_id': '',
+        'updown_type': rng.choice(['상위', '하위']),
+        'link_type': '광케이블',
+    } for i in range(link_count)])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네트워크 맵 벤치마크")
+    parser.add_argument("--guksa", type=int, default=500, help="국사 수")
+    parser.add_argument("--equipments", type=int, default=20, help="국사당 평균 장비 수")
+    parser.add_argument("--links", type=int, default=3000, help="국사 간 링크 수")
+    parser.add_argument("--repeat", type=int, default=3, help="요청 반복 횟수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    app = build_app()
+    client = app.test_client()
+
+    with app.app_context():
+        populate(args.guksa, args.equipments, args.links)
+
+        query_count = [0]
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda *_args, **_kwargs: query_count.__setitem__(0, query_count[0] + 1))
+
+    print(f"국사 {args.guksa}개, 장비 국사당 평균 {args.equipments}개, 링크 {args.links}개")
+    print(f"{'request':<34} | {'mode':<8} | {'ms/request':>10} | {'queries':>8} | {'same':>5}")
+    print("-" * 78)
+
+    for query_string in ('', '?guksa_id=7', '?guksa_id=7&sector=IP'):
+        responses = {}
+        for label, path in (('legacy', '/legacy_network_map'), ('grouped', '/network_map')):
+            query_count[0] = 0
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                response = client.get(path + query_string)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            responses[label] = (response.get_json(), elapsed, query_count[0] // args.repeat)
+
+        same = responses['legacy'][0] == responses['grouped'][0]
+        for label, (_, elapsed, queries) in responses.items():
+            print(f"{'/network_map' + query_string:<34} | {label:<8} | {elapsed * 1000:>10.1f} | "
+                  f"{queries:>8} | {str(same):>5}")
+
+    print()
+    print("스냅샷 경로 (전체 맵)")
+    print(f"{'case':<28} | {'ms/request':>10} | {'queries':>8} | {'status':>6} | {'bytes':>8}")
+    print("-" * 72)
+
+    def timed_get(headers, repeat):
+        query_count[0] = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get('/snapshot_network_map', headers=headers)
+        elapsed = (time.perf_counter() - start) / repeat
+        return response, elapsed, query_count[0] // repeat
+
+    cases = [
+        ('cold build', {'Accept-Encoding': 'gzip'}, 1),
+        ('warm 200 (identity)', {}, 20),
+        ('warm 200 (gzip)', {'Accept-Encoding': 'gzip'}, 20),
+    ]
+    etag = None
+    for label, headers, repeat in cases:
+        response, elapsed, queries = timed_get(headers, repeat)
+        etag = response.headers.get('ETag')
+        print(f"{label:<28} | {elapsed * 1000:>10.2f} | {queries:>8} | {response.status_code:>6} | "
+              f"{len(response.get_data()):>8}")
+
+    response, elapsed, queries = timed_get({'If-None-Match': etag, 'Accept-Encoding': 'gzip'}, 20)
+    print(f"{'If-None-Match (304)':<28} | {elapsed * 1000:>10.2f} | {queries:>8} | {response.status_code:>6} | "
+          f"{len(response.get_data()):>8}")
+
+    # 링크 추가 → 버전 변경 → 새 ETag로 다시 구성
+    with app.app_context():
+        db.session.execute(TblLink.__table__.insert(), [{
+            'link_name': 'LINK-NEW', 'local_guksa_name': '국사1T', 'remote_guksa_name': '국사2',
+            'local_equip_id': '', 'remote_equip_id': '', 'updown_type': '상위', 'link_type': '광케이블'}])
+        db.session.commit()
+    app.snapshot_store.version_ttl = 0
+    response, elapsed, queries = timed_get({'If-None-Match': etag, 'Accept-Encoding': 'gzip'}, 1)
+    print(f"{'after topology change':<28} | {elapsed * 1000:>10.2f} | {queries:>8} | {response.status_code:>6} | "
+          f"{len(response.get_data()):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+하이브리드 재순위 벤치마크 모듈
+
+후보 수를 늘려가며 기존 방식(문서별 코루틴 + asyncio.gather, 이벤트 루프에서 실행)과
+배치 방식(hybrid_reranker.score_documents, cdist + NumPy)을 비교합니다.
+- 요청당 재순위 시간, 점수 최대 오차
+- 재순위 중 이벤트 루프 최대 지연 (1ms 주기 ticker로 측정, 스레드 풀 실행 여부 확인)
+
+실행: python -m api.scripts.benchmark_rerank [--candidates 15,50,200,1000] [--queries 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from rapidfuzz import fuzz
+
+from api.scripts.benchmark_embedding_backends import build_texts
+from api.scripts.fault_prediction_utils import (
+    build_rerank_features,
+    detect_keyword_fields,
+    extract_alert_codes_cached,
+    field_matching_score,
+    load_rerank_features,
+    normalize_text,
+)
+from api.scripts.hybrid_reranker import score_documents, score_documents_async
+
+
+async def legacy_calculate_hybrid_similarities(query, documents):
+    """기존 방식: 문서별 코루틴을 asyncio.gather (실제로는 이벤트 루프에서 순차 실행)"""
+    query_norm = normalize_text(query.lower())
+    query_codes = set(extract_alert_codes_cached(query))
+    query_fields = detect_keyword_fields(query_norm)
+    return await asyncio.gather(*(legacy_compute_document_similarity(query_norm, doc, query_codes, query_fields)
+                                  for doc in documents))
+
+
+async def legacy_compute_document_similarity(query_norm, doc, query_codes, query_fields):
+    """기존 compute_document_similarity (사전 계산 특징 사용 버전)"""
+    features = load_rerank_features(doc.get("metadata", {}))
+    alert_text = features["alerts_norm"]
+    analysis_text = features["analysis_norm"]
+    reception_text = features["reception_norm"]
+
+    exact_match = bool(query_norm and (query_norm == alert_text or query_norm in alert_text))
+
+    alert_similarity = fuzz.token_set_ratio(query_norm, alert_text) / 100
+    analysis_similarity = fuzz.token_set_ratio(query_norm, analysis_text) / 100
+    reception_similarity = fuzz.token_set_ratio(query_norm, reception_text) / 100
+
+    doc_codes = features["alert_codes"]
+    code_match_ratio = len(query_codes & doc_codes) / len(query_codes) if query_codes else 0
+    field_match_score = field_matching_score(query_fields, features["fields"])
+    vector_score = max(0, 1 - doc.get("distance", 0)) * 40
+
+    if exact_match:
+        return 95.0
+
+    total_score = alert_similarity * 100 * 0.35 + analysis_similarity * 100 * 0.25 + \
+        reception_similarity * 100 * 0.15 + code_match_ratio * 100 * 0.15 + \
+        field_match_score * 0.10 + (vector_score * 0.2)
+
+    if alert_similarity > 0.9:
+        total_score = max(total_score, 85)
+    if alert_similarity > 0.8 and analysis_similarity > 0.7:
+        total_score = max(total_score, 80)
+    if code_match_ratio > 0.7:
+        total_score = max(total_score, 75)
+
+    return max(10, min(95, total_score))
+
+
+def build_candidates(count, seed=42):
+    """합성 후보 문서 (재순위 특징이 메타데이터에 저장된 형태)"""
+    rng = random.Random(seed)
+    texts, _ = build_texts(count * 3, 0, seed)
+    candidates = []
+    for i in range(count):
+        metadata = {"경보현황": texts[i * 3], "장애분석": texts[i * 3 + 1], "장애접수내역": texts[i * 3 + 2][:200]}
+        metadata.update(build_rerank_features(metadata["경보현황"], metadata["장애분석"], metadata["장애접수내역"]))
+        candidates.append({"metadata": metadata, "distance": rng.uniform(0.1, 0.6)})
+    return candidates
+
+
+async def measure_loop_lag(coro):
+    """코루틴 실행 중 이벤트 루프 최대 지연(ms) 측정"""
+    max_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, (time.perf_counter() - start) * 1000 - 1)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    result = await coro
+    done = True
+    await task
+    return result, max_lag
+
+
+async def run_case(count, queries):
+    candidates = build_candidates(count)
+    rows = {}
+    max_diff = 0.0
+
+    for label, func in (('legacy', legacy_calculate_hybrid_similarities), ('batched', score_documents_async)):
+        elapsed = 0.0
+        max_lag = 0.0
+        scores = []
+        for query in queries:
+            start = time.perf_counter()
+            result, lag = await measure_loop_lag(func(query, candidates))
+            elapsed += time.perf_counter() - start
+            max_lag = max(max_lag, lag)
+            scores.append(result)
+        rows[label] = (elapsed * 1000 / len(queries), max_lag, scores)
+
+    for legacy_scores, batched_scores in zip(rows['legacy'][2], rows['batched'][2]):
+        max_diff = max([max_diff] + [abs(a - b) for a, b in zip(legacy_scores, batched_scores)])
+
+    # 스레드 풀/루프 오버헤드 없이 배치 계산만
+    start = time.perf_counter()
+    for query in queries:
+        score_documents(query, candidates)
+    sync_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    return rows, sync_ms, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이브리드 재순위 벤치마크")
+    parser.add_argument("--candidates", default="15,50,200,1000", help="후보 수 목록 (쉼표 구분)")
+    parser.add_argument("--queries", type=int, default=20, help="질의 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    _, queries = build_texts(0, args.queries, seed=7)
+    print(f"질의 {len(queries)}건")
+    print(f"{'candidates':>10} | {'legacy(ms)':>10} | {'batched(ms)':>11} | {'sync(ms)':>8} | "
+          f"{'legacy lag':>10} | {'batched lag':>11} | {'max diff':>8}")
+    print("-" * 87)
+
+    for count in [int(value) for value in args.candidates.split(",") if value.strip()]:
+        rows, sync_ms, max_diff = asyncio.run(run_case(count, queries))
+        legacy_ms, legacy_lag, _ = rows['legacy']
+        batched_ms, batched_lag, _ = rows['batched']
+        print(f"{count:>10} | {legacy_ms:>10.2f} | {batched_ms:>11.2f} | {sync_ms:>8.2f} | "
+              f"{legacy_lag:>10.2f} | {batched_lag:>11.2f} | {max_diff:>8.1e}")
+
+
+if __name__ == "__main__":
+    main()
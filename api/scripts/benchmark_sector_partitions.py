@@ -0,0 +1,106 @@
+"""
+분야별 파티션 검색 벤치마크 모듈
+
+합성 장애사례를 vector_db_creation.pipelined_ingest로 본 컬렉션 + 분야별 파티션에 적재하고
+분야 필터가 걸리는 경보 질의로 다음 두 방식의 지연 시간과 재현율을 비교합니다.
+- filter: 기존 방식 (본 컬렉션에 where 장애분야 $in 조건)
+- partition: sector_partitions.query_partitions (감지된 분야 파티션만 병렬 조회 후 거리순 결합)
+
+재현율은 필터 조건에 맞는 전체 문서를 NumPy로 전수 비교한 정확한 상위 n개 대비 일치율입니다.
+임베딩은 문자 3-gram 해싱 임베딩(benchmark_hybrid_retrieval.HashingEmbeddingFunction)을 사용합니다.
+
+실행: python -m api.scripts.benchmark_sector_partitions [--cases 5000] [--queries 200] [--n-results 15]
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+from api.scripts.benchmark_embedding_backends import percentile
+from api.scripts.benchmark_hybrid_retrieval import HashingEmbeddingFunction, build_cases, build_queries
+from api.scripts.fault_prediction_core_4 import create_field_filter, extract_fields_from_query, get_field_filter_values
+from api.scripts.sector_partitions import create_sector_partitions, partitions_for_field_values, query_partitions
+from api.scripts.vector_db_creation import pipelined_ingest
+
+INCLUDE = ["documents", "metadatas", "distances"]
+
+
+def exact_top_ids(matrix, ids, fields, query_embedding, allowed_fields, n_results):
+    """필터 조건에 맞는 문서 전수 비교 (Chroma l2 = 제곱 거리)"""
+    mask = np.isin(fields, list(allowed_fields))
+    distances = ((matrix[mask] - np.asarray(query_embedding)) ** 2).sum(axis=1)
+    order = np.argsort(distances)[:n_results]
+    return set(ids[mask][order])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분야별 파티션 검색 벤치마크")
+    parser.add_argument("--cases", type=int, default=5000, help="장애사례 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--n-results", type=int, default=15, help="벡터 검색 결과 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    embedding_function = HashingEmbeddingFunction()
+    cases = build_cases(args.cases)
+    queries = build_queries(cases, min(args.queries, args.cases))
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        client = chromadb.PersistentClient(path=db_dir)
+        collection = client.create_collection(name="nw_incidents", embedding_function=embedding_function)
+        partitions = create_sector_partitions(client, embedding_function)
+
+        start = time.perf_counter()
+        pipelined_ingest(collection, cases, embedding_function, partitions=partitions)
+        load_elapsed = time.perf_counter() - start
+
+        stored = collection.get(include=["embeddings", "metadatas"])
+        ids = np.array(stored["ids"])
+        matrix = np.array(stored["embeddings"], dtype=np.float64)
+        fields = np.array([metadata.get("장애분야", "") for metadata in stored["metadatas"]])
+
+        rows = {"filter": ([], []), "partition": ([], [])}
+        filtered_queries = 0
+        partition_counts = []
+        for query, _ in queries:
+            field_filter = create_field_filter(extract_fields_from_query(query))
+            if not field_filter:
+                continue
+            filtered_queries += 1
+
+            allowed_fields = get_field_filter_values(field_filter)
+            partition_names = partitions_for_field_values(allowed_fields)
+            partition_counts.append(len(partition_names))
+            query_embedding = embedding_function([query])[0]
+            expected = exact_top_ids(matrix, ids, fields, query_embedding, allowed_fields, args.n_results)
+
+            for label in rows:
+                start = time.perf_counter()
+                if label == "filter":
+                    result = collection.query(query_embeddings=[query_embedding], n_results=args.n_results,
+                                              where=field_filter, include=INCLUDE)
+                else:
+                    result = query_partitions(partitions, partition_names, query_embedding, args.n_results, INCLUDE)
+                rows[label][0].append((time.perf_counter() - start) * 1000)
+                rows[label][1].append(len(expected & set(result["ids"][0])) / max(1, len(expected)))
+
+    print(f"사례 {args.cases}건 (문서 {len(ids)}개, 적재 {load_elapsed:.1f}초), "
+          f"분야 필터 질의 {filtered_queries}건 (평균 파티션 {statistics.mean(partition_counts or [0]):.1f}개), "
+          f"n_results {args.n_results}")
+    print(f"{'mode':<9} | {'mean(ms)':>8} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'recall':>6}")
+    print("-" * 52)
+    for label, (latencies, recalls) in rows.items():
+        if not latencies:
+            continue
+        print(f"{label:<9} | {statistics.mean(latencies):>8.2f} | {percentile(latencies, 0.5):>8.2f} | "
+              f"{percentile(latencies, 0.95):>8.2f} | {statistics.mean(recalls):>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
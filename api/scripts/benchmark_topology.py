@@ -0,0 +1,229 @@
+"""
+장비 연결 토폴로지 벤치마크 모듈
+
+SQLite 메모리 DB에 합성 tbl_sub_link 데이터를 적재하고
+alarm_dashboard_equip의 연결 장비 조회 경로를 기존 방식(국사별 전체 링크 재조회 +
+장비별 TblSubLink 조회)과 토폴로지 그래프 캐시 방식으로 비교합니다.
+합성 link_map(기본 1만 링크)에서 연결 장비 탐색을 기존 재귀 + 역방향 키 전체 스캔 방식과
+반복 탐색(traverse_connected_links) 방식으로도 비교합니다.
+
+실행: python -m api.scripts.benchmark_topology [--links 10000] [--equipments 2000] [--guksa 20] [--traversal-edges 10000]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from flask import Flask
+from sqlalchemy import event, or_
+
+from db.models import db, TblSubLink
+from api.scripts.topology_graph import TopologyGraph, traverse_connected_links
+
+
+def build_app():
+    """SQLite 메모리 DB 기반 Flask 앱 생성"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    return app
+
+
+def populate_sub_links(link_count, equipment_count, guksa_count, seed=42):
+    """합성 tbl_sub_link 적재 (같은 국사 안의 장비끼리 주로 연결)"""
+    rng = random.Random(seed)
+    TblSubLink.__table__.create(db.engine)
+
+    rows = []
+    for i in range(link_count):
+        source = rng.randrange(equipment_count)
+        target = rng.randrange(equipment_count)
+        rows.append({
+            'equip_id': f"EQ{source}",
+            'equip_type': 'TYPE',
+            'equip_name': f"EQUIP-{source}",
+            'equip_field': ['IP', '전송', '교환', 'MW'][source % 4],
+            'guksa_name': f"국사{source % guksa_count}",
+            'up_down': rng.choice(['up', 'down']),
+            'link_equip_id': f"EQ{target}",
+            'link_equip_type': 'TYPE',
+            'link_equip_name': f"EQUIP-{target}",
+            'link_equip_field': ['IP', '전송', '교환', 'MW'][target % 4],
+            'link_guksa_name': f"국사{target % guksa_count}",
+            'link_name': f"LINK-{i}",
+            'cable_aroot': '',
+            'cable_broot': '',
+        })
+
+    db.session.execute(TblSubLink.__table__.insert(), rows)
+    db.session.commit()
+
+
+def legacy_lookup(guksa_name, equip_ids):
+    """기존 방식: 국사별 링크 전체 조회 + 장비별 TblSubLink.first() 조회"""
+    links = TblSubLink.query.filter(
+        or_(TblSubLink.guksa_name == guksa_name, TblSubLink.link_guksa_name == guksa_name)).all()
+
+    for eq_id in equip_ids:
+        TblSubLink.query.filter(
+            or_(TblSubLink.equip_id == eq_id, TblSubLink.link_equip_id == eq_id)).first()
+
+    return links
+
+
+def graph_lookup(graph, guksa_name, equip_ids):
+    """토폴로지 그래프 캐시 방식"""
+    link_map = graph.get_link_map(guksa_name)
+    for eq_id in equip_ids:
+        graph.get_equipment_info(eq_id)
+    return link_map
+
+
+def build_link_map(edge_count, node_count, seed=42):
+    """합성 양방향 link_map 생성 (ring + 임의 연결)"""
+    rng = random.Random(seed)
+    link_map = {}
+
+    def add_link(source, target, link_name, up_down):
+        link_map.setdefault(source, []).append(
+            {'target_equip_id': target, 'up_down': up_down, 'link_name': link_name})
+        link_map.setdefault(target, []).append(
+            {'target_equip_id': source, 'up_down': 'down' if up_down == 'up' else 'up', 'link_name': link_name})
+
+    for i in range(edge_count):
+        if i < node_count:
+            source, target = i, (i + 1) % node_count
+        else:
+            source, target = rng.randrange(node_count), rng.randrange(node_count)
+        if source != target:
+            add_link(f"EQ{source}", f"EQ{target}", f"LINK-{i}", rng.choice(['up', 'down']))
+
+    return link_map
+
+
+def legacy_find_all_connected_equip(equip_id, link_map, max_depth=50):
+    """기존 방식: 재귀 DFS + result 키 전체 startswith 스캔 (로그 출력 제외)"""
+    result = {}
+    visited = set()
+
+    def traverse_connections(current_equip_id, depth=0, parent_equip_id=None):
+        if current_equip_id in visited or depth > max_depth:
+            return
+        visited.add(current_equip_id)
+
+        for connection in link_map.get(current_equip_id, []):
+            target_equip_id = connection['target_equip_id']
+            up_down = connection['up_down']
+            link_name = connection['link_name']
+
+            if target_equip_id == parent_equip_id:
+                continue
+
+            link_key = f"{current_equip_id}:::{target_equip_id}:::{link_name}:::{up_down}"
+            reverse_key = f"{target_equip_id}:::{current_equip_id}:::{link_name}:::"
+            if not any(existing_key.startswith(reverse_key) for existing_key in result):
+                result[link_key] = {
+                    'source': current_equip_id,
+                    'target': target_equip_id,
+                    'link_name': link_name,
+                    'up_down': up_down
+                }
+
+            traverse_connections(target_equip_id, depth + 1, current_equip_id)
+
+    traverse_connections(equip_id)
+    return result
+
+
+def benchmark_traversal(edge_count):
+    """연결 장비 탐색: 기존 재귀 방식 vs 반복 탐색"""
+    results = []
+    for node_count in (edge_count // 2, edge_count // 5):
+        link_map = build_link_map(edge_count, node_count)
+
+        start = time.perf_counter()
+        legacy = legacy_find_all_connected_equip("EQ0", link_map)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        iterative = traverse_connected_links(link_map, "EQ0")
+        iterative_elapsed = time.perf_counter() - start
+
+        # 결과(키 순서 포함)가 같아야 함
+        same = list(legacy.items()) == list(iterative.items())
+        results.append((node_count, len(iterative), legacy_elapsed, iterative_elapsed, same))
+
+    # 긴 ring: 재귀 한도를 넘는 깊이도 반복 탐색으로 처리
+    ring = build_link_map(edge_count, edge_count)
+    start = time.perf_counter()
+    deep = traverse_connected_links(ring, "EQ0", max_depth=edge_count)
+    deep_elapsed = time.perf_counter() - start
+
+    return results, (len(deep), deep_elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토폴로지 그래프 벤치마크")
+    parser.add_argument("--links", type=int, default=10000, help="tbl_sub_link 행 수")
+    parser.add_argument("--equipments", type=int, default=2000, help="장비 수")
+    parser.add_argument("--guksa", type=int, default=20, help="국사 수")
+    parser.add_argument("--requests", type=int, default=50, help="측정 요청 수")
+    parser.add_argument("--traversal-edges", type=int, default=10000, help="탐색 벤치마크 링크 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    app = build_app()
+    with app.app_context():
+        populate_sub_links(args.links, args.equipments, args.guksa)
+
+        query_count = [0]
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda *_args, **_kwargs: query_count.__setitem__(0, query_count[0] + 1))
+
+        rng = random.Random(7)
+        requests = []
+        for _ in range(args.requests):
+            guksa_index = rng.randrange(args.guksa)
+            equip_ids = [f"EQ{rng.randrange(args.equipments // args.guksa) * args.guksa + guksa_index}"
+                         for _ in range(30)]
+            requests.append((f"국사{guksa_index}", equip_ids))
+
+        graph = TopologyGraph()
+        start = time.perf_counter()
+        graph.refresh()
+        initial_load = time.perf_counter() - start
+
+        results = {}
+        for label, func in (
+            ('legacy', lambda guksa_name, ids: legacy_lookup(guksa_name, ids)),
+            ('graph-cache', lambda guksa_name, ids: graph_lookup(graph, guksa_name, ids)),
+        ):
+            query_count[0] = 0
+            start = time.perf_counter()
+            for guksa_name, equip_ids in requests:
+                func(guksa_name, equip_ids)
+            elapsed = time.perf_counter() - start
+            results[label] = (elapsed * 1000 / len(requests), query_count[0] / len(requests))
+
+    print(f"tbl_sub_link {args.links}행, 장비 {args.equipments}개, 국사 {args.guksa}개, "
+          f"그래프 최초 로딩 {initial_load * 1000:.1f}ms")
+    print(f"{'mode':<12} | {'ms/request':>10} | {'queries/request':>15}")
+    print("-" * 44)
+    for label, (ms, queries) in results.items():
+        print(f"{label:<12} | {ms:>10.2f} | {queries:>15.1f}")
+
+    print()
+    print(f"연결 장비 탐색 (링크 {args.traversal_edges}개, max_depth=50)")
+    print(f"{'nodes':>8} | {'links':>7} | {'legacy(ms)':>10} | {'iterative(ms)':>13} | {'same':>5}")
+    print("-" * 57)
+    traversal_results, (deep_links, deep_elapsed) = benchmark_traversal(args.traversal_edges)
+    for node_count, link_count, legacy_elapsed, iterative_elapsed, same in traversal_results:
+        print(f"{node_count:>8} | {link_count:>7} | {legacy_elapsed * 1000:>10.1f} | "
+              f"{iterative_elapsed * 1000:>13.1f} | {str(same):>5}")
+    print(f"ring {args.traversal_edges}개 장비 전체 깊이 탐색: 링크 {deep_links}개, {deep_elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+벡터DB 적재 처리량 벤치마크 모듈
+
+합성 장애사례를 Chroma 임시 디렉토리(PersistentClient)에 적재하여 다음 두 방식을 비교합니다.
+- legacy: 기존 방식 (스레드 풀 청크 생성 → 20건씩 collection.add, 임베딩은 add 안에서 계산)
+- pipelined: vector_db_creation.pipelined_ingest (프로세스 풀 청크 생성 → 대용량 배치 인코딩 → 별도 스레드 저장)
+- cache-cold / cache-warm: pipelined + 임베딩 캐시(embedding_cache, 임시 파일) 첫 생성 / 같은 텍스트로 재생성
+
+임베딩은 기본적으로 문자 3-gram 해싱 임베딩(--embedding hash)을 사용하며
+--embedding backend 지정 시 EMBEDDING_BACKEND 백엔드(e5 모델)를 사용합니다.
+
+실행: python -m api.scripts.benchmark_vector_db_ingest [--cases 2000] [--embedding hash] [--window 256]
+"""
+
+import os
+import argparse
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import chromadb
+
+from api.scripts.benchmark_hybrid_retrieval import HashingEmbeddingFunction, build_cases
+from api.scripts.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+from api.scripts.vector_db_creation import INGEST_PROCESS_WORKERS, create_embedding_chunks, pipelined_ingest
+
+LEGACY_BATCH_SIZE = 20
+LEGACY_THREAD_WORKERS = 4
+
+
+def legacy_ingest(collection, fault_cases):
+    """기존 방식: 스레드 풀 청크 생성 후 20건씩 add (임베딩 함수가 add마다 호출됨)"""
+    chunk_size = max(1, len(fault_cases) // LEGACY_THREAD_WORKERS)
+    with ThreadPoolExecutor(max_workers=LEGACY_THREAD_WORKERS) as executor:
+        parts = executor.map(create_embedding_chunks,
+                             [fault_cases[i:i + chunk_size] for i in range(0, len(fault_cases), chunk_size)])
+    chunks = [chunk for part in parts for chunk in part]
+
+    for i in range(0, len(chunks), LEGACY_BATCH_SIZE):
+        batch = chunks[i:i + LEGACY_BATCH_SIZE]
+        collection.add(ids=[chunk["id"] for chunk in batch], documents=[chunk["text"] for chunk in batch],
+                       metadatas=[chunk["metadata"] for chunk in batch])
+    return len(chunks)
+
+
+def run(label, fault_cases, embedding_function, window):
+    with tempfile.TemporaryDirectory() as db_dir:
+        client = chromadb.PersistentClient(path=db_dir)
+        collection = client.create_collection(name="benchmark_nw_incidents", embedding_function=embedding_function)
+
+        start = time.perf_counter()
+        if label == "legacy":
+            documents = legacy_ingest(collection, fault_cases)
+            stats = {}
+        else:
+            stats = pipelined_ingest(collection, fault_cases, embedding_function, window_cases=window)
+            documents = stats["documents"]
+        elapsed = time.perf_counter() - start
+
+        assert collection.count() == documents
+    return documents, elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터DB 적재 처리량 벤치마크")
+    parser.add_argument("--cases", type=int, default=2000, help="장애사례 수")
+    parser.add_argument("--embedding", choices=["hash", "backend"], default="hash",
+                        help="hash: 문자 3-gram 해싱 임베딩, backend: EMBEDDING_BACKEND 모델")
+    parser.add_argument("--window", type=int, default=256, help="파이프라인 1묶음 사례 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    fault_cases = build_cases(args.cases)
+    if args.embedding == "hash":
+        embedding_function = HashingEmbeddingFunction()
+    else:
+        from api.scripts.embedding_backends import create_embedding_backend
+        embedding_function = create_embedding_backend()
+
+    print(f"사례 {len(fault_cases)}건, 임베딩 {args.embedding}, 프로세스 {INGEST_PROCESS_WORKERS}개, "
+          f"묶음 {args.window}건")
+    print(f"{'mode':<10} | {'docs':>6} | {'total(s)':>8} | {'docs/s':>8} | {'emb/s':>8} | "
+          f"{'build(s)':>8} | {'encode(s)':>9} | {'write(s)':>8}")
+    print("-" * 87)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(os.path.join(cache_dir, "embeddings.sqlite3"))
+        cached_function = CachedEmbeddingFunction(embedding_function, cache)
+        results = []
+        for label in ("legacy", "pipelined", "cache-cold", "cache-warm"):
+            hits_before, misses_before = cache.hits, cache.misses
+            function = cached_function if label.startswith("cache") else embedding_function
+            results.append((label, *run(label, fault_cases, function, args.window),
+                            cache.hits - hits_before, cache.misses - misses_before))
+        cache_size = cache.stats()["file_size"]
+        cache.close()
+
+    for label, documents, elapsed, stats, hits, misses in results:
+        if stats:
+            print(f"{label:<10} | {documents:>6} | {elapsed:>8.2f} | {documents / elapsed:>8.1f} | "
+                  f"{stats['embeddings_per_sec']:>8.1f} | {stats['build_time']:>8.2f} | "
+                  f"{stats['encode_time']:>9.2f} | {stats['write_time']:>8.2f}")
+        else:
+            print(f"{label:<10} | {documents:>6} | {elapsed:>8.2f} | {documents / elapsed:>8.1f} | "
+                  f"{'-':>8} | {'-':>8} | {'-':>9} | {'-':>8}")
+        if hits or misses:
+            print(f"{'':<10}   캐시 적중 {hits}건 / 인코딩 {misses}건")
+    print(f"임베딩 캐시 크기: {cache_size / (1 << 20):.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+벡터 저장소 벤치마크 모듈 (Chroma HNSW vs NumPy 전수 비교)
+
+합성 장애사례를 vector_db_creation.pipelined_ingest로 Chroma 본 컬렉션 + 분야별 파티션에 적재하고
+numpy_vector_store.export_numpy_store로 float32/float16/int8 저장소를 만든 뒤
+경보 질의(분야 필터 포함)로 지연 시간, 저장 크기, recall@k를 비교합니다.
+- chroma: 본 컬렉션 query (분야 필터는 where)
+- chroma-part: 분야 필터가 있으면 sector_partitions.query_partitions (서버 기본 경로)
+- numpy-<dtype>: NumpyVectorStore.query (분야 필터는 행 번호 색인)
+
+recall@k는 Chroma에 저장된 임베딩을 float64로 전수 비교한 정확한 상위 k개 대비 일치율입니다.
+임베딩은 문자 3-gram 해싱 임베딩(benchmark_hybrid_retrieval.HashingEmbeddingFunction)을 사용합니다.
+
+실행: python -m api.scripts.benchmark_vector_store [--cases 1000] [--queries 200] [--n-results 15]
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+
+import chromadb
+import numpy as np
+
+from api.scripts.benchmark_embedding_backends import percentile
+from api.scripts.benchmark_hybrid_retrieval import HashingEmbeddingFunction, build_cases, build_queries
+from api.scripts.fault_prediction_core_4 import create_field_filter, extract_fields_from_query, get_field_filter_values
+from api.scripts.numpy_vector_store import NUMPY_STORE_DIR, NUMPY_STORE_DTYPES, NumpyVectorStore, export_numpy_store
+from api.scripts.sector_partitions import create_sector_partitions, partitions_for_field_values, query_partitions
+from api.scripts.vector_db_creation import pipelined_ingest
+
+INCLUDE = ["documents", "metadatas", "distances"]
+
+
+def dir_size(path, exclude=()) -> int:
+    """디렉토리 전체 파일 크기 (exclude 하위 디렉토리 제외)"""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [name for name in dirs if name not in exclude]
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def exact_top_ids(matrix, ids, fields, query_embedding, allowed_fields, n_results):
+    """조건에 맞는 문서 전수 비교 (Chroma l2 = 제곱 거리)"""
+    mask = np.isin(fields, list(allowed_fields)) if allowed_fields else np.ones(len(ids), dtype=bool)
+    distances = ((matrix[mask] - np.asarray(query_embedding)) ** 2).sum(axis=1)
+    order = np.argsort(distances)[:n_results]
+    return set(ids[mask][order])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 저장소 벤치마크 (Chroma vs NumPy)")
+    parser.add_argument("--cases", type=int, default=1000, help="장애사례 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--n-results", type=int, default=15, help="벡터 검색 결과 수 (k)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    embedding_function = HashingEmbeddingFunction()
+    cases = build_cases(args.cases)
+    queries = build_queries(cases, min(args.queries, args.cases))
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        client = chromadb.PersistentClient(path=db_dir)
+        collection = client.create_collection(name="nw_incidents", embedding_function=embedding_function)
+        partitions = create_sector_partitions(client, embedding_function)
+        pipelined_ingest(collection, cases, embedding_function, partitions=partitions)
+
+        stored = collection.get(include=["embeddings", "metadatas"])
+        ids = np.array(stored["ids"])
+        matrix = np.array(stored["embeddings"], dtype=np.float64)
+        fields = np.array([metadata.get("장애분야", "") for metadata in stored["metadatas"]])
+
+        # 저장 크기: Chroma는 본 컬렉션 HNSW 세그먼트 + SQLite(문서/메타데이터/파티션 포함)
+        sizes = {"chroma": dir_size(db_dir, exclude=(NUMPY_STORE_DIR,)), "chroma-part": None}
+        stores = {}
+        for dtype in NUMPY_STORE_DTYPES:
+            dtype_dir = os.path.join(db_dir, dtype)
+            os.makedirs(dtype_dir)
+            start = time.perf_counter()
+            export_numpy_store(collection, dtype_dir, dtype)
+            export_elapsed = time.perf_counter() - start
+            label = f"numpy-{dtype}"
+            stores[label] = NumpyVectorStore(os.path.join(dtype_dir, NUMPY_STORE_DIR))
+            sizes[label] = dir_size(dtype_dir)
+            print(f"{label}: 내보내기 {export_elapsed * 1000:.0f}ms")
+
+        rows = {label: ([], []) for label in ["chroma", "chroma-part", *stores]}
+        filtered_queries = 0
+        for query, _ in queries:
+            field_filter = create_field_filter(extract_fields_from_query(query))
+            allowed_fields = get_field_filter_values(field_filter)
+            partition_names = partitions_for_field_values(allowed_fields)
+            filtered_queries += bool(field_filter)
+            query_embedding = embedding_function([query])[0]
+            expected = exact_top_ids(matrix, ids, fields, query_embedding, allowed_fields, args.n_results)
+
+            params = {"query_embeddings": [query_embedding], "n_results": args.n_results, "include": INCLUDE}
+            if field_filter:
+                params["where"] = field_filter
+
+            for label in rows:
+                start = time.perf_counter()
+                if label == "chroma-part" and partition_names:
+                    result = query_partitions(partitions, partition_names, query_embedding, args.n_results, INCLUDE)
+                elif label in stores:
+                    result = stores[label].query(**params)
+                else:
+                    result = collection.query(**params)
+                rows[label][0].append((time.perf_counter() - start) * 1000)
+                rows[label][1].append(len(expected & set(result["ids"][0])) / max(1, len(expected)))
+
+    print(f"사례 {args.cases}건 (문서 {len(ids)}개, {matrix.shape[1]}차원), 질의 {len(queries)}건 "
+          f"(분야 필터 {filtered_queries}건), k={args.n_results}")
+    print(f"{'mode':<13} | {'mean(ms)':>8} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'recall@k':>8} | {'size(MB)':>8}")
+    print("-" * 70)
+    for label, (latencies, recalls) in rows.items():
+        size = f"{sizes[label] / (1 << 20):>8.2f}" if sizes.get(label) is not None else f"{'-':>8}"
+        print(f"{label:<13} | {statistics.mean(latencies):>8.2f} | {percentile(latencies, 0.5):>8.2f} | "
+              f"{percentile(latencies, 0.95):>8.2f} | {statistics.mean(recalls):>8.3f} | {size}")
+    print("size: chroma = 버전 디렉토리 전체 (SQLite + HNSW, 파티션 포함), numpy = numpy_store 전체 (records.jsonl 포함)")
+
+
+if __name__ == "__main__":
+    main()
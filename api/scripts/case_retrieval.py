@@ -0,0 +1,144 @@
+"""
+장애사례 단위 벡터 검색 모듈
+
+벡터DB에는 사례마다 여러 문서(섹션별 4개 + 전체 + 요약)가 저장되므로
+청크 상위 n개를 가져와 장애번호 중복을 제거하면 문서가 많이 걸린 몇몇 사례가 다른 사례를 밀어냅니다.
+여기서는 청크 결과를 장애번호별로 모아 점수를 합산하고, 서로 다른 사례 top_k개가 확정될 때까지만
+n_results를 두 배씩 늘려 다시 조회합니다.
+
+- max: 사례의 가장 가까운 청크 거리 (서로 다른 사례 top_k개가 모이면 바로 확정)
+- sum: 청크 유사도 1 / (1 + 거리)의 합
+- rrf: 청크 순위 1 / (RRF_K + 순위)의 합
+
+sum/rrf는 아직 가져오지 않은 청크가 더할 수 있는 최대 점수(상한)로 k번째 사례 밖의 사례가
+순위를 뒤집을 수 없으면 조회를 멈춥니다.
+"""
+
+import os
+import logging
+from typing import Callable, Dict, List, Tuple
+
+from .lexical_index import RRF_K
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+CASE_AGGREGATIONS = ("max", "sum", "rrf")
+CASE_AGGREGATION = os.getenv("CASE_AGGREGATION", "max").strip().lower()  # 청크 점수 → 사례 점수 집계 방식
+CASE_CHUNKS_PER_CASE = 6  # 사례당 최대 문서 수 (vector_db_creation: 섹션 4개 + 전체 + 요약)
+CASE_INITIAL_FETCH_FACTOR = 2  # 첫 조회 n_results = top_k × 이 값
+CASE_FETCH_MAX = int(os.getenv("CASE_FETCH_MAX", "240"))  # 사례 단위 검색 최대 청크 조회 수
+
+if CASE_AGGREGATION not in CASE_AGGREGATIONS:
+    # 잘못된 환경변수로 매 검색이 실패하지 않도록 로딩 시점에 한 번 확인
+    logger.warning(f"지원하지 않는 CASE_AGGREGATION입니다: {CASE_AGGREGATION} "
+                   f"(지원: {', '.join(CASE_AGGREGATIONS)}) → max 사용")
+    CASE_AGGREGATION = "max"
+
+
+def chunk_score(aggregation, distance, rank):
+    """청크 하나의 점수 (거리가 가깝고 순위가 높을수록 큼)"""
+    if aggregation == "rrf":
+        return 1.0 / (RRF_K + rank)
+    if aggregation == "sum":
+        return 1.0 / (1.0 + max(0.0, distance))
+    return -distance  # max: 가장 가까운 청크 거리
+
+
+def aggregate_case_hits(results, aggregation) -> Dict:
+    """
+    Chroma 조회 결과(거리순)를 장애번호별로 집계
+
+    Returns:
+        dict: 장애번호 → {"score", "distance", "document", "metadata", "chunks"} (첫 등장 순서)
+    """
+    cases = {}
+    documents = results.get("documents", [[]])[0]
+    for rank, (metadata, distance) in enumerate(zip(results["metadatas"][0], results["distances"][0]), 1):
+        fault_number = (metadata or {}).get("장애번호")
+        if not fault_number:
+            continue
+
+        score = chunk_score(aggregation, distance, rank)
+        case = cases.get(fault_number)
+        if case is None:
+            cases[fault_number] = {
+                "score": score,
+                "distance": distance,
+                "document": documents[rank - 1] if documents else None,
+                "metadata": metadata,
+                "chunks": 1,
+            }
+        else:
+            case["score"] = max(case["score"], score) if aggregation == "max" else case["score"] + score
+            case["chunks"] += 1
+    return cases
+
+
+def is_top_k_settled(ranked, top_k, aggregation, last_distance, fetched) -> bool:
+    """
+    가져오지 않은 청크로 top_k 사례 구성과 순서가 바뀔 수 없는지 확인
+
+    - 구성: k번째 사례 밖의 사례(또는 처음 보는 사례)가 top_k 안에 들어올 수 없음
+    - 순서: top_k 안의 인접한 두 사례 간 점수 차이가 아래 사례가 더 얻을 수 있는 최대 점수 이상
+      (sum/rrf는 남은 청크가 점수를 더하므로 구성이 확정되어도 순서가 바뀔 수 있고, 이 순서가 RRF 결합에 쓰임)
+
+    Args:
+        ranked: 점수순 [(장애번호, 사례 정보)]
+        last_distance: 지금까지 가져온 마지막(가장 먼) 청크 거리
+        fetched: 지금까지 가져온 청크 수
+    """
+    if len(ranked) < top_k:
+        return False
+    if aggregation == "max":
+        return True  # 남은 청크는 모두 더 멀기 때문에 사례별 최소 거리가 바뀌지 않음
+
+    # 남은 청크 하나가 더할 수 있는 최대 점수
+    remaining_score = chunk_score(aggregation, last_distance, fetched + 1)
+    kth_score = ranked[top_k - 1][1]["score"]
+
+    def max_gain(case):
+        return max(0, CASE_CHUNKS_PER_CASE - case["chunks"]) * remaining_score
+
+    for (_, upper), (_, lower) in zip(ranked[:top_k - 1], ranked[1:top_k]):
+        if upper["score"] < lower["score"] + max_gain(lower):
+            return False
+
+    best_outside = CASE_CHUNKS_PER_CASE * remaining_score  # 아직 한 번도 나오지 않은 사례
+    for _, case in ranked[top_k:]:
+        best_outside = max(best_outside, case["score"] + max_gain(case))
+    return kth_score >= best_outside
+
+
+def query_top_cases(query_fn: Callable[[int], Dict], top_k, aggregation=CASE_AGGREGATION,
+                    max_fetch=CASE_FETCH_MAX) -> Tuple[List[Tuple[str, Dict]], Dict]:
+    """
+    서로 다른 사례 top_k개 조회 (청크 n_results를 필요한 만큼만 늘려가며 조회)
+
+    Args:
+        query_fn: n_results를 받아 Chroma query 결과(거리순)를 반환하는 함수
+
+    Returns:
+        tuple: (점수순 [(장애번호, 사례 정보)] 최대 top_k개, 마지막 청크 조회 결과)
+    """
+    if aggregation not in CASE_AGGREGATIONS:  # 기본값은 로딩 시 확인됨, 명시적으로 넘긴 값만 해당
+        raise ValueError(f"지원하지 않는 사례 집계 방식입니다: {aggregation} (지원: {', '.join(CASE_AGGREGATIONS)})")
+
+    n_results = min(max_fetch, max(top_k, top_k * CASE_INITIAL_FETCH_FACTOR))
+    rounds = 0
+    while True:
+        rounds += 1
+        results = query_fn(n_results)
+        ids = results["ids"][0]
+
+        cases = aggregate_case_hits(results, aggregation)
+        ranked = sorted(cases.items(), key=lambda item: -item[1]["score"])
+        exhausted = len(ids) < n_results  # 조건에 맞는 문서를 모두 가져옴
+
+        if (exhausted or n_results >= max_fetch
+                or is_top_k_settled(ranked, top_k, aggregation, results["distances"][0][-1], len(ids))):
+            break
+        n_results = min(max_fetch, n_results * 2)
+
+    logger.debug(f"사례 단위 검색: 사례 {len(cases)}건 / 청크 {len(ids)}개, 조회 {rounds}회 ({aggregation})")
+    return ranked[:top_k], results
@@ -0,0 +1,256 @@
+"""
+RAG 임베딩 모델 CPU 추론 백엔드 모듈
+
+벡터DB 생성(vector_db_creation)과 질의(embedding_service)가 같은 백엔드를 사용합니다.
+각 백엔드는 Chroma EmbeddingFunction 인터페이스(__call__(input))를 그대로 구현합니다.
+
+- torch: fp32 SentenceTransformer (기존 방식, 기본값)
+- torch-int8: Linear 계층 int8 동적 양자화 (torch.quantization.quantize_dynamic)
+- onnx: 트랜스포머 본체를 ONNX로 내보내 ONNX Runtime으로 실행 (풀링/정규화는 기존 모듈 그대로)
+- onnx-int8: ONNX 모델 int8 동적 양자화 (onnxruntime.quantization)
+
+백엔드를 바꿀 때는 benchmark_embedding_backends로 코사인 점수 일치 여부를 먼저 확인합니다.
+"""
+
+import os
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+EMBEDDING_MODEL = "intfloat/multilingual-e5-base"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+EMBEDDING_ENCODE_BATCH_SIZE = int(os.getenv("EMBEDDING_ENCODE_BATCH_SIZE", "32"))  # 인코딩 배치 크기
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", "./onnx_models")  # ONNX 변환 모델 저장 경로
+EMBEDDING_NUM_THREADS = int(os.getenv("EMBEDDING_NUM_THREADS", "0"))  # ONNX Runtime 스레드 수 (0: 자동)
+ONNX_OPSET_VERSION = 14
+
+
+class EmbeddingBackend(ABC):
+    """임베딩 백엔드 기본 클래스 (Chroma EmbeddingFunction 호환)"""
+
+    name = "base"
+
+    def __init__(self, model_name=EMBEDDING_MODEL, device=EMBEDDING_DEVICE,
+                 batch_size=EMBEDDING_ENCODE_BATCH_SIZE):
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+
+    @abstractmethod
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        """텍스트 목록 임베딩"""
+
+    def __call__(self, input):
+        return self.encode(list(input))
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """fp32 SentenceTransformer (Chroma SentenceTransformerEmbeddingFunction과 같은 설정)"""
+
+    name = "torch"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        start = time.time()
+        self.model = self._load()
+        logger.info(f"임베딩 백엔드 로드 완료: {self.name} {self.model_name} ({time.time() - start:.1f}초)")
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name, device=self.device)
+
+    def encode(self, texts):
+        if not texts:
+            return []
+        return self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True,
+                                 normalize_embeddings=False).tolist()
+
+
+class QuantizedTorchEmbeddingBackend(TorchEmbeddingBackend):
+    """Linear 계층 int8 동적 양자화 SentenceTransformer (CPU 전용)"""
+
+    name = "torch-int8"
+
+    def _load(self):
+        import torch
+
+        model = super()._load()
+        model.to("cpu")
+        self.device = "cpu"
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """ONNX Runtime 실행 백엔드 (최초 1회 ONNX 변환 후 EMBEDDING_ONNX_DIR에 재사용)"""
+
+    name = "onnx"
+    quantize = False
+
+    def __init__(self, onnx_dir=EMBEDDING_ONNX_DIR, num_threads=EMBEDDING_NUM_THREADS, **options):
+        super().__init__(**options)
+        from sentence_transformers import SentenceTransformer
+        import onnxruntime as ort
+
+        start = time.time()
+        # 토크나이저와 풀링/정규화 모듈은 기존 SentenceTransformer 구성을 그대로 사용
+        self.model = SentenceTransformer(self.model_name, device="cpu")
+        model_path = self._prepare_onnx(onnx_dir)
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=session_options, providers=["CPUExecutionProvider"])
+
+        logger.info(f"임베딩 백엔드 로드 완료: {self.name} {model_path} ({time.time() - start:.1f}초)")
+
+    def _prepare_onnx(self, onnx_dir):
+        """ONNX 모델 경로 반환 (없으면 변환/양자화)"""
+        os.makedirs(onnx_dir, exist_ok=True)
+        base_name = self.model_name.replace("/", "__")
+        fp32_path = os.path.join(onnx_dir, f"{base_name}.onnx")
+
+        if not os.path.exists(fp32_path):
+            self._export_onnx(fp32_path)
+
+        if not self.quantize:
+            return fp32_path
+
+        int8_path = os.path.join(onnx_dir, f"{base_name}.int8.onnx")
+        if not os.path.exists(int8_path):
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+            except ImportError as e:
+                # onnxruntime.quantization은 onnx 패키지가 필요 (onnxruntime만으로는 설치되지 않음)
+                raise RuntimeError(
+                    f"{self.name} 백엔드는 onnx 패키지가 필요합니다 (pip install onnx, 또는 EMBEDDING_BACKEND=onnx 사용): {e}"
+                ) from e
+
+            logger.info(f"ONNX int8 양자화: {int8_path}")
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        return int8_path
+
+    def _export_onnx(self, path):
+        """트랜스포머 본체(last_hidden_state 출력)를 ONNX로 변환"""
+        import torch
+
+        class _TokenEmbeddings(torch.nn.Module):
+            def __init__(self, auto_model):
+                super().__init__()
+                self.auto_model = auto_model
+
+            def forward(self, input_ids, attention_mask):
+                return self.auto_model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+        logger.info(f"ONNX 변환: {self.model_name} → {path}")
+        sample = self.model.tokenize(["ONNX export sample"])
+        wrapper = _TokenEmbeddings(self.model[0].auto_model).eval()
+        tmp_path = path + ".tmp"
+
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper,
+                (sample["input_ids"], sample["attention_mask"]),
+                tmp_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["token_embeddings"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "token_embeddings": {0: "batch", 1: "sequence"},
+                },
+                opset_version=ONNX_OPSET_VERSION,
+            )
+        os.replace(tmp_path, path)
+
+    def encode(self, texts):
+        import torch
+
+        embeddings = []
+        texts = list(texts)
+        for start in range(0, len(texts), self.batch_size):
+            features = self.model.tokenize(texts[start:start + self.batch_size])
+            token_embeddings = self.session.run(None, {
+                "input_ids": features["input_ids"].numpy(),
+                "attention_mask": features["attention_mask"].numpy(),
+            })[0]
+
+            features["token_embeddings"] = torch.from_numpy(token_embeddings)
+            with torch.no_grad():
+                for module in list(self.model)[1:]:  # Pooling, Normalize 등
+                    features = module(features)
+            embeddings.extend(features["sentence_embedding"].tolist())
+
+        return embeddings
+
+
+class QuantizedOnnxEmbeddingBackend(OnnxEmbeddingBackend):
+    """int8 동적 양자화 ONNX 모델"""
+
+    name = "onnx-int8"
+    quantize = True
+
+
+EMBEDDING_BACKENDS = {
+    TorchEmbeddingBackend.name: TorchEmbeddingBackend,
+    QuantizedTorchEmbeddingBackend.name: QuantizedTorchEmbeddingBackend,
+    OnnxEmbeddingBackend.name: OnnxEmbeddingBackend,
+    QuantizedOnnxEmbeddingBackend.name: QuantizedOnnxEmbeddingBackend,
+}
+
+
+def create_embedding_backend(backend=None, **options) -> EmbeddingBackend:
+    """백엔드 이름으로 임베딩 백엔드 생성"""
+    backend = backend or EMBEDDING_BACKEND
+
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드: {backend}")
+
+    return EMBEDDING_BACKENDS[backend](**options)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """두 벡터의 코사인 유사도"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(y * y for y in b) ** 0.5
+    return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+
+
+def compare_backend_scores(reference: EmbeddingBackend, candidate: EmbeddingBackend,
+                           queries: Sequence[str], documents: Sequence[str], top_k=5) -> Dict:
+    """
+    두 백엔드의 코사인 점수 일치 여부 확인
+
+    Returns:
+        dict: 임베딩 간 코사인(min/mean), 질의-문서 점수 최대 오차, 상위 top_k 문서 일치율
+    """
+    ref_queries, cand_queries = reference.encode(queries), candidate.encode(queries)
+    ref_docs, cand_docs = reference.encode(documents), candidate.encode(documents)
+
+    vector_cosines = [cosine_similarity(a, b) for a, b in
+                      zip(ref_queries + ref_docs, cand_queries + cand_docs)]
+
+    max_score_diff = 0.0
+    overlaps = []
+    for ref_query, cand_query in zip(ref_queries, cand_queries):
+        ref_scores = [cosine_similarity(ref_query, doc) for doc in ref_docs]
+        cand_scores = [cosine_similarity(cand_query, doc) for doc in cand_docs]
+        max_score_diff = max(max_score_diff, max(abs(a - b) for a, b in zip(ref_scores, cand_scores)))
+
+        ref_top = sorted(range(len(ref_scores)), key=lambda i: -ref_scores[i])[:top_k]
+        cand_top = sorted(range(len(cand_scores)), key=lambda i: -cand_scores[i])[:top_k]
+        overlaps.append(len(set(ref_top) & set(cand_top)) / len(ref_top))
+
+    return {
+        'min_vector_cosine': min(vector_cosines),
+        'mean_vector_cosine': sum(vector_cosines) / len(vector_cosines),
+        'max_score_diff': max_score_diff,
+        'top_k_overlap': sum(overlaps) / len(overlaps),
+    }
@@ -0,0 +1,230 @@
+"""
+코퍼스 임베딩 영구 캐시 모듈 (내용 주소 기반)
+
+청크 구성, 메타데이터, HNSW 설정만 바꿔 벡터DB를 다시 만들어도 문서 텍스트가 같으면 임베딩은 같습니다.
+(모델 + 백엔드 + 텍스트) 해시 → float32 벡터를 SQLite BLOB으로 저장하여
+vector_db_creation 재생성 시 실제로 새로운 텍스트만 인코딩합니다.
+
+- 저장 위치: EMBEDDING_CACHE_PATH (버전 디렉토리 밖, 버전 정리와 무관하게 유지)
+- 조회된 항목은 last_used_at을 갱신하므로 현재 코퍼스가 쓰는 항목은 정리 대상이 되지 않음
+- 정리: python -m api.scripts.embedding_cache compact [--older-than-days 30] [--keep-model MODEL_KEY]
+- 통계: python -m api.scripts.embedding_cache stats
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .lazy_instance import LazyInstanceMap
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache/embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_AGE_DAYS = int(os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", "30"))  # compact 기본 보관 기간
+EMBEDDING_CACHE_QUERY_BATCH = 500  # SQLite IN 조건 1회 최대 키 수
+
+def cache_key(model_key: str, text: str) -> str:
+    """임베딩 캐시 키 (모델 식별자 + 텍스트 내용 해시)"""
+    return hashlib.sha1(f"{model_key}\0{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_model_key(embedding_function) -> str:
+    """임베딩 함수의 모델 식별자 (모델명:백엔드, 양자화 백엔드 결과가 섞이지 않도록 백엔드 포함)"""
+    model_name = getattr(embedding_function, "model_name", None) or type(embedding_function).__name__
+    backend = getattr(embedding_function, "name", None)
+    return f"{model_name}:{backend}" if backend else model_name
+
+
+class EmbeddingCache:
+    """SQLite 임베딩 캐시 (스레드 안전)"""
+
+    def __init__(self, path=EMBEDDING_CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " dimensions INTEGER NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used_at)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get_many(self, model_key: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        캐시된 임베딩 조회 (조회된 항목의 last_used_at 갱신)
+
+        Returns:
+            dict: 텍스트 → 임베딩 (캐시에 있는 텍스트만)
+        """
+        keys = {cache_key(model_key, text): text for text in texts}
+        found = {}
+        now = time.time()
+
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), EMBEDDING_CACHE_QUERY_BATCH):
+                batch = key_list[start:start + EMBEDDING_CACHE_QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch).fetchall()
+                for key, vector in rows:
+                    found[keys[key]] = np.frombuffer(vector, dtype=np.float32).tolist()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET last_used_at = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [now, *[key for key, _ in rows]])
+            self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_key: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """임베딩 저장 (이미 있으면 덮어씀)"""
+        now = time.time()
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            rows.append((cache_key(model_key, text), model_key, int(vector.shape[0]), vector.tobytes(), now, now))
+
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            self.stored += len(rows)
+
+    def stats(self) -> Dict:
+        """캐시 통계 (모델별 항목 수/크기, 이번 프로세스의 적중률)"""
+        with self._lock:
+            models = {
+                model: {"entries": entries, "dimensions": dimensions, "bytes": size}
+                for model, entries, dimensions, size in self._conn.execute(
+                    "SELECT model, COUNT(*), MAX(dimensions), SUM(LENGTH(vector)) FROM embeddings GROUP BY model")
+            }
+            oldest = self._conn.execute("SELECT MIN(last_used_at) FROM embeddings").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "file_size": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "entries": sum(model["entries"] for model in models.values()),
+            "models": models,
+            "oldest_last_used_at": oldest,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def compact(self, older_than_days=EMBEDDING_CACHE_MAX_AGE_DAYS, keep_model: Optional[str] = None) -> Dict:
+        """
+        오래 사용되지 않은 항목(및 keep_model 외 모델 항목) 삭제 후 VACUUM
+
+        Returns:
+            dict: {"removed", "file_size_before", "file_size_after"}
+        """
+        size_before = os.path.getsize(self.path)
+        cutoff = time.time() - older_than_days * 86400
+
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM embeddings WHERE last_used_at < ?", (cutoff,)).rowcount
+            if keep_model:
+                removed += self._conn.execute("DELETE FROM embeddings WHERE model != ?", (keep_model,)).rowcount
+            self._conn.commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+        result = {"removed": removed, "file_size_before": size_before, "file_size_after": os.path.getsize(self.path)}
+        logger.info(f"임베딩 캐시 정리: {result}")
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingFunction:
+    """
+    임베딩 캐시를 거치는 임베딩 함수 (Chroma EmbeddingFunction 호환, encode 제공)
+
+    캐시에 없는 텍스트만 원래 임베딩 함수로 인코딩하며 같은 요청 안의 중복 텍스트는 한 번만 인코딩합니다.
+    """
+
+    def __init__(self, embedding_function, cache: EmbeddingCache, model_key=None):
+        self.embedding_function = embedding_function
+        self.cache = cache
+        self.model_key = model_key or embedding_model_key(embedding_function)
+        self.model_name = getattr(embedding_function, "model_name", None)
+
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        texts = list(texts)
+        found = self.cache.get_many(self.model_key, texts)
+
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+        if missing:
+            encode = getattr(self.embedding_function, "encode", None)
+            embeddings = encode(missing) if encode else self.embedding_function(missing)
+            self.cache.put_many(self.model_key, missing, embeddings)
+            found.update(zip(missing, embeddings))
+
+        return [found[text] for text in texts]
+
+    def __call__(self, input):
+        return self.encode(list(input))
+
+
+_caches = LazyInstanceMap(EmbeddingCache)
+
+
+def get_embedding_cache(path=EMBEDDING_CACHE_PATH) -> EmbeddingCache:
+    """경로별 임베딩 캐시 조회 (경로당 1개)"""
+    return _caches.get(path)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="코퍼스 임베딩 캐시 관리")
+    parser.add_argument("--path", default=EMBEDDING_CACHE_PATH, help="캐시 파일 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="캐시 통계")
+    compact = commands.add_parser("compact", help="오래 사용되지 않은 항목 삭제 후 VACUUM")
+    compact.add_argument("--older-than-days", type=int, default=EMBEDDING_CACHE_MAX_AGE_DAYS,
+                         help="마지막 사용 후 보관 기간 (일)")
+    compact.add_argument("--keep-model", help="이 모델 식별자(모델명:백엔드) 외 항목 삭제")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        logger.error(f"임베딩 캐시가 없습니다: {args.path}")
+        return
+
+    cache = EmbeddingCache(args.path)
+    if args.command == "compact":
+        cache.compact(args.older_than_days, args.keep_model)
+    print(json.dumps(cache.stats(), ensure_ascii=False, indent=2))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+RAG 임베딩 서비스 모듈 (intfloat/multilingual-e5-base)
+
+Chroma의 query_texts 대신 이 서비스에서 계산한 query_embeddings를 넘겨
+여러 요청이 인코더를 공유하도록 합니다.
+
+- 내용 해시(sha1) 기준 임베딩 메모이제이션 (LRU)
+- 동시에 들어온 요청을 짧게 모아(micro-batch) 한 번의 forward pass로 인코딩
+- 같은 텍스트가 인코딩 중이면 진행 중인 결과를 공유 (중복 인코딩 없음)
+- 실제 인코딩은 embedding_backends의 백엔드(EMBEDDING_BACKEND)가 수행
+"""
+
+import os
+import time
+import queue
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Sequence
+
+from .embedding_backends import EMBEDDING_BACKEND, EMBEDDING_MODEL, create_embedding_backend
+from .lazy_instance import LazyInstanceMap
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))  # forward pass당 최대 텍스트 수
+EMBEDDING_BATCH_WAIT_MS = int(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))  # 배치를 모으는 최대 대기 시간
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))  # 메모이제이션 최대 항목 수
+
+def text_key(text: str) -> str:
+    """임베딩 캐시 키 (텍스트 내용 해시)"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingService:
+    """마이크로 배칭 + 메모이제이션 임베딩 서비스 (스레드 안전)"""
+
+    def __init__(self, model_name=EMBEDDING_MODEL, backend=EMBEDDING_BACKEND,
+                 max_batch_size=EMBEDDING_MAX_BATCH_SIZE, batch_wait_ms=EMBEDDING_BATCH_WAIT_MS,
+                 cache_size=EMBEDDING_CACHE_SIZE, model=None):
+        self.model_name = model_name
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.batch_wait_ms = batch_wait_ms
+        self.cache_size = cache_size
+
+        self._model = model  # 임베딩 백엔드 (첫 배치에서 지연 로딩)
+        self._cache = OrderedDict()  # 텍스트 해시 → 임베딩
+        self._pending = {}  # 텍스트 해시 → 인코딩 중인 Future
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.encoded = 0
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._batch_loop, name=f"EmbeddingService-{model_name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: Sequence[str]) -> List[Future]:
+        """텍스트별 임베딩 Future 목록 반환 (캐시 적중 시 완료된 Future)"""
+        if self._closed:
+            raise RuntimeError("임베딩 서비스가 종료되었습니다.")
+
+        futures = []
+        with self._lock:
+            for text in texts:
+                key = text_key(text)
+
+                embedding = self._cache.get(key)
+                if embedding is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    future = Future()
+                    future.set_result(embedding)
+                    futures.append(future)
+                    continue
+
+                self.misses += 1
+                future = self._pending.get(key)
+                if future is None:
+                    future = Future()
+                    self._pending[key] = future
+                    self._queue.put((key, text))
+                futures.append(future)
+
+        return futures
+
+    def embed(self, texts: Sequence[str], timeout=None) -> List[List[float]]:
+        """임베딩 계산 (동기)"""
+        return [future.result(timeout) for future in self.submit(texts)]
+
+    async def embed_async(self, texts: Sequence[str]) -> List[List[float]]:
+        """임베딩 계산 (비동기, 이벤트 루프를 막지 않음)"""
+        futures = [asyncio.wrap_future(future) for future in self.submit(texts)]
+        return list(await asyncio.gather(*futures))
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if self._model is None:
+            self._model = create_embedding_backend(self.backend, model_name=self.model_name)
+        return self._model.encode(texts)
+
+    def _collect_batch(self):
+        """첫 요청을 기다린 뒤 최대 batch_wait_ms 동안 추가 요청을 모음"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._collect_batch()
+            stop = None in batch  # close()가 넣은 종료 신호
+            batch = [item for item in batch if item is not None]
+            if batch:
+                self._process_batch(batch)
+            if stop:
+                return
+
+    def _process_batch(self, batch):
+        """배치 인코딩 후 캐시 저장 및 대기 중인 Future 완료"""
+        keys = [key for key, _ in batch]
+        try:
+            embeddings = self._encode([text for _, text in batch])
+        except Exception as e:
+            logger.error(f"임베딩 인코딩 실패 ({len(batch)}건): {e}")
+            with self._lock:
+                futures = [self._pending.pop(key) for key in keys]
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.encoded += len(batch)
+            futures = []
+            for key, embedding in zip(keys, embeddings):
+                self._cache[key] = embedding
+                self._cache.move_to_end(key)
+                futures.append(self._pending.pop(key))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        for future, embedding in zip(futures, embeddings):
+            future.set_result(embedding)
+
+    def clear_cache(self):
+        """메모이제이션 캐시 삭제"""
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+        return count
+
+    def stats(self) -> Dict:
+        """서비스 통계"""
+        with self._lock:
+            return {
+                'model': self.model_name,
+                'backend': self.backend,
+                'loaded': self._model is not None,
+                'cache_size': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'batches': self.batches,
+                'encoded': self.encoded,
+                'avg_batch_size': round(self.encoded / self.batches, 2) if self.batches else 0.0,
+            }
+
+    def close(self):
+        """배치 스레드 종료"""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+class ServiceEmbeddingFunction:
+    """Chroma EmbeddingFunction 호환 래퍼 (query_texts/add 경로도 임베딩 서비스를 사용)"""
+
+    def __init__(self, service: EmbeddingService):
+        self.service = service
+
+    def __call__(self, input):
+        return self.service.embed(list(input))
+
+
+_services = LazyInstanceMap(EmbeddingService)
+
+
+def get_embedding_service(model_name=EMBEDDING_MODEL, **options) -> EmbeddingService:
+    """모델별 임베딩 서비스 조회 (모델당 1개)"""
+    return _services.get(model_name, **options)
@@ -0,0 +1,118 @@
+"""
+장애사례 스트리밍 로더 모듈
+
+rag_data.json 전체를 json.load로 읽지 않고 사례를 하나씩 꺼내 처리할 수 있도록 합니다.
+- JSON 배열 (.json): 일정 크기씩 읽으며 원소 단위로 파싱 (메모리는 읽기 버퍼 + 사례 1건)
+- JSON Lines (.jsonl): 한 줄에 사례 1건
+
+벡터DB 생성(vector_db_creation)과 어휘 색인(lexical_index)이 같은 로더를 사용합니다.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+JSON_READ_SIZE = 1 << 16  # JSON 배열 파싱 시 한 번에 읽는 문자 수
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(f, read_size=JSON_READ_SIZE) -> Iterator:
+    """JSON 배열 원소를 하나씩 파싱 (파일 전체를 메모리에 올리지 않음)"""
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+    after_value = False  # 원소 직후 (쉼표 또는 ] 필요)
+    expect_value = False  # 쉼표 직후 (원소 필요)
+
+    def fill():
+        nonlocal buffer, position, eof
+        data = f.read(read_size)
+        if not data:
+            eof = True
+        buffer = buffer[position:] + data
+        position = 0
+
+    while True:
+        # 공백/구분자 건너뛰기
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            fill()
+
+        if position >= len(buffer):
+            raise ValueError("JSON 배열이 닫히지 않았습니다")
+
+        char = buffer[position]
+        if not started:
+            if char != "[":
+                raise ValueError("JSON 배열 형식이 아닙니다")
+            started = True
+            position += 1
+            continue
+        if char == "]" and not expect_value:
+            return
+        if char == "," and after_value:
+            position += 1
+            after_value = False
+            expect_value = True
+            continue
+        if after_value:
+            raise ValueError(f"JSON 배열 원소 사이에 쉼표가 없습니다 (위치 근처: {buffer[position:position + 20]!r})")
+
+        # 원소 하나 파싱 (버퍼에 원소가 다 들어올 때까지 더 읽기)
+        while True:
+            try:
+                item, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if not eof and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                # 숫자 등은 버퍼 끝에서 잘렸을 수 있으므로 원소 뒤 구분자가 보일 때까지 더 읽기
+                fill()
+                continue
+            break
+
+        position = end
+        after_value = True
+        expect_value = False
+        yield item
+
+
+def iter_json_lines(f) -> Iterator:
+    """JSON Lines 원소를 한 줄씩 파싱 (빈 줄 무시)"""
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSONL {line_number}번째 줄 파싱 오류: {e}") from e
+
+
+def iter_fault_cases(path: str) -> Iterator[Dict]:
+    """장애사례 파일(.json 배열 또는 .jsonl)에서 사례를 하나씩 반환"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        if path.lower().endswith(JSONL_EXTENSIONS):
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def source_fingerprint(path: str) -> Dict:
+    """원본 파일 식별 정보 (재개 시 같은 파일인지 확인용)"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
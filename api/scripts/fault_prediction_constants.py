@@ -74,6 +74,21 @@ FIELD_KEYWORDS = {
     ],
 }
 
+# 분야 매핑 (표준 분야 -> chroma db 장애분야 값)
+FIELD_MAPPING = {
+    "전송": ["전송"],
+    "MW": ["MW", "M/W", "마이크로 웨이브", "마이크로웨이브"],
+    "IP": ["IP"],
+    "교환": ["교환"],
+    "무선": ["무선"],
+    "선로": ["선로", "케이블"]
+}
+
+# 역방향 매핑 (chroma db의 분야 -> 표준 분야)
+DB_FIELD_TO_STANDARD = {
+    variant: standard_field for standard_field, variants in FIELD_MAPPING.items() for variant in variants
+}
+
 # 장비 계층 관계 정의
 EQUIPMENT_HIERARCHY = {
     "상위장비": {
@@ -9,8 +9,9 @@ import json
 import asyncio
 import aiohttp
 import logging
+import threading
 import chromadb
-from chromadb.utils import embedding_functions
+import numpy as np
 from datetime import datetime
 from functools import lru_cache
 from rapidfuzz import process, fuzz
@@ -21,17 +22,26 @@ from .fault_prediction_utils import (
     normalize_text,
     extract_alert_codes_cached,
     clean_alert_message,
-    calculate_field_matching,
     identify_field_from_keywords,
     analyze_equipment_mentions,
     check_specialized_patterns,
     explain_equipment_hierarchy
 )
 
+from .search_result_cache import build_query_fingerprint, get_search_result_cache
+from .embedding_service import ServiceEmbeddingFunction, get_embedding_service
+from .hybrid_reranker import score_documents_async
+from .lexical_index import get_lexical_index, reciprocal_rank_fusion
+from .sector_partitions import open_sector_partitions, partitions_for_field_values, query_partitions
+from .case_retrieval import CASE_AGGREGATION, query_top_cases
+from .numpy_vector_store import open_numpy_store
+from .vector_db_versions import VECTOR_DB_DIR, VECTOR_DB_NEW_DIR, VECTOR_DB_ROOT, resolve_active_db_dir
+
 # 상수 로드
 from .fault_prediction_constants import (
     DEFAULT_PROMPT_START_MESSAGE,
     FIELD_KEYWORDS,
+    FIELD_MAPPING,
     EQUIPMENT_KEYWORDS,
     ALERT_TYPE_KEYWORDS
 )
@@ -39,22 +49,6 @@ from .fault_prediction_constants import (
 # 상수 정의 - 파일 최상단에 추가
 ERROR_DB_ACCESS = "VECTOR_DB_ACCESS_ERROR"
 
-# 분야 매핑 상수 추가
-FIELD_MAPPING = {
-    "전송": ["전송"],
-    "MW": ["MW", "M/W", "마이크로 웨이브", "마이크로웨이브"],
-    "IP": ["IP"],
-    "교환": ["교환"],
-    "무선": ["무선"],
-    "선로": ["선로", "케이블"]
-}
-
-# 역방향 매핑 (chroma db의 분야 -> 표준 분야)
-DB_FIELD_TO_STANDARD = {}
-for standard_field, variants in FIELD_MAPPING.items():
-    for variant in variants:
-        DB_FIELD_TO_STANDARD[variant] = standard_field
-
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -65,18 +59,24 @@ logger = logging.getLogger(__name__)
 
 # 상수 정의
 API_BASE_URL = "http://localhost:80/api"
-VECTOR_DB_DIR = "./chroma_db"
-VECTOR_DB_NEW_DIR = "./chroma_db_new"
+VECTOR_DB_BACKEND = os.getenv("VECTOR_DB_BACKEND", "chroma")  # chroma | numpy (버전 디렉토리의 numpy_store 전수 비교)
+VECTOR_DB_VERSION_CHECK_INTERVAL = int(os.getenv("VECTOR_DB_VERSION_CHECK_INTERVAL", "10"))  # 활성 버전 확인 간격(초)
+VECTOR_DB_RELEASE_GRACE = int(os.getenv("VECTOR_DB_RELEASE_GRACE", "300"))  # 교체된 이전 버전 보관 시간(초, 진행 중 요청 완료 대기)
 EMBEDDING_MODEL = "intfloat/multilingual-e5-base"
 
 HTML_NBSP_3 = "&nbsp&nbsp&nbsp"
+LEXICAL_TOP_N = 20  # 어휘 색인(BM25/경보 코드) 검색 후보 수
+HYBRID_FUSED_CANDIDATES = 20  # 벡터 + 어휘 결합 후 재순위 후보 수
 
 # 전역 변수
 _guksa_id = ''
-_vector_search_cache = {}
-_VECTOR_CACHE_SIZE = 50
-_VECTOR_CACHE_EXPIRY = 3600  # 1시간
 _collection_instance = None
+_collection_version = None
+_collection_checked_at = 0.0
+_collection_lock = threading.Lock()
+_partition_instances = {}  # 벡터DB 버전 → 분야별 파티션 컬렉션
+_collection_client = None  # 현재 버전 Chroma 클라이언트 (NumPy 저장소면 None)
+_retired_collections = []  # 해제 대기 중인 이전 버전 [(교체 시각, 버전, 컬렉션, 클라이언트)]
 
 # 유틸리티 함수
 
@@ -226,8 +226,8 @@ async def run_query(mode, query, user_id="default_user"):
     """사용자 쿼리를 처리하여 유사 장애사례를 검색하고 종합 의견을 생성하는 메인 함수 (비동기 버전)"""
     start_time = time.time()
 
-    # 벡터 DB 컬렉션 가져오기
-    collection, error = get_vector_db_collection()
+    # 벡터 DB 컬렉션 가져오기 (요청 처리 중 버전이 바뀌어도 이 컬렉션으로 끝까지 처리)
+    collection, version, error = get_vector_db_handle()
     if error:
         # 오류 타입으로 비교
         error_msg = error["message"] if isinstance(error, dict) else str(error)
@@ -255,7 +255,7 @@ async def run_query(mode, query, user_id="default_user"):
     external_factors_task = fetch_external_factors_async(get_guksa_id())
 
     # 하이브리드 검색 수행 (벡터 + 키워드 + 패턴)
-    sorted_results, search_results = await hybrid_search_async(query, collection)
+    sorted_results, search_results = await hybrid_search_async(query, collection, version=version)
 
     # 외부 요인 결과 기다리기
     external_factors = await external_factors_task
@@ -950,8 +950,8 @@ def analyze_fault_alert_correlation(top_results):
     return " ".join(correlation_texts)
 
 
-async def hybrid_search_async(query, collection, top_k=5):
-    """벡터 유사도와 키워드/패턴 매칭을 결합한 하이브리드 검색 구현 (비동기 버전)"""
+async def hybrid_search_async(query, collection, top_k=5, version=None):
+    """벡터 유사도와 키워드/패턴 매칭을 결합한 하이브리드 검색 구현 (비동기 버전, version: 벡터DB 버전)"""
     # 1. 경보 내역에서 분야 추출
     detected_fields = extract_fields_from_query(query)
 
@@ -961,55 +961,28 @@ async def hybrid_search_async(query, collection, top_k=5):
     # 3. 필터링 정보 로깅
     log_field_filtering_info(query, detected_fields, field_filter)
 
-    # 캐시 키 생성 (필터 조건도 포함)
-    cache_key = hash(query + str(field_filter))
-    current_time = time.time()
+    # 캐시 키 생성 (정규화된 경보 내역 + 경보 코드 + 필터 조건 + 벡터DB 버전)
+    search_cache = get_search_result_cache()
+    cache_key = build_query_fingerprint(query, field_filter, top_k, version)
 
     # 캐시에 있고 만료되지 않았으면 캐시된 결과 반환
-    if cache_key in _vector_search_cache:
-        cached_item = _vector_search_cache[cache_key]
-        if current_time - cached_item['timestamp'] < _VECTOR_CACHE_EXPIRY:
-            return cached_item['results'], cached_item['search_results']
-
-    # 벡터 검색 실행 (분야 필터 적용)
-    search_params = {
-        "query_texts": [query],
-        "n_results": min(top_k * 3, 15),
-        "include": ["documents", "metadatas", "distances"]
-    }
+    cached_item = search_cache.get(cache_key)
+    if cached_item is not None:
+        return cached_item['results'], cached_item['search_results']
 
-    # 분야 필터가 있으면 추가
     if field_filter:
-        search_params["where"] = field_filter
         logger.info(f"분야 필터링 적용: {detected_fields}")
 
-    search_results = collection.query(**search_params)
+    # 쿼리 임베딩 (임베딩 서비스에서 메모이제이션 + 동시 요청 배치 처리)
+    query_embeddings = await get_embedding_service(EMBEDDING_MODEL).embed_async([query])
 
-    if not search_results.get("documents") or not search_results["documents"][0]:
+    # 벡터 검색 + 어휘 색인 검색 결합 후보 구성
+    documents_info, search_results = await retrieve_hybrid_candidates(
+        query, collection, query_embeddings[0], field_filter, top_k, partitions=get_sector_partitions(version))
+    if not documents_info:
         logger.warning(f"검색 결과 없음. 필터 조건: {field_filter}")
         return [], search_results
 
-    seen_fault_numbers = set()
-    docs = search_results["documents"][0]
-    metas = search_results["metadatas"][0]
-    distances = search_results["distances"][0]
-
-    # 유사도 계산을 위한 데이터 구성
-    documents_info = []
-    for doc, meta, distance in zip(docs, metas, distances):
-        fault_number = meta.get("장애번호")
-        if not fault_number or fault_number in seen_fault_numbers:
-            continue
-        seen_fault_numbers.add(fault_number)
-        documents_info.append({
-            "alerts": meta.get("경보현황", ""),
-            "analysis": meta.get("장애분석", ""),
-            "reception": meta.get("장애접수내역", ""),
-            "metadata": meta,
-            "document": doc,
-            "distance": distance,
-        })
-
     logger.info(f"필터링 후 문서 수: {len(documents_info)}")
 
     # 유사도 계산 (텍스트 매칭 강화)
@@ -1028,158 +1001,274 @@ async def hybrid_search_async(query, collection, top_k=5):
     sorted_results = sorted(
         hybrid_results, key=lambda x: x["hybrid_score"], reverse=True)[:top_k]
 
-    # 결과 캐싱
-    _vector_search_cache[cache_key] = {
+    # 결과 캐싱 (크기/만료 관리는 캐시에서 처리)
+    search_cache.set(cache_key, {
         'results': sorted_results,
         'search_results': search_results,
-        'timestamp': current_time
+    })
+
+    return sorted_results, search_results
+
+
+async def retrieve_hybrid_candidates(query, collection, query_embedding, field_filter, top_k=5, partitions=None,
+                                     aggregation=CASE_AGGREGATION):
+    """
+    재순위 후보 구성: 벡터 검색 결과와 어휘 색인(BM25 + 경보 코드) 결과를 RRF로 결합
+
+    벡터 검색은 사례 단위로 수행하여(case_retrieval) 서로 다른 장애사례 min(top_k * 3, 15)건을 후보로 사용합니다.
+    분야 필터가 있고 분야별 파티션(partitions)이 있으면 해당 분야 파티션만 병렬 조회하여 결합하고,
+    없으면 본 컬렉션에 메타데이터 필터를 적용합니다.
+
+    Returns:
+        tuple: (재순위 후보 목록, chroma 검색 결과)
+    """
+    include = ["documents", "metadatas", "distances"]
+    partition_names = partitions_for_field_values(get_field_filter_values(field_filter)) if partitions else []
+
+    def run_vector_query(n_results):
+        if partition_names:
+            return query_partitions(partitions, partition_names, query_embedding, n_results, include)
+
+        # 벡터 검색 실행 (분야 필터가 있으면 추가)
+        search_params = {"query_embeddings": [query_embedding], "n_results": n_results, "include": include}
+        if field_filter:
+            search_params["where"] = field_filter
+        return collection.query(**search_params)
+
+    # 벡터 검색 후보 (장애번호별 청크 점수 집계, 서로 다른 사례가 확정될 때까지만 추가 조회)
+    top_cases, search_results = await asyncio.to_thread(
+        query_top_cases, run_vector_query, min(top_k * 3, 15), aggregation)
+    candidates = {fault_number: build_candidate_info(case["document"], case["metadata"], case["distance"])
+                  for fault_number, case in top_cases}
+
+    # 어휘 색인 검색 (BM25 + 경보 코드) 후 reciprocal rank fusion으로 결합
+    bm25_hits, code_hits = await asyncio.to_thread(search_lexical_index, query, field_filter)
+    fused = reciprocal_rank_fusion(
+        [list(candidates), [fault_number for fault_number, _ in bm25_hits],
+         [fault_number for fault_number, _ in code_hits]],
+        limit=HYBRID_FUSED_CANDIDATES)
+
+    # 어휘 색인에서만 찾은 사례는 벡터DB에서 문서와 임베딩을 가져와 거리 계산
+    missing = [fault_number for fault_number in fused if fault_number not in candidates]
+    if missing:
+        candidates.update(fetch_case_candidates(collection, missing, query_embedding))
+        logger.info(f"어휘 색인 추가 후보: {len(missing)}건 (BM25 {len(bm25_hits)}, 경보코드 {len(code_hits)})")
+
+    # 유사도 계산을 위한 데이터 구성
+    documents_info = [candidates[fault_number] for fault_number in fused if fault_number in candidates]
+    return documents_info, search_results
+
+
+def build_candidate_info(doc, meta, distance):
+    """재순위 후보 데이터 구성"""
+    return {
+        "alerts": meta.get("경보현황", ""),
+        "analysis": meta.get("장애분석", ""),
+        "reception": meta.get("장애접수내역", ""),
+        "metadata": meta,
+        "document": doc,
+        "distance": distance,
     }
 
-    # 캐시 크기 관리
-    if len(_vector_search_cache) > _VECTOR_CACHE_SIZE:
-        oldest_keys = sorted(_vector_search_cache.keys(),
-                             key=lambda k: _vector_search_cache[k]['timestamp'])[:5]
-        for key in oldest_keys:
-            del _vector_search_cache[key]
 
-    return sorted_results, search_results
+def get_field_filter_values(field_filter):
+    """chroma db 분야 필터 조건에서 허용 분야 값 목록 추출"""
+    if not field_filter:
+        return None
+    condition = field_filter.get("장애분야", {})
+    if "$eq" in condition:
+        return {condition["$eq"]}
+    return set(condition.get("$in", []))
+
+
+def search_lexical_index(query, field_filter):
+    """어휘 색인 BM25/경보 코드 검색 (프롬프트 시작 메시지 제외, 분야 필터 동일 적용)"""
+    if query.startswith(DEFAULT_PROMPT_START_MESSAGE):
+        query = query[len(DEFAULT_PROMPT_START_MESSAGE):]
+
+    lexical_index = get_lexical_index()
+    lexical_index.refresh_if_stale()
+    fields = get_field_filter_values(field_filter)
+    return (lexical_index.search_bm25(query, LEXICAL_TOP_N, fields),
+            lexical_index.search_codes(query, LEXICAL_TOP_N, fields))
+
+
+def fetch_case_candidates(collection, fault_numbers, query_embedding):
+    """장애번호 목록의 문서를 벡터DB에서 조회하여 사례별 가장 가까운 문서를 후보로 구성"""
+    results = collection.get(
+        where={"장애번호": {"$in": list(fault_numbers)}},
+        include=["documents", "metadatas", "embeddings"])
+
+    # 컬렉션 거리 함수와 같은 방식으로 계산 (chroma 기본값 l2는 제곱 거리)
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    query_vector = np.asarray(query_embedding, dtype=np.float64)
+
+    candidates = {}
+    for doc, meta, embedding in zip(results["documents"], results["metadatas"], results["embeddings"]):
+        vector = np.asarray(embedding, dtype=np.float64)
+        if space == "cosine":
+            distance = 1 - float(query_vector @ vector) / float(
+                np.linalg.norm(query_vector) * np.linalg.norm(vector) or 1)
+        elif space == "ip":
+            distance = 1 - float(query_vector @ vector)
+        else:
+            distance = float(((query_vector - vector) ** 2).sum())
 
+        fault_number = meta.get("장애번호")
+        if fault_number not in candidates or distance < candidates[fault_number]["distance"]:
+            candidates[fault_number] = build_candidate_info(doc, meta, distance)
 
-async def calculate_hybrid_similarities(query, documents):
-    """하이브리드 유사도 계산 - 벡터 거리, 텍스트 매칭, 패턴 매칭 결합"""
-    # 1. 정규화 및 전처리
-    query_norm = normalize_text(query.lower())
-    query_codes = set(extract_alert_codes_cached(query))
-
-    # 2. 비동기 처리를 위한 작업 목록 구성
-    tasks = []
-
-    for doc in documents:
-        # 비동기 처리할 작업 추가
-        tasks.append(
-            compute_document_similarity(
-                query_norm,
-                doc,
-                query_codes
-            )
-        )
+    return candidates
 
-    # 3. 모든 유사도 계산 작업 병렬 실행
-    similarity_scores = await asyncio.gather(*tasks)
-
-    return similarity_scores
-
-
-async def compute_document_similarity(query_norm, doc, query_codes):
-    """단일 문서의 유사도 계산 - 비동기 처리"""
-    # 1. 문서 필드 정규화
-    alert_text = normalize_text(doc.get("alerts", "").lower())
-    analysis_text = normalize_text(doc.get("analysis", "").lower())
-    reception_text = normalize_text(doc.get("reception", "").lower())
-
-    # 2. 정확한 일치 여부 확인
-    exact_match = False
-    if query_norm and (query_norm == alert_text or query_norm in alert_text):
-        exact_match = True
-
-    # 3. RapidFuzz 유사도 계산
-    # 경보내역, 장애분석, 장애접수내역 각각에 대한 유사도 계산
-    alert_similarity = fuzz.token_set_ratio(query_norm, alert_text) / 100
-    analysis_similarity = fuzz.token_set_ratio(query_norm, analysis_text) / 100
-    reception_similarity = fuzz.token_set_ratio(
-        query_norm, reception_text) / 100
-
-    # 4. 경보 코드 매칭
-    doc_codes = set(extract_alert_codes_cached(doc.get("alerts", "")))
-    code_match_ratio = len(query_codes & doc_codes) / \
-        len(query_codes) if query_codes else 0
-
-    # 5. 분야 키워드 매칭
-    field_match_score = calculate_field_matching(
-        query_norm, alert_text + analysis_text)
-
-    # 6. 벡터 거리 기반 점수 (역수 관계: 거리가 작을수록 유사도 높음)
-    vector_score = max(0, 1 - doc.get("distance", 0)) * 40  # 최대 40점
-
-    # 7. 최종 유사도 계산
-    # 정확히 일치하는 경우 높은 점수 부여
-    if exact_match:
-        return 95.0
-
-    # 각 구성 요소별 가중치 조정
-    alert_weight = 0.35       # 경보내역 유사도 가중치
-    analysis_weight = 0.25    # 장애분석 유사도 가중치
-    reception_weight = 0.15   # 장애접수내역 유사도 가중치
-    code_weight = 0.15        # 경보코드 매칭 가중치
-    field_weight = 0.10       # 분야 키워드 매칭 가중치
-
-    # 각 컴포넌트 점수 계산
-    alert_score = alert_similarity * 100 * alert_weight
-    analysis_score = analysis_similarity * 100 * analysis_weight
-    reception_score = reception_similarity * 100 * reception_weight
-    code_score = code_match_ratio * 100 * code_weight
-    field_score = field_match_score * field_weight
-
-    # 총점 계산 및 보정
-    total_score = alert_score + analysis_score + reception_score + \
-        code_score + field_score + (vector_score * 0.2)
-
-    # 높은 유사도 보정
-    if alert_similarity > 0.9:
-        total_score = max(total_score, 85)
-    if alert_similarity > 0.8 and analysis_similarity > 0.7:
-        total_score = max(total_score, 80)
-    if code_match_ratio > 0.7:
-        total_score = max(total_score, 75)
-
-    # 최종 점수 범위 제한
-    return max(10, min(95, total_score))
+
+async def calculate_hybrid_similarities(query, documents):
+    """하이브리드 유사도 계산 - 벡터 거리, 텍스트 매칭, 패턴 매칭 결합 (배치 계산, 스레드 풀 실행)"""
+    return await score_documents_async(query, documents)
 
 
 def create_embedding_function():
-    """임베딩 함수 생성"""
-    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=EMBEDDING_MODEL)
+    """임베딩 함수 생성 (공유 임베딩 서비스 사용)"""
+    return ServiceEmbeddingFunction(get_embedding_service(EMBEDDING_MODEL))
 
 
 def get_vector_db_collection():
-    """벡터DB 컬렉션을 가져오는 함수 (싱글톤 패턴 적용)"""
-    global _collection_instance
-
-    if _collection_instance is not None:
-        return _collection_instance, None
+    """벡터DB 컬렉션을 가져오는 함수 (싱글톤 패턴 적용, 활성 버전이 바뀌면 교체)"""
+    collection, _, error = get_vector_db_handle()
+    return collection, error
+
+
+def get_vector_db_handle(force_check=False):
+    """
+    현재 활성 버전의 벡터DB 컬렉션 조회
+
+    active.json은 VECTOR_DB_VERSION_CHECK_INTERVAL마다(force_check면 즉시) 확인하며,
+    버전이 바뀌면 새 컬렉션을 연 뒤 참조만 교체합니다.
+    이미 컬렉션을 받은 요청은 이전 버전으로 끝까지 처리됩니다.
+
+    Returns:
+        tuple: (컬렉션, 버전, 오류)
+    """
+    global _collection_instance, _collection_version, _collection_checked_at, _partition_instances, _collection_client
+
+    now = time.monotonic()
+    if (_collection_instance is not None and not force_check
+            and now - _collection_checked_at < VECTOR_DB_VERSION_CHECK_INTERVAL):
+        return _collection_instance, _collection_version, None
+
+    with _collection_lock:
+        if (_collection_instance is not None and not force_check
+                and time.monotonic() - _collection_checked_at < VECTOR_DB_VERSION_CHECK_INTERVAL):
+            return _collection_instance, _collection_version, None
+        _collection_checked_at = time.monotonic()
+        release_retired_vector_db_clients()
+
+        version, db_dir = resolve_active_db_dir()
+        if version is not None and version == _collection_version and _collection_instance is not None:
+            return _collection_instance, _collection_version, None
+
+        if version is None:
+            if _collection_instance is not None:
+                return _collection_instance, _collection_version, None  # 활성 버전을 읽을 수 없으면 기존 버전 유지
+            error_msg = f"벡터DB를 찾을 수 없습니다. 경로를 확인해주세요.\n버전 경로: {VECTOR_DB_ROOT}\n주 경로: {VECTOR_DB_DIR}\n대체 경로: {VECTOR_DB_NEW_DIR}"
+            return None, None, {"type": ERROR_DB_ACCESS, "message": error_msg}
 
+        try:
+            collection, partitions, client = open_vector_db_collection(db_dir)
+        except Exception as e:
+            if _collection_instance is not None:
+                logger.error(f"벡터DB 버전 {version} 열기 실패, 기존 버전 {_collection_version} 유지: {e}")
+                return _collection_instance, _collection_version, None
+            error_msg = f"벡터DB 접근 중 오류가 발생했습니다: {str(e)}"
+            return None, None, {"type": ERROR_DB_ACCESS, "message": error_msg}
+
+        previous_collection, previous_version, previous_client = _collection_instance, _collection_version, _collection_client
+        # 파티션은 현재/직전 버전만 보관 (더 오래된 버전으로 처리 중인 요청은 메타데이터 필터 사용)
+        _partition_instances = {key: value for key, value in _partition_instances.items() if key == previous_version}
+        _partition_instances[version] = partitions
+        _collection_instance, _collection_version, _collection_client = collection, version, client
+        if previous_collection is not None:
+            # 검색 결과 캐시는 버전별 키를 사용하므로 이전 버전 결과는 만료/LRU로 정리됨
+            logger.info(f"벡터DB 버전 교체: {previous_version} → {version} ({db_dir}, 문서 {collection.count()}개)")
+            # 진행 중인 요청이 끝날 때까지 이전 버전 참조 유지 (VECTOR_DB_RELEASE_GRACE 이후 해제)
+            _retired_collections.append((time.monotonic(), previous_version, previous_collection, previous_client))
+            # 어휘 색인도 새 버전의 사례 스냅샷으로 갱신 (백그라운드)
+            get_lexical_index().refresh_async()
+
+        return _collection_instance, _collection_version, None
+
+
+def open_vector_db_collection(db_dir):
+    """
+    DB 디렉토리의 nw_incidents 컬렉션과 분야별 파티션 열기 (파티션이 없는 버전이면 None)
+
+    VECTOR_DB_BACKEND=numpy면 NumPy 전수 비교 저장소를 사용하며(파티션 없이 행 번호 색인으로 분야 필터),
+    저장소가 없는 버전이면 Chroma 컬렉션을 사용합니다.
+
+    Returns:
+        tuple: (컬렉션, 분야별 파티션, Chroma 클라이언트), NumPy 저장소면 (저장소, None, None)
+    """
+    if VECTOR_DB_BACKEND == "numpy":
+        store = open_numpy_store(db_dir)
+        if store is not None:
+            return store, None, None
+        logger.warning(f"NumPy 저장소가 없는 벡터DB입니다 (Chroma 사용): {db_dir}")
+
+    client = chromadb.PersistentClient(path=db_dir)
+
+    # 임베딩 함수 설정
+    ef = create_embedding_function()
+
+    # 컬렉션 가져오기
+    collection = client.get_collection(
+        name="nw_incidents", embedding_function=ef)
+
+    # 인덱스 최적화 시도 (지원되는 경우)
     try:
-        # 주 경로 시도
-        if os.path.exists(VECTOR_DB_DIR):
-            client = chromadb.PersistentClient(path=VECTOR_DB_DIR)
-        # 대체 경로 시도
-        elif os.path.exists(VECTOR_DB_NEW_DIR):
-            client = chromadb.PersistentClient(path=VECTOR_DB_NEW_DIR)
-        else:
-            error_msg = f"벡터DB를 찾을 수 없습니다. 경로를 확인해주세요.\n주 경로: {VECTOR_DB_DIR}\n대체 경로: {VECTOR_DB_NEW_DIR}"
-            return None, {"type": ERROR_DB_ACCESS, "message": error_msg}
+        collection.create_index(
+            index_type="hnsw",  # 대용량 데이터에 적합한 인덱스
+            params={"space_type": "cosine", "ef_construction": 200}
+        )
+    except (AttributeError, NotImplementedError):
+        pass  # 지원되지 않는 경우 무시
 
-        # 임베딩 함수 설정
-        ef = create_embedding_function()
+    partitions = open_sector_partitions(client, ef)
+    if partitions is None:
+        logger.info(f"분야별 파티션이 없는 벡터DB입니다 (메타데이터 필터 사용): {db_dir}")
 
-        # 컬렉션 가져오기
-        _collection_instance = client.get_collection(
-            name="nw_incidents", embedding_function=ef)
+    return collection, partitions, client
 
-        # 인덱스 최적화 시도 (지원되는 경우)
-        try:
-            _collection_instance.create_index(
-                index_type="hnsw",  # 대용량 데이터에 적합한 인덱스
-                params={"space_type": "cosine", "ef_construction": 200}
-            )
-        except (AttributeError, NotImplementedError):
-            pass  # 지원되지 않는 경우 무시
-
-        return _collection_instance, None
-
-    except Exception as e:
-        error_msg = f"벡터DB 접근 중 오류가 발생했습니다: {str(e)}"
-        return None, {"type": ERROR_DB_ACCESS, "message": error_msg}
+
+def get_sector_partitions(version):
+    """벡터DB 버전의 분야별 파티션 조회 (없으면 None)"""
+    return _partition_instances.get(version)
+
+
+def release_retired_vector_db_clients(grace=VECTOR_DB_RELEASE_GRACE) -> List[str]:
+    """
+    교체 후 grace초가 지난 이전 버전 해제 (_collection_lock 안에서 호출, 해제한 버전 목록 반환)
+
+    Chroma는 경로별 System을 클라이언트 캐시에 보관하므로 공개 API(clear_system_cache)로 캐시를 비운 뒤
+    참조를 놓아 GC로 회수합니다. 현재 버전 클라이언트는 자신의 System을 직접 참조하므로 계속 사용됩니다.
+    clear_system_cache가 없는 chromadb 버전이면 캐시를 비우지 않으므로 이전 버전 메모리는 프로세스 재시작 시 회수됩니다.
+    NumPy 저장소는 참조가 없어지면 mmap이 닫힙니다.
+    """
+    now = time.monotonic()
+    expired = [entry for entry in _retired_collections if now - entry[0] >= grace]
+    if not expired:
+        return []
+    _retired_collections[:] = [entry for entry in _retired_collections if now - entry[0] < grace]
+
+    clients = [client for _, _, _, client in expired if client is not None]
+    if clients:
+        clear_system_cache = getattr(clients[0], "clear_system_cache", None)
+        if clear_system_cache is None:
+            logger.warning(f"chromadb {chromadb.__version__}에 clear_system_cache가 없어 이전 벡터DB 메모리를 해제하지 못합니다")
+        else:
+            clear_system_cache()
+
+    versions = [version for _, version, _, _ in expired]
+    logger.info(f"이전 벡터DB 버전 해제: {versions}")
+    return versions
 
 
 def build_summary_rows(top_results):
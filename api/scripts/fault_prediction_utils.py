@@ -3,6 +3,7 @@
 """
 
 import re
+import json
 from functools import lru_cache
 from rapidfuzz import process, fuzz
 
@@ -103,21 +104,74 @@ def clean_alert_message(message):
 
 # 분야별 키워드 매칭 점수 계산
 def calculate_field_matching(query, doc_text):
-    query_fields = set()
-    doc_fields = set()
-    
     # 쿼리와 문서에서 발견된 분야 수집
-    for field, keywords in FIELD_KEYWORDS.items():
-        if any(kw.lower() in query for kw in keywords):
-            query_fields.add(field)
-        if any(kw.lower() in doc_text for kw in keywords):
-            doc_fields.add(field)
-    
-    # 공통 분야 비율 계산
+    return field_matching_score(detect_keyword_fields(query), detect_keyword_fields(doc_text))
+
+# 텍스트(소문자/정규화된 텍스트)에 키워드가 등장하는 분야 집합
+def detect_keyword_fields(text):
+    return {field for field, keywords in FIELD_KEYWORDS.items()
+            if any(kw.lower() in text for kw in keywords)}
+
+# 공통 분야 비율 계산 (분야 집합이 미리 계산된 경우)
+def field_matching_score(query_fields, doc_fields):
     common_fields = query_fields & doc_fields
-    matching_score = len(common_fields) * 100 / max(1, len(query_fields))
-    
-    return matching_score
+    return len(common_fields) * 100 / max(1, len(query_fields))
+
+##########################
+# 재순위용 문서 특징 사전 계산 #
+##########################
+# 벡터DB 메타데이터에 저장하는 재순위 특징 버전 (계산 방식이 바뀌면 올림)
+RERANK_FEATURE_VERSION = 1
+
+# 장애사례의 재순위 특징 계산 (벡터DB 생성 시 메타데이터로 저장, Chroma 메타데이터는 스칼라만 허용)
+def build_rerank_features(alerts, analysis, reception):
+    alert_norm = normalize_text((alerts or "").lower())
+    analysis_norm = normalize_text((analysis or "").lower())
+    reception_norm = normalize_text((reception or "").lower())
+
+    return {
+        "rerank_version": RERANK_FEATURE_VERSION,
+        "rerank_alerts_norm": alert_norm,
+        "rerank_analysis_norm": analysis_norm,
+        "rerank_reception_norm": reception_norm,
+        "rerank_alert_codes": json.dumps(sorted(extract_alert_codes_cached(alerts or "")), ensure_ascii=False),
+        "rerank_fields": json.dumps(sorted(detect_keyword_fields(alert_norm + analysis_norm)), ensure_ascii=False),
+    }
+
+# 메타데이터에서 재순위 특징 로드 (없거나 버전이 다르면 원문으로 계산, 같은 사례는 캐시)
+def load_rerank_features(metadata):
+    if metadata.get("rerank_version") == RERANK_FEATURE_VERSION:
+        return _parse_rerank_features(
+            metadata.get("rerank_alerts_norm", ""),
+            metadata.get("rerank_analysis_norm", ""),
+            metadata.get("rerank_reception_norm", ""),
+            metadata.get("rerank_alert_codes", "[]"),
+            metadata.get("rerank_fields", "[]"),
+        )
+
+    return _compute_rerank_features(
+        metadata.get("경보현황", ""), metadata.get("장애분석", ""), metadata.get("장애접수내역", ""))
+
+@lru_cache(maxsize=4096)
+def _parse_rerank_features(alert_norm, analysis_norm, reception_norm, codes_json, fields_json):
+    return {
+        "alerts_norm": alert_norm,
+        "analysis_norm": analysis_norm,
+        "reception_norm": reception_norm,
+        "alert_codes": frozenset(json.loads(codes_json)),
+        "fields": frozenset(json.loads(fields_json)),
+    }
+
+@lru_cache(maxsize=4096)
+def _compute_rerank_features(alerts, analysis, reception):
+    features = build_rerank_features(alerts, analysis, reception)
+    return _parse_rerank_features(
+        features["rerank_alerts_norm"],
+        features["rerank_analysis_norm"],
+        features["rerank_reception_norm"],
+        features["rerank_alert_codes"],
+        features["rerank_fields"],
+    )
 
 # 텍스트에서 키워드 기반으로 분야 식별 (캐싱 적용)
 def identify_field_from_keywords(text, field_map=None):
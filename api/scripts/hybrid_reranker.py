@@ -0,0 +1,121 @@
+"""
+하이브리드 재순위(rerank) 점수 계산 모듈
+
+벡터 검색 후보 전체를 한 번에 점수화합니다.
+- 경보현황/장애분석/장애접수내역 3개 필드 × 후보 전체를 rapidfuzz.process.cdist 한 번으로 계산
+- 가중치 합산, 보정 규칙, 점수 범위 제한은 NumPy 벡터 연산으로 처리
+- CPU 작업은 전용 스레드 풀에서 실행하여 이벤트 루프를 막지 않음
+
+점수 규칙은 기존 compute_document_similarity와 같습니다.
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .fault_prediction_utils import (
+    normalize_text,
+    extract_alert_codes_cached,
+    detect_keyword_fields,
+    load_rerank_features,
+)
+
+# 상수 정의
+RERANK_EXECUTOR_WORKERS = int(os.getenv("RERANK_EXECUTOR_WORKERS", "2"))  # 재순위 스레드 풀 크기
+RERANK_CDIST_WORKERS = int(os.getenv("RERANK_CDIST_WORKERS", "-1"))  # cdist 병렬 스레드 (-1: 전체 코어)
+RERANK_PARALLEL_MIN_CHOICES = 64  # 이 개수 미만이면 cdist를 단일 스레드로 실행 (스레드 생성 비용이 더 큼)
+
+# 가중치 (기존 compute_document_similarity와 동일)
+ALERT_WEIGHT = 0.35       # 경보내역 유사도 가중치
+ANALYSIS_WEIGHT = 0.25    # 장애분석 유사도 가중치
+RECEPTION_WEIGHT = 0.15   # 장애접수내역 유사도 가중치
+CODE_WEIGHT = 0.15        # 경보코드 매칭 가중치
+FIELD_WEIGHT = 0.10       # 분야 키워드 매칭 가중치
+VECTOR_WEIGHT = 0.2       # 벡터 거리 점수 반영 비율
+EXACT_MATCH_SCORE = 95.0
+MIN_SCORE = 10
+MAX_SCORE = 95
+
+# 전역 변수 (ThreadPoolExecutor는 첫 submit 시 스레드를 만들므로 모듈 로딩 시 생성해도 무방)
+_executor = ThreadPoolExecutor(max_workers=RERANK_EXECUTOR_WORKERS, thread_name_prefix="HybridRerank")
+
+
+def score_documents(query: str, documents: List[Dict]) -> List[float]:
+    """
+    후보 문서 전체의 하이브리드 유사도 계산 (동기, 배치)
+
+    Args:
+        query: 경보 내역 질의
+        documents: hybrid_search_async의 후보 목록 ("metadata", "distance" 사용)
+
+    Returns:
+        list: 문서 순서대로 유사도 점수 (10~95)
+    """
+    if not documents:
+        return []
+
+    # 1. 질의 쪽 전처리 (요청당 1회)
+    query_norm = normalize_text(query.lower())
+    query_codes = set(extract_alert_codes_cached(query))
+    query_fields = detect_keyword_fields(query_norm)
+
+    # 2. 문서 쪽 특징 (벡터DB 생성 시 사전 계산)
+    features = [load_rerank_features(doc.get("metadata", {})) for doc in documents]
+    count = len(features)
+
+    # 3. RapidFuzz 유사도: [경보현황..., 장애분석..., 장애접수내역...]을 한 번에 계산
+    choices = ([f["alerts_norm"] for f in features] + [f["analysis_norm"] for f in features]
+               + [f["reception_norm"] for f in features])
+    workers = RERANK_CDIST_WORKERS if len(choices) >= RERANK_PARALLEL_MIN_CHOICES else 1
+    ratios = process.cdist([query_norm], choices, scorer=fuzz.token_set_ratio,
+                           dtype=np.float64, workers=workers)[0] / 100
+    alert_similarity = ratios[:count]
+    analysis_similarity = ratios[count:count * 2]
+    reception_similarity = ratios[count * 2:]
+
+    # 4. 정확한 일치, 경보 코드 매칭, 분야 키워드 매칭
+    exact_match = np.array([bool(query_norm) and query_norm in f["alerts_norm"] for f in features])
+    code_match_ratio = np.array([len(query_codes & f["alert_codes"]) / len(query_codes) if query_codes else 0
+                                 for f in features], dtype=np.float64)
+    common_field_counts = np.array([len(query_fields & f["fields"]) for f in features], dtype=np.float64)
+    field_match_score = common_field_counts * 100 / max(1, len(query_fields))
+
+    # 5. 벡터 거리 기반 점수 (거리가 작을수록 유사도 높음, 최대 40점)
+    distances = np.array([doc.get("distance", 0) for doc in documents], dtype=np.float64)
+    vector_score = np.maximum(0, 1 - distances) * 40
+
+    # 6. 가중치 합산 (기존과 같은 연산 순서)
+    total_score = (alert_similarity * 100 * ALERT_WEIGHT
+                   + analysis_similarity * 100 * ANALYSIS_WEIGHT
+                   + reception_similarity * 100 * RECEPTION_WEIGHT
+                   + code_match_ratio * 100 * CODE_WEIGHT
+                   + field_match_score * FIELD_WEIGHT
+                   + (vector_score * VECTOR_WEIGHT))
+
+    # 7. 높은 유사도 보정 및 범위 제한
+    total_score = np.where(alert_similarity > 0.9, np.maximum(total_score, 85), total_score)
+    total_score = np.where((alert_similarity > 0.8) & (analysis_similarity > 0.7),
+                           np.maximum(total_score, 80), total_score)
+    total_score = np.where(code_match_ratio > 0.7, np.maximum(total_score, 75), total_score)
+    total_score = np.clip(total_score, MIN_SCORE, MAX_SCORE)
+    total_score = np.where(exact_match, EXACT_MATCH_SCORE, total_score)
+
+    return total_score.tolist()
+
+
+def get_rerank_executor() -> ThreadPoolExecutor:
+    """재순위 전용 스레드 풀 조회"""
+    return _executor
+
+
+async def score_documents_async(query: str, documents: List[Dict]) -> List[float]:
+    """후보 문서 점수 계산 (스레드 풀에서 실행, 이벤트 루프 비차단)"""
+    if not documents:
+        return []
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_rerank_executor(), score_documents, query, documents)
@@ -0,0 +1,63 @@
+"""
+지연 생성 공유 인스턴스 모듈
+
+생성 비용이 있거나(모델/DB/소켓) 환경변수 설정이 필요한 객체를 최초 조회 시 한 번만 생성합니다.
+이중 확인 잠금으로 여러 요청 스레드가 동시에 조회해도 인스턴스는 하나만 만들어집니다.
+
+- LazyInstance: 프로세스당 1개
+- LazyInstanceMap: 키(모델명, 파일 경로, 서버 주소 등)별 1개
+"""
+
+import threading
+from typing import Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyInstance(Generic[T]):
+    """최초 조회 시 factory()로 생성하는 공유 인스턴스"""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def set(self, instance: T) -> T:
+        """인스턴스 교체 (백엔드 전환 / 테스트용)"""
+        with self._lock:
+            self._instance = instance
+        return instance
+
+
+class LazyInstanceMap(Generic[T]):
+    """키별로 최초 조회 시 factory(key, **options)로 생성하는 공유 인스턴스"""
+
+    def __init__(self, factory: Callable[..., T]):
+        self._factory = factory
+        self._instances: Dict[Hashable, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, **options) -> T:
+        """키의 인스턴스 조회 (이미 있으면 options는 무시)"""
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    instance = self._factory(key, **options)
+                    self._instances[key] = instance
+        return instance
+
+    def pop_all(self) -> List[T]:
+        """모든 인스턴스를 꺼내고 비움 (종료 처리용)"""
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+        return instances
@@ -0,0 +1,335 @@
+"""
+장애사례 어휘(lexical) 색인 모듈
+
+벡터 검색만으로는 놓치는 사례(STM64_LOS, A6220 같은 경보 코드가 정확히 일치하지만
+임베딩 거리가 먼 사례)를 찾기 위해 장애사례 전체를 프로세스 메모리에 색인합니다.
+
+- 원본: 활성 벡터DB 버전에 적재된 사례 스냅샷 (vector_db_versions.find_case_snapshot)
+  스냅샷이 없는 이전 버전/기존 경로면 RAG_DOCUMENT (두 검색이 같은 사례 집합을 보도록 버전을 따라감)
+- 로딩/갱신은 백그라운드 스레드에서 수행 (검색 요청은 기존 색인으로 계속 처리)
+- BM25: normalize_text 토큰 기준 (장애명/경보현황/장애접수내역/장애분석/장애점/조치내역)
+- 경보 코드 역색인: 경보현황에서 추출한 코드 → 장애번호 (희귀 코드일수록 높은 점수)
+- 사례 단위 증분 갱신: 내용 해시가 바뀐 사례만 다시 색인, 삭제된 사례는 제거
+- reciprocal_rank_fusion으로 벡터 검색 결과와 결합
+"""
+
+import os
+import json
+import math
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .fault_case_loader import iter_fault_cases
+from .fault_prediction_utils import ALERT_CODE_PATTERNS, normalize_text
+from .lazy_instance import LazyInstance
+from .vector_db_versions import find_case_snapshot, resolve_active_db_dir
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+RAG_DOCUMENT = os.getenv("RAG_DOCUMENT", r"D:\aidetector\static\rag_document\rag_data.json")
+LEXICAL_REFRESH_INTERVAL = int(os.getenv("LEXICAL_REFRESH_INTERVAL", "60"))  # 원본(활성 버전/파일) 변경 확인 간격(초)
+LEXICAL_TEXT_FIELDS = ["장애명", "경보현황", "장애접수내역", "장애분석", "장애점", "조치내역"]
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60  # reciprocal rank fusion 상수
+
+LEXICAL_STATE_NOT_LOADED = "not_loaded"
+LEXICAL_STATE_LOADING = "loading"
+LEXICAL_STATE_READY = "ready"
+LEXICAL_STATE_FAILED = "failed"
+
+def extract_alert_code_set(text: str) -> set:
+    """경보 코드 전체 추출 (대문자/공백 정규화, 개수 제한 없음)"""
+    if not text:
+        return set()
+
+    codes = set()
+    for pattern in ALERT_CODE_PATTERNS:
+        codes.update(" ".join(code.upper().split()) for code in pattern.findall(text))
+    return codes
+
+
+def case_content_hash(fault_case: Dict) -> str:
+    """장애사례 내용 해시 (증분 갱신 판단용)"""
+    return hashlib.sha1(
+        json.dumps(fault_case, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List], k=RRF_K, limit=None) -> List:
+    """
+    순위 목록들을 reciprocal rank fusion으로 결합
+
+    Args:
+        rankings: 장애번호 순위 목록들 (앞쪽일수록 상위)
+
+    Returns:
+        list: 결합 점수 순 장애번호 (동점이면 먼저 등장한 순서)
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+
+    fused = sorted(scores, key=lambda item: -scores[item])
+    return fused[:limit] if limit else fused
+
+
+class LexicalIndex:
+    """장애사례 BM25 + 경보 코드 역색인 (스레드 안전)"""
+
+    def __init__(self, path=None, refresh_interval=LEXICAL_REFRESH_INTERVAL):
+        self.path = path  # 고정 원본 파일 (None이면 활성 벡터DB 버전을 따라감)
+        self.refresh_interval = refresh_interval
+
+        self._postings = defaultdict(dict)  # 토큰 → {장애번호: tf}
+        self._code_postings = defaultdict(set)  # 경보 코드 → {장애번호}
+        self._cases = {}  # 장애번호 → {"hash", "field", "length", "tokens", "codes"}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+        self.source_path = None  # 현재 색인된 원본 파일
+        self.version = None  # 현재 색인된 벡터DB 버전
+        self.state = LEXICAL_STATE_NOT_LOADED
+        self.error = None
+        self.loaded_at = None
+        self._file_mtime = None
+        self._checked_at = 0.0
+        self._load_lock = threading.Lock()  # load는 한 번에 하나만
+        self._refreshing = False
+
+    # 색인 갱신
+
+    def add_case(self, fault_case: Dict) -> bool:
+        """사례 추가/갱신 (내용이 같으면 무시, 변경 여부 반환)"""
+        fault_number = fault_case.get("장애번호")
+        if fault_number in (None, ""):
+            return False
+
+        content_hash = case_content_hash(fault_case)
+        text = "\n".join(str(fault_case.get(key) or "") for key in LEXICAL_TEXT_FIELDS)
+        tokens = Counter(normalize_text(text).split())
+        codes = extract_alert_code_set(str(fault_case.get("경보현황") or ""))
+
+        with self._lock:
+            existing = self._cases.get(fault_number)
+            if existing and existing["hash"] == content_hash:
+                return False
+            if existing:
+                self._remove_locked(fault_number)
+
+            for token, tf in tokens.items():
+                self._postings[token][fault_number] = tf
+            for code in codes:
+                self._code_postings[code].add(fault_number)
+
+            length = sum(tokens.values())
+            self._cases[fault_number] = {
+                "hash": content_hash,
+                "field": fault_case.get("장애분야", ""),
+                "length": length,
+                "tokens": list(tokens),
+                "codes": codes,
+            }
+            self._total_length += length
+        return True
+
+    def remove_case(self, fault_number) -> bool:
+        """사례 제거"""
+        with self._lock:
+            if fault_number not in self._cases:
+                return False
+            self._remove_locked(fault_number)
+        return True
+
+    def _remove_locked(self, fault_number):
+        case = self._cases.pop(fault_number)
+        self._total_length -= case["length"]
+
+        for token in case["tokens"]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(fault_number, None)
+                if not postings:
+                    del self._postings[token]
+        for code in case["codes"]:
+            postings = self._code_postings.get(code)
+            if postings is not None:
+                postings.discard(fault_number)
+                if not postings:
+                    del self._code_postings[code]
+
+    def sync_cases(self, fault_cases: Iterable[Dict]) -> Dict:
+        """사례 목록(스트림 가능)과 색인 동기화 (추가/변경분만 색인, 목록에 없는 사례 제거)"""
+        start = time.time()
+        seen = set()
+        changed = 0
+        for fault_case in fault_cases:
+            seen.add(fault_case.get("장애번호"))
+            if self.add_case(fault_case):
+                changed += 1
+
+        with self._lock:
+            removed = [fault_number for fault_number in self._cases if fault_number not in seen]
+            for fault_number in removed:
+                self._remove_locked(fault_number)
+
+        result = {"cases": len(self._cases), "changed": changed, "removed": len(removed)}
+        logger.info(f"어휘 색인 동기화: {result} ({time.time() - start:.2f}초)")
+        return result
+
+    def resolve_source(self) -> Tuple[Optional[str], str]:
+        """
+        색인 원본 파일 조회
+
+        Returns:
+            tuple: (벡터DB 버전, 원본 파일), 고정 경로거나 활성 버전에 사례 스냅샷이 없으면 RAG_DOCUMENT 사용
+        """
+        if self.path:
+            return None, self.path
+
+        version, db_dir = resolve_active_db_dir()
+        snapshot = find_case_snapshot(db_dir) if db_dir else None
+        return version, snapshot or RAG_DOCUMENT
+
+    def load(self, force=False) -> bool:
+        """원본(.json 배열 또는 .jsonl) 스트리밍 로드 (원본 파일이 바뀌거나 수정된 경우에만 동기화, 호출 스레드에서 실행)"""
+        with self._load_lock:
+            self._checked_at = time.monotonic()
+            version, path = self.resolve_source()
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                self._load_failed(f"어휘 색인 원본 파일을 찾을 수 없습니다: {path}")
+                return False
+
+            if not force and path == self.source_path and mtime == self._file_mtime:
+                return False
+
+            if self.state != LEXICAL_STATE_READY:
+                self.state = LEXICAL_STATE_LOADING
+            try:
+                self.sync_cases(iter_fault_cases(path))
+            except (OSError, ValueError) as e:
+                self._load_failed(f"어휘 색인 원본 파일 로드 오류 ({path}): {e}")
+                return False
+
+            if path != self.source_path:
+                logger.info(f"어휘 색인 원본: {path} (벡터DB 버전: {version})")
+            self.source_path, self.version, self._file_mtime = path, version, mtime
+            self.state = LEXICAL_STATE_READY
+            self.error = None
+            self.loaded_at = time.time()
+            return True
+
+    def _load_failed(self, message):
+        """로드 실패 기록 (이미 색인된 내용이 있으면 그대로 사용)"""
+        logger.error(message)
+        self.error = message
+        if self.state != LEXICAL_STATE_READY:
+            self.state = LEXICAL_STATE_FAILED
+
+    def refresh_async(self, force=False) -> bool:
+        """백그라운드 스레드에서 load (이미 진행 중이면 무시, 시작 여부 반환)"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            self._checked_at = time.monotonic()
+
+        def run():
+            try:
+                self.load(force)
+            except Exception as e:
+                self._load_failed(f"어휘 색인 갱신 실패: {type(e).__name__}: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="LexicalIndexRefresh", daemon=True).start()
+        return True
+
+    def refresh_if_stale(self):
+        """refresh_interval마다 원본 변경 확인 (재색인은 백그라운드에서 수행하여 검색 요청을 막지 않음)"""
+        if time.monotonic() - self._checked_at >= self.refresh_interval:
+            self.refresh_async()
+
+    # 검색
+
+    def search_bm25(self, query: str, limit=20, fields: Optional[set] = None) -> List[Tuple[object, float]]:
+        """BM25 검색 (fields 지정 시 해당 장애분야 사례만)"""
+        query_tokens = set(normalize_text(query).split())
+
+        with self._lock:
+            case_count = len(self._cases)
+            if not case_count or not query_tokens:
+                return []
+            avg_length = self._total_length / case_count
+
+            scores = defaultdict(float)
+            for token in query_tokens:
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (case_count - df + 0.5) / (df + 0.5))
+                for fault_number, tf in postings.items():
+                    length = self._cases[fault_number]["length"]
+                    scores[fault_number] += idf * tf * (BM25_K1 + 1) / (
+                        tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+
+            return self._top(scores, limit, fields)
+
+    def search_codes(self, query: str, limit=20, fields: Optional[set] = None) -> List[Tuple[object, float]]:
+        """경보 코드 역색인 검색 (일치 코드의 idf 합, fields 지정 시 해당 장애분야 사례만)"""
+        codes = extract_alert_code_set(query)
+
+        with self._lock:
+            case_count = len(self._cases)
+            scores = defaultdict(float)
+            for code in codes:
+                postings = self._code_postings.get(code)
+                if not postings:
+                    continue
+                idf = math.log(1 + case_count / len(postings))
+                for fault_number in postings:
+                    scores[fault_number] += idf
+
+            return self._top(scores, limit, fields)
+
+    def _top(self, scores, limit, fields):
+        if fields:
+            scores = {fault_number: score for fault_number, score in scores.items()
+                      if self._cases[fault_number]["field"] in fields}
+        return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+
+    def stats(self) -> Dict:
+        """색인 통계"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "cases": len(self._cases),
+                "tokens": len(self._postings),
+                "codes": len(self._code_postings),
+                "path": self.source_path or self.path,
+                "version": self.version,
+                "loaded_at": self.loaded_at,
+                "error": self.error,
+            }
+
+
+def _create_lexical_index() -> LexicalIndex:
+    index = LexicalIndex()
+    index.refresh_async()
+    return index
+
+
+_lexical_index = LazyInstance(_create_lexical_index)
+
+
+def get_lexical_index() -> LexicalIndex:
+    """장애사례 어휘 색인 조회 (프로세스당 1개, 최초 조회 시 백그라운드 로딩 시작)"""
+    return _lexical_index.get()
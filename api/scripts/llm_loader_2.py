@@ -1,20 +1,47 @@
 """
 LLM 모델 로딩 모듈 - 초기 1회만 로드되고 파이프라인을 전역 재사용
+
+모델 로딩(polyglot-ko-1.3b, CPU fp32)은 수십 초가 걸리므로 앱 임포트를 막지 않도록 백그라운드 스레드에서 수행합니다.
+상태: not_loaded → loading → ready / failed (failed는 LLM_RETRY_INTERVAL 이후 다시 요청하면 재시도)
+
+- LLM_LOAD_MODE=background (기본): 앱 시작 시 백그라운드 로딩 시작, /health_check는 즉시 응답하고 /ready로 준비 여부 확인
+- LLM_LOAD_MODE=eager: 기존 방식 (앱 시작 시 로딩 완료까지 대기)
+- LLM_LOAD_MODE=lazy: LLM이 필요한 첫 요청 또는 첫 /ready 확인에서 백그라운드 로딩 시작
 """
 
-import torch
+import os
 import time
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
-from functools import lru_cache
+import threading
+import traceback
+
+# 상수 정의
+LLM_MODEL_NAME = "EleutherAI/polyglot-ko-1.3b"
+LLM_LOAD_MODE = os.getenv("LLM_LOAD_MODE", "background")  # background | eager | lazy
+LLM_RETRY_INTERVAL = int(os.getenv("LLM_RETRY_INTERVAL", "60"))  # 로딩 실패 후 재시도 최소 간격(초)
+LLM_REQUEST_WAIT_SECONDS = float(os.getenv("LLM_REQUEST_WAIT_SECONDS", "5"))  # 요청에서 모델 준비를 기다리는 최대 시간
+
+LLM_STATE_NOT_LOADED = "not_loaded"
+LLM_STATE_LOADING = "loading"
+LLM_STATE_READY = "ready"
+LLM_STATE_FAILED = "failed"
 
 # ✅ 글로벌 파이프라인 변수 (직접 사용은 금지, 내부에서만 관리)
 _global_llm_pipe = None
+_llm_state = LLM_STATE_NOT_LOADED
+_llm_model_name = LLM_MODEL_NAME
+_llm_error = None
+_llm_started_at = None  # 마지막 로딩 시작 시각 (time.time)
+_llm_finished_at = None  # 마지막 로딩 종료(성공/실패) 시각
+_llm_lock = threading.Lock()
+_llm_ready = threading.Event()
 
 
-def _load_llm_pipeline(model_name="EleutherAI/polyglot-ko-1.3b"):
+def _load_llm_pipeline(model_name=LLM_MODEL_NAME):
     """
     내부용: LLM 파이프라인을 로딩하는 함수. 전역 변수에 저장.
 
+    torch/transformers 임포트도 수 초가 걸리므로 로딩 시점에 임포트합니다.
+
     Args:
         model_name (str): 사용할 모델명
 
@@ -29,6 +56,9 @@ def _load_llm_pipeline(model_name="EleutherAI/polyglot-ko-1.3b"):
 
     print("🚀 [LLM] 모델 로딩 중...")
 
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+
     tokenizer = AutoTokenizer.from_pretrained(model_name)
     model = AutoModelForCausalLM.from_pretrained(
         model_name,
@@ -46,24 +76,124 @@ def _load_llm_pipeline(model_name="EleutherAI/polyglot-ko-1.3b"):
     return pipe
 
 
-def initialize_llm(model_name="EleutherAI/polyglot-ko-1.3b"):
+def _background_load(model_name):
+    """백그라운드 로딩 스레드 본문 (상태 갱신)"""
+    global _llm_state, _llm_error, _llm_finished_at
+
+    try:
+        _load_llm_pipeline(model_name)
+    except Exception as e:
+        with _llm_lock:
+            _llm_state = LLM_STATE_FAILED
+            _llm_error = f"{type(e).__name__}: {e}"
+            _llm_finished_at = time.time()
+        print(f"🔥 [LLM] 모델 로딩 실패 ({time.time() - _llm_started_at:.2f}초): {_llm_error}")
+        print(traceback.format_exc())
+        return
+
+    with _llm_lock:
+        _llm_state = LLM_STATE_READY
+        _llm_error = None
+        _llm_finished_at = time.time()
+    _llm_ready.set()
+    print(f"✅ [LLM] 초기화 완료 (소요 시간: {_llm_finished_at - _llm_started_at:.2f}초)")
+
+
+def start_llm_loading(model_name=LLM_MODEL_NAME) -> str:
     """
-    애플리케이션 시작 시 LLM 파이프라인을 초기화하는 함수 (명시적 초기화)
+    백그라운드 로딩 시작 (이미 로딩 중/완료면 무시, 실패 후 LLM_RETRY_INTERVAL이 지났으면 재시도)
+
+    Returns:
+        str: 호출 후 상태
     """
-    start = time.time()
-    _load_llm_pipeline(model_name)
-    print(f"✅ [LLM] 초기화 완료 (소요 시간: {time.time() - start:.2f}초)")
+    global _llm_state, _llm_model_name, _llm_started_at
+
+    with _llm_lock:
+        if _llm_state in (LLM_STATE_LOADING, LLM_STATE_READY):
+            return _llm_state
+        if _llm_state == LLM_STATE_FAILED and time.time() - (_llm_finished_at or 0) < LLM_RETRY_INTERVAL:
+            return _llm_state
+
+        _llm_state = LLM_STATE_LOADING
+        _llm_model_name = model_name
+        _llm_started_at = time.time()
+        threading.Thread(target=_background_load, args=(model_name,), name="LLMLoader", daemon=True).start()
+        return _llm_state
 
 
-@lru_cache(maxsize=1)
-def get_llm_pipeline():
+def initialize_llm(model_name=LLM_MODEL_NAME, timeout=None):
     """
-    외부에서 사용하는 LLM 파이프라인 제공 함수 (자동 초기화 포함)
+    LLM 파이프라인을 초기화하는 함수 (명시적 초기화, 로딩 완료까지 대기)
 
     Returns:
-        transformers.pipeline: LLM 텍스트 생성용 파이프라인
+        bool: 준비 완료 여부 (실패 또는 timeout 초과 시 False)
     """
-    return _load_llm_pipeline()
+    start_llm_loading(model_name)
+    return wait_for_llm(timeout)
+
+
+def wait_for_llm(timeout=None) -> bool:
+    """로딩 완료까지 대기 (실패하면 바로 False)"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not _llm_ready.is_set():
+        if _llm_state in (LLM_STATE_FAILED, LLM_STATE_NOT_LOADED):
+            return False
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return False
+        _llm_ready.wait(0.5 if remaining is None else min(0.5, remaining))
+    return True
+
+
+def get_llm_status() -> dict:
+    """LLM 로딩 상태 (readiness 응답용)"""
+    with _llm_lock:
+        now = time.time()
+        return {
+            'state': _llm_state,
+            'model': _llm_model_name,
+            'load_mode': LLM_LOAD_MODE,
+            'error': _llm_error,
+            'started_at': _llm_started_at,
+            'elapsed_seconds': round((_llm_finished_at or now) - _llm_started_at, 2) if _llm_started_at else None,
+        }
+
+
+def get_llm_pipeline(timeout=0):
+    """
+    외부에서 사용하는 LLM 파이프라인 제공 함수
+
+    준비되지 않았으면 백그라운드 로딩을 시작하고 timeout초까지만 기다립니다 (요청 스레드를 막지 않음).
+
+    Returns:
+        transformers.pipeline: LLM 텍스트 생성용 파이프라인, 준비 전이거나 실패하면 None
+    """
+    if _llm_state != LLM_STATE_READY:
+        start_llm_loading(_llm_model_name)
+        if not timeout or not wait_for_llm(timeout):
+            return None
+    return _global_llm_pipe
+
+
+def _reset_after_fork():
+    """
+    fork된 워커(gunicorn --preload 등)에서 로딩 스레드 상태 정리
+
+    부모에서 로딩이 끝났으면 파이프라인을 그대로 물려받고,
+    로딩 중이었으면 스레드는 복제되지 않으므로 워커에서 다시 시작합니다.
+    """
+    global _llm_lock, _llm_ready, _llm_state
+
+    _llm_lock = threading.Lock()
+    if not _llm_ready.is_set():
+        _llm_ready = threading.Event()
+    if _llm_state == LLM_STATE_LOADING:
+        _llm_state = LLM_STATE_NOT_LOADED
+        start_llm_loading(_llm_model_name)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 # 독립 실행 시 테스트용
@@ -6,13 +6,18 @@ import time
 from typing import List, Dict, Any
 
 # LLM 파이프라인 가져오기
-from api.scripts.llm_loader_2 import get_llm_pipeline
+from api.scripts.llm_loader_2 import LLM_REQUEST_WAIT_SECONDS, get_llm_pipeline, get_llm_status
 
 def generate_response_with_llm(query: str, retrieved_results: list, user_query_type: str = "general", max_tokens: int = 256):
     import textwrap
 
     start_time = time.time()
-    pipe = get_llm_pipeline()
+    pipe = get_llm_pipeline(timeout=LLM_REQUEST_WAIT_SECONDS)
+    if pipe is None:
+        # 모델 로딩 중/실패: 요청을 막지 않고 안내 문구 반환 (로딩은 백그라운드에서 계속)
+        status = get_llm_status()
+        print(f"LLM 미준비로 응답 생략 (상태: {status['state']}, 오류: {status['error']})")
+        return "LLM 모델을 준비 중입니다. 잠시 후 다시 시도해주세요. (유사 장애사례 검색 결과는 그대로 확인할 수 있습니다)"
 
     # 문맥 정리
     context_blocks = []
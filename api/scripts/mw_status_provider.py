@@ -0,0 +1,282 @@
+"""
+MW 장비 상태 조회 모듈 - MW 장비 SNMP 상태를 프로세스 내부에서 직접 조회
+
+/api/check_mw_status 라우트와 InferFailurePoint(2단계 MW 분석)가 같은 제공자를 호출합니다.
+(같은 서버로 HTTP 요청을 다시 보내지 않음)
+
+- sample: 임시 테스트용 고정 응답 (기본값)
+- zmq: 소켓 서버(ZMQ)로 MW 장비 SNMP 상태 요청 (mw_zmq_poller, 장비별 동시 요청)
+"""
+
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Dict
+
+from .lazy_instance import LazyInstance
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+MW_STATUS_BACKEND = os.getenv("MW_STATUS_BACKEND", "sample")
+MW_SOCKET_SERVER = os.getenv("MW_SOCKET_SERVER", "tcp://192.168.147.78:5555")
+MW_SOCKET_TIMEOUT_MS = int(os.getenv("MW_SOCKET_TIMEOUT_MS", "10000"))  # 장비별 응답 타임아웃
+
+# 임시 테스트용 MW 상태 응답
+SAMPLE_MW_STATUS_RESPONSE = '''[
+    {
+        "id": 209,
+        "equip_type": "IP-20",
+        "data": {
+            "interfaces": {
+                "Radio: Slot 3, Port 1": {
+                    "RSL": {
+                        "value": "-45",
+                        "min": "0",
+                        "max": "-99",
+                        "threshold": "-50"
+                    },
+                    "TSL": {
+                        "value": "22",
+                        "min": "1",
+                        "max": "22",
+                        "threshold": "25"
+                    },
+                    "SNR": {
+                        "value": "39.98",
+                        "min": "39.31",
+                        "max": "40.21",
+                        "threshold": "34"
+                    },
+                    "XPI": {
+                        "value": "0",
+                        "min": "0",
+                        "max": "0",
+                        "threshold": "15"
+                    },
+                    "ERR": {
+                        "BER": "13",
+                        "ES": "0",
+                        "SES": "0",
+                        "UAS": "0",
+                        "BBE": "0"
+                    }
+                },
+                "Radio: Slot 4, Port 1": {
+                    "RSL": {
+                        "value": "-99",
+                        "min": "0",
+                        "max": "-99",
+                        "threshold": "-50"
+                    },
+                    "TSL": {
+                        "value": "0",
+                        "min": "-50",
+                        "max": "50",
+                        "threshold": "25"
+                    },
+                    "SNR": {
+                        "value": "99.0",
+                        "min": "error",
+                        "max": "error",
+                        "threshold": "34"
+                    },
+                    "XPI": {
+                        "value": "9900",
+                        "min": "error",
+                        "max": "error",
+                        "threshold": "15"
+                    },
+                    "ERR": {
+                        "BER": "0",
+                        "ES": "error",
+                        "SES": "error",
+                        "UAS": "error",
+                        "BBE": "error"
+                    }
+                },
+                "Radio: Slot 5, Port 1": {
+                    "RSL": {
+                        "value": "-45",
+                        "min": "0",
+                        "max": "-99",
+                        "threshold": "-50"
+                    },
+                    "TSL": {
+                        "value": "22",
+                        "min": "1",
+                        "max": "22",
+                        "threshold": "25"
+                    },
+                    "SNR": {
+                        "value": "41.01",
+                        "min": "40.06",
+                        "max": "41.14",
+                        "threshold": "34"
+                    },
+                    "XPI": {
+                        "value": "0",
+                        "min": "0",
+                        "max": "0",
+                        "threshold": "15"
+                    },
+                    "ERR": {
+                        "BER": "13",
+                        "ES": "0",
+                        "SES": "0",
+                        "UAS": "0",
+                        "BBE": "0"
+                    }
+                },
+                "Radio: Slot 6, Port 1": {
+                    "RSL": {
+                        "value": "-45",
+                        "min": "0",
+                        "max": "-99",
+                        "threshold": "-50"
+                    },
+                    "TSL": {
+                        "value": "22",
+                        "min": "1",
+                        "max": "22",
+                        "threshold": "25"
+                    },
+                    "SNR": {
+                        "value": "40.11",
+                        "min": "39.11",
+                        "max": "40.26",
+                        "threshold": "34"
+                    },
+                    "XPI": {
+                        "value": "0",
+                        "min": "0",
+                        "max": "0",
+                        "threshold": "15"
+                    },
+                    "ERR": {
+                        "BER": "13",
+                        "ES": "0",
+                        "SES": "0",
+                        "UAS": "0",
+                        "BBE": "0"
+                    }
+                }
+            },
+            "VOLT": {
+                "value": "45",
+                "min": "50",
+                "max": "51",
+                "threshold": "38"
+            }
+        },
+        "get_datetime": "2025-06-10 16:20:39"
+    }
+]'''
+
+class MwStatusError(Exception):
+    """MW 상태 조회 실패"""
+
+
+class MwStatusTimeout(MwStatusError):
+    """MW 상태 조회 응답 타임아웃"""
+
+
+class MwStatusProvider(ABC):
+    """MW 장비 상태 제공자 인터페이스"""
+
+    name = "base"
+
+    @abstractmethod
+    def check_status(self, guksa_id, equipment_list: List[Dict]) -> List[Dict]:
+        """
+        MW 장비 SNMP 상태 조회
+
+        Args:
+            guksa_id: 국사 ID
+            equipment_list (list): TblSnmpInfo 기반 장비 목록 (id, snmp_ip, community, equip_type, equip_name)
+
+        Returns:
+            list: 장비별 상태 목록 [{"id", "equip_type", "data": {"interfaces", "VOLT"}, "get_datetime"}]
+        """
+
+
+class SampleMwStatusProvider(MwStatusProvider):
+    """임시 테스트용 고정 응답 제공자"""
+
+    name = "sample"
+
+    def check_status(self, guksa_id, equipment_list: List[Dict]) -> List[Dict]:
+        return json.loads(SAMPLE_MW_STATUS_RESPONSE)
+
+
+class ZmqMwStatusProvider(MwStatusProvider):
+    """ZMQ 소켓 서버를 통한 MW 상태 제공자 (장비별 fan-out, 공용 DEALER 폴러 재사용)"""
+
+    name = "zmq"
+
+    def __init__(self, server=MW_SOCKET_SERVER, timeout_ms=MW_SOCKET_TIMEOUT_MS, max_in_flight=None):
+        from .mw_zmq_poller import MW_POLL_MAX_IN_FLIGHT, get_mw_zmq_poller
+
+        self.server = server
+        self.timeout_ms = timeout_ms
+        self.poller = get_mw_zmq_poller(
+            server, max_in_flight=max_in_flight or MW_POLL_MAX_IN_FLIGHT, timeout_ms=timeout_ms)
+
+    def check_status(self, guksa_id, equipment_list: List[Dict]) -> List[Dict]:
+        logger.info(f">> 소켓 서버로 MW 상태 요청 전송: {len(equipment_list)}개 장비")
+
+        results, failures = self.poller.poll_devices(guksa_id, equipment_list, self.timeout_ms)
+
+        for failure in failures:
+            logger.warning(
+                f"MW 장비 상태 조회 실패: id={failure['id']}, 장비={failure['equip_name']}, {failure['error']}")
+
+        # 전체 실패일 때만 오류, 일부 실패는 성공한 장비 결과만 반환
+        if equipment_list and not results:
+            if all(failure['timeout'] for failure in failures):
+                raise MwStatusTimeout("소켓 서버 응답 타임아웃")
+            raise MwStatusError(f"소켓 서버 통신 실패: {failures[0]['error']}")
+
+        return results
+
+
+# 백엔드 이름 → 제공자 클래스
+MW_STATUS_PROVIDERS = {
+    SampleMwStatusProvider.name: SampleMwStatusProvider,
+    ZmqMwStatusProvider.name: ZmqMwStatusProvider,
+}
+
+
+def create_mw_status_provider(backend=None, **options) -> MwStatusProvider:
+    """백엔드 이름으로 MW 상태 제공자 생성"""
+    backend = backend or MW_STATUS_BACKEND
+
+    if backend not in MW_STATUS_PROVIDERS:
+        raise ValueError(f"지원하지 않는 MW 상태 백엔드: {backend}")
+
+    return MW_STATUS_PROVIDERS[backend](**options)
+
+
+def _create_default_provider() -> MwStatusProvider:
+    provider = create_mw_status_provider()
+    logger.info(f"MW 상태 제공자 초기화: {provider.name}")
+    return provider
+
+
+_provider = LazyInstance(_create_default_provider)  # zmq 백엔드는 생성 시 폴러 소켓을 열므로 최초 조회 시 생성
+
+
+def get_mw_status_provider() -> MwStatusProvider:
+    """MW 상태 제공자 조회 (프로세스당 1개)"""
+    return _provider.get()
+
+
+def set_mw_status_provider(provider: MwStatusProvider):
+    """MW 상태 제공자 교체 (백엔드 전환 / 테스트용)"""
+    return _provider.set(provider)
+
+
+def check_mw_status(guksa_id, equipment_list: List[Dict]) -> List[Dict]:
+    """현재 설정된 제공자로 MW 장비 상태 조회"""
+    return get_mw_status_provider().check_status(guksa_id, equipment_list)
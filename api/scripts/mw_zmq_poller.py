@@ -0,0 +1,297 @@
+"""
+MW 장비 SNMP 폴링 ZMQ 클라이언트 모듈
+
+하나의 DEALER 소켓과 I/O 스레드를 재사용하여 MW 장비별 요청을 동시에 보냅니다.
+
+- 요청마다 request_id를 봉투 프레임으로 붙여 응답 순서와 무관하게 매칭
+  (DEALER → REP/ROUTER 서버 모두 [request_id, b"", payload] 봉투를 그대로 돌려줌)
+- 장비 단위 fan-out + 동시 요청 수 제한(max_in_flight)
+- 요청별 타임아웃, 느린 장비가 있어도 나머지 장비 결과는 그대로 반환(부분 결과)
+"""
+
+import os
+import json
+import time
+import uuid
+import heapq
+import socket
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Dict, Tuple
+
+# pip install pyzmq
+import zmq
+
+from .lazy_instance import LazyInstanceMap
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+MW_POLL_MAX_IN_FLIGHT = int(os.getenv("MW_POLL_MAX_IN_FLIGHT", "16"))  # 동시 요청 수 제한
+MW_POLL_TIMEOUT_MS = int(os.getenv("MW_POLL_TIMEOUT_MS", "10000"))  # 장비별 응답 타임아웃
+
+
+class MwPollTimeout(Exception):
+    """장비 응답 타임아웃"""
+
+
+class MwPollError(Exception):
+    """폴러 통신 실패"""
+
+
+class MwZmqPoller:
+    """DEALER 소켓 기반 MW SNMP 폴링 클라이언트 (스레드 안전)"""
+
+    def __init__(self, server, max_in_flight=MW_POLL_MAX_IN_FLIGHT, timeout_ms=MW_POLL_TIMEOUT_MS,
+                 context=None):
+        self.server = server
+        self.max_in_flight = max_in_flight
+        self.timeout_ms = timeout_ms
+        self.context = context or zmq.Context.instance()
+
+        # 제출 대기열 (호출 스레드 → I/O 스레드)
+        self._submit_queue = deque()
+        self._submit_lock = threading.Lock()
+
+        # I/O 스레드 깨우기용 소켓 쌍 (Windows에서도 zmq.Poller로 감시 가능)
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._io_loop, name=f"MwZmqPoller-{server}", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload, timeout_ms=None) -> Future:
+        """요청 비동기 제출 (응답 JSON 또는 MwPollTimeout/MwPollError를 담은 Future 반환)"""
+        if self._closed:
+            raise MwPollError("폴러가 종료되었습니다.")
+
+        future = Future()
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        request_id = uuid.uuid4().hex.encode()
+        message = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+        with self._submit_lock:
+            self._submit_queue.append((request_id, message, deadline, future))
+        self._wake()
+
+        return future
+
+    def request(self, payload, timeout_ms=None):
+        """단일 요청 (응답까지 대기)"""
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+        future = self.submit(payload, timeout_ms)
+        try:
+            return future.result(timeout=timeout_ms / 1000.0 + 1.0)
+        except FutureTimeoutError:
+            raise MwPollTimeout("소켓 서버 응답 타임아웃")
+
+    def poll_devices(self, guksa_id, equipment_list: List[Dict], timeout_ms=None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        장비별 요청 fan-out 후 결과 수집
+
+        Returns:
+            tuple: (장비 상태 목록, 실패 목록 [{"id", "equip_name", "error", "timeout"}])
+        """
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+
+        futures = []
+        for equipment in equipment_list:
+            payload = {
+                "guksa_id": guksa_id,
+                "data": [equipment]
+            }
+            futures.append((equipment, self.submit(payload, timeout_ms)))
+
+        # I/O 스레드가 deadline 기준으로 만료시키므로 여유 시간만 더해 대기
+        wait([future for _, future in futures], timeout=timeout_ms / 1000.0 + 1.0)
+
+        results = []
+        failures = []
+        for equipment, future in futures:
+            try:
+                response = future.result(timeout=0)
+                if isinstance(response, list):
+                    results.extend(response)
+                else:
+                    results.append(response)
+            except (MwPollTimeout, FutureTimeoutError):
+                failures.append({
+                    "id": equipment.get('id'),
+                    "equip_name": equipment.get('equip_name'),
+                    "error": "소켓 서버 응답 타임아웃",
+                    "timeout": True,
+                })
+            except Exception as e:
+                failures.append({
+                    "id": equipment.get('id'),
+                    "equip_name": equipment.get('equip_name'),
+                    "error": str(e),
+                    "timeout": False,
+                })
+
+        if failures:
+            logger.warning(
+                f"MW 폴링 부분 결과: 성공 {len(equipment_list) - len(failures)}개, 실패 {len(failures)}개")
+
+        return results, failures
+
+    def close(self):
+        """I/O 스레드 종료 (대기 중인 요청은 MwPollError로 종료)"""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wake()
+        self._thread.join(timeout=5)
+
+        self._wake_send.close()
+        self._wake_recv.close()
+
+    def _wake(self):
+        try:
+            self._wake_send.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _drain_wake(self):
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _io_loop(self):
+        """DEALER 소켓 송수신 루프 (소켓은 이 스레드에서만 사용)"""
+        dealer = self.context.socket(zmq.DEALER)
+        dealer.setsockopt(zmq.LINGER, 0)
+        dealer.connect(self.server)
+
+        poller = zmq.Poller()
+        poller.register(dealer, zmq.POLLIN)
+        poller.register(self._wake_recv, zmq.POLLIN)
+
+        waiting = deque()  # 동시 요청 제한으로 아직 보내지 않은 요청
+        in_flight = {}  # request_id → (deadline, future)
+        deadlines = []  # (deadline, request_id) 힙
+
+        try:
+            while not self._closed:
+                # 제출된 요청 이동
+                with self._submit_lock:
+                    while self._submit_queue:
+                        waiting.append(self._submit_queue.popleft())
+
+                now = time.monotonic()
+
+                # 동시 요청 수 범위 안에서 전송
+                while waiting and len(in_flight) < self.max_in_flight:
+                    request_id, message, deadline, future = waiting.popleft()
+                    if deadline <= now:
+                        _set_timeout(future)
+                        continue
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    dealer.send_multipart([request_id, b"", message])
+                    in_flight[request_id] = (deadline, future)
+                    heapq.heappush(deadlines, (deadline, request_id))
+
+                # 대기열에서 만료된 요청 정리
+                if waiting:
+                    remaining = deque()
+                    for item in waiting:
+                        if item[2] <= now:
+                            _set_timeout(item[3])
+                        else:
+                            remaining.append(item)
+                    waiting = remaining
+
+                # 전송된 요청 중 만료된 요청 정리 (늦게 온 응답은 버림)
+                while deadlines and deadlines[0][0] <= now:
+                    _, request_id = heapq.heappop(deadlines)
+                    entry = in_flight.pop(request_id, None)
+                    if entry:
+                        _set_timeout(entry[1])
+
+                # 다음 만료 시각까지 대기 (최대 1초)
+                next_deadline = now + 1.0
+                if deadlines:
+                    next_deadline = min(next_deadline, deadlines[0][0])
+                if waiting:
+                    next_deadline = min(next_deadline, min(item[2] for item in waiting))
+                poll_ms = max(0, int((next_deadline - now) * 1000) + 1)
+                events = dict(poller.poll(poll_ms))
+
+                if self._wake_recv.fileno() in events or self._wake_recv in events:
+                    self._drain_wake()
+
+                if dealer in events:
+                    while True:
+                        try:
+                            frames = dealer.recv_multipart(zmq.NOBLOCK)
+                        except zmq.Again:
+                            break
+                        self._handle_reply(frames, in_flight)
+
+        except zmq.ZMQError as e:
+            logger.error(f"MW 폴러 소켓 오류: {str(e)}")
+        finally:
+            error = MwPollError("MW 폴러가 종료되었습니다.")
+            for _, future in in_flight.values():
+                if not future.done():
+                    future.set_exception(error)
+            with self._submit_lock:
+                waiting.extend(self._submit_queue)
+                self._submit_queue.clear()
+            for item in waiting:
+                if not item[3].done():
+                    item[3].set_exception(error)
+            dealer.close()
+
+    def _handle_reply(self, frames, in_flight):
+        """응답 프레임 [request_id, b"", payload] 처리"""
+        if len(frames) < 3:
+            logger.warning(f"MW 폴러: 잘못된 응답 프레임 {len(frames)}개")
+            return
+
+        entry = in_flight.pop(frames[0], None)
+        if entry is None:
+            # 이미 타임아웃 처리된 요청의 늦은 응답
+            return
+
+        future = entry[1]
+        try:
+            future.set_result(json.loads(frames[-1].decode('utf-8')))
+        except ValueError as e:
+            future.set_exception(MwPollError(f"응답 JSON 파싱 실패: {str(e)}"))
+
+
+def _set_timeout(future):
+    """취소되지 않은 요청만 타임아웃 처리"""
+    if not future.done():
+        future.set_exception(MwPollTimeout("소켓 서버 응답 타임아웃"))
+
+
+def _create_poller(server, **options) -> MwZmqPoller:
+    poller = MwZmqPoller(server, **options)
+    logger.info(f"MW 폴러 초기화: {server}")
+    return poller
+
+
+_pollers = LazyInstanceMap(_create_poller)
+
+
+def get_mw_zmq_poller(server, **options) -> MwZmqPoller:
+    """서버 주소별 MW 폴러 조회 (주소당 1개)"""
+    return _pollers.get(server, **options)
+
+
+def close_mw_zmq_pollers():
+    """모든 MW 폴러 종료"""
+    for poller in _pollers.pop_all():
+        poller.close()
@@ -0,0 +1,147 @@
+"""
+MW SNMP 소켓 서버 대역(stand-in) 모듈
+
+실제 MW 소켓 서버 없이 MW 폴러(MwZmqPoller)와 zmq 백엔드를 시험하기 위한 로컬 ZMQ 서버입니다.
+ROUTER 소켓으로 요청을 받아 장비마다 샘플 응답(id만 교체)을 돌려주며,
+장비별 응답 지연을 설정하여 느린 장비(타임아웃/부분 결과) 상황을 재현할 수 있습니다.
+
+실행: python -m api.scripts.mw_zmq_standin_server [--bind tcp://*:5555] [--delay 0.05] [--slow-ids 209 --slow-delay 30]
+"""
+
+import json
+import time
+import heapq
+import logging
+import argparse
+import threading
+
+# pip install pyzmq
+import zmq
+
+from .mw_status_provider import SAMPLE_MW_STATUS_RESPONSE
+
+logger = logging.getLogger(__name__)
+
+
+class MwStandInServer:
+    """MW 소켓 서버 대역 (ROUTER 소켓, 장비별 지연 응답)"""
+
+    def __init__(self, bind="tcp://127.0.0.1:*", delay=0.0, slow_ids=None, slow_delay=30.0, context=None):
+        self.bind = bind
+        self.delay = delay
+        self.slow_ids = set(slow_ids or [])
+        self.slow_delay = slow_delay
+        self.context = context or zmq.Context.instance()
+        self.endpoint = None
+        self.request_count = 0
+
+        self._sample = json.loads(SAMPLE_MW_STATUS_RESPONSE)[0]
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """백그라운드 스레드로 서버 시작 (바인딩된 endpoint 반환)"""
+        self._thread = threading.Thread(target=self.serve, name="MwStandInServer", daemon=True)
+        self._thread.start()
+        self._ready_event.wait(timeout=5)
+        return self.endpoint
+
+    def stop(self):
+        """서버 종료"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def build_response(self, equipment_list):
+        """장비 목록에 대한 샘플 응답 생성"""
+        response = []
+        for equipment in equipment_list:
+            item = dict(self._sample)
+            item['id'] = equipment.get('id')
+            item['equip_type'] = equipment.get('equip_type', item['equip_type'])
+            response.append(item)
+        return response
+
+    def get_delay(self, equipment_list):
+        """요청 응답 지연(초) - 느린 장비가 포함되면 slow_delay 적용"""
+        if any(equipment.get('id') in self.slow_ids for equipment in equipment_list):
+            return self.slow_delay
+        return self.delay
+
+    def serve(self):
+        """요청 수신 및 지연 응답 루프"""
+        router = self.context.socket(zmq.ROUTER)
+        router.setsockopt(zmq.LINGER, 0)
+
+        if self.bind.endswith(":*"):
+            port = router.bind_to_random_port(self.bind[:-2])
+            self.endpoint = f"{self.bind[:-2]}:{port}"
+        else:
+            router.bind(self.bind)
+            self.endpoint = self.bind
+        self._ready_event.set()
+        logger.info(f"MW 소켓 서버 대역 시작: {self.endpoint}")
+
+        scheduled = []  # (응답 시각, 순번, 응답 프레임)
+        sequence = 0
+
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+
+                # 응답 시각이 된 요청 전송
+                while scheduled and scheduled[0][0] <= now:
+                    _, _, frames = heapq.heappop(scheduled)
+                    router.send_multipart(frames)
+
+                timeout_ms = 100
+                if scheduled:
+                    timeout_ms = min(timeout_ms, max(0, int((scheduled[0][0] - now) * 1000)))
+
+                if not router.poll(timeout_ms):
+                    continue
+
+                while True:
+                    try:
+                        frames = router.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+
+                    # [identity, (request_id...), b"", payload] - 봉투는 그대로 돌려줌
+                    envelope, payload = frames[:-1], frames[-1]
+                    request = json.loads(payload.decode('utf-8'))
+                    equipment_list = request.get('data', [])
+                    self.request_count += 1
+
+                    response = json.dumps(self.build_response(equipment_list), ensure_ascii=False)
+                    sequence += 1
+                    heapq.heappush(scheduled, (
+                        time.monotonic() + self.get_delay(equipment_list),
+                        sequence,
+                        envelope + [response.encode('utf-8')],
+                    ))
+        finally:
+            router.close()
+            logger.info("MW 소켓 서버 대역 종료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MW 소켓 서버 대역")
+    parser.add_argument("--bind", default="tcp://*:5555", help="바인딩 주소")
+    parser.add_argument("--delay", type=float, default=0.05, help="장비별 기본 응답 지연(초)")
+    parser.add_argument("--slow-ids", type=int, nargs="*", default=[], help="느리게 응답할 장비 id 목록")
+    parser.add_argument("--slow-delay", type=float, default=30.0, help="느린 장비 응답 지연(초)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    server = MwStandInServer(args.bind, args.delay, args.slow_ids, args.slow_delay)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+네트워크 맵 데이터 구성 모듈 (/api/network_map)
+
+국사 수/링크 수와 무관하게 고정된 횟수의 쿼리로 맵 데이터를 구성합니다.
+- 국사 정보 1회 조회 후 국사명(guksa_t, guksa) → 국사 ID 사전으로 링크 양 끝 변환
+- 국사별/분야별 장비 수는 GROUP BY guksa_id, sector 집계 1회
+- 장비 노드(필터 지정 시)는 1회 조회 후 국사별로 분류
+
+구성된 맵은 토폴로지 버전(국사/장비/링크 테이블의 행 수, 최대 ID)별 스냅샷으로 보관하고
+JSON/gzip/brotli 본문과 ETag를 미리 만들어 두어 반복 요청은 304 또는 메모리 복사로 응답합니다.
+전체 맵 스냅샷은 백그라운드 스레드가 버전 변경 시 다시 만듭니다.
+
+행 수정(장비명/분야/링크 updown_type 변경 등)은 버전에 드러나지 않으므로
+POST /api/network_map/invalidate로 즉시 폐기하거나, NETWORK_MAP_MAX_SNAPSHOT_AGE가 지나면 다시 구성합니다.
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from sqlalchemy import func
+
+from db.models import db, TblGuksa, TblEquipment, TblLink
+
+# pip install brotli (선택, 미설치 시 gzip만 사용)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+NETWORK_MAP_REFRESH_INTERVAL = int(os.getenv("NETWORK_MAP_REFRESH_INTERVAL", "60"))  # 백그라운드 버전 확인 주기(초)
+NETWORK_MAP_VERSION_TTL = int(os.getenv("NETWORK_MAP_VERSION_TTL", "10"))  # 요청 경로 버전 재확인 간격(초)
+NETWORK_MAP_MAX_SNAPSHOT_AGE = int(os.getenv("NETWORK_MAP_MAX_SNAPSHOT_AGE", "600"))  # 스냅샷 최대 사용 시간(초)
+NETWORK_MAP_MAX_SNAPSHOTS = 64  # 필터 조합별 최대 보관 수
+NETWORK_MAP_GZIP_LEVEL = 6
+
+def build_network_map(guksa_id=None, equip_id=None, sector=None):
+    """
+    네트워크 맵 노드/링크 데이터 구성
+
+    Returns:
+        dict: {"nodes", "edges", "filtered"} (조건에 맞는 국사가 없으면 None)
+    """
+    # 1. 전체 국사 정보 1회 조회 (링크 양 끝 국사 ID 변환용 사전 포함)
+    all_guksas = db.session.query(
+        TblGuksa.guksa_id, TblGuksa.guksa, TblGuksa.guksa_t
+    ).order_by(TblGuksa.guksa_id).all()
+
+    guksa_id_by_guksa_t = {}
+    guksa_id_by_guksa = {}
+    for guksa in all_guksas:
+        guksa_id_by_guksa_t.setdefault(guksa.guksa_t, guksa.guksa_id)
+        guksa_id_by_guksa.setdefault(guksa.guksa, guksa.guksa_id)
+
+    # 필터링 적용
+    if guksa_id:
+        guksas = [guksa for guksa in all_guksas
+                  if str(guksa.guksa_id) == str(guksa_id).strip()]
+    else:
+        guksas = all_guksas
+
+    if not guksas:
+        return None
+
+    guksa_ids = [guksa.guksa_id for guksa in guksas]
+
+    # 2. 국사별/분야별 장비 수 집계 (GROUP BY guksa_id, sector)
+    count_query = db.session.query(
+        TblEquipment.guksa_id,
+        TblEquipment.sector,
+        func.count(TblEquipment.id),
+        func.min(TblEquipment.id)
+    )
+    if guksa_id:
+        count_query = count_query.filter(TblEquipment.guksa_id.in_(guksa_ids))
+
+    equipment_counts = {}  # guksa_id → 전체 장비 수
+    sector_counts = {}  # guksa_id → [(첫 장비 id, 분야, 장비 수)]
+    for row_guksa_id, row_sector, row_count, first_id in count_query.group_by(
+            TblEquipment.guksa_id, TblEquipment.sector).all():
+        equipment_counts[row_guksa_id] = equipment_counts.get(
+            row_guksa_id, 0) + row_count
+        if row_sector:
+            sector_counts.setdefault(row_guksa_id, []).append(
+                (first_id, row_sector, row_count))
+
+    # 특정 국사의 장비만 노드로 추가 (옵션) - 1회 조회 후 국사별로 분류
+    equip_nodes_by_guksa = {}
+    if equip_id or guksa_id:
+        equip_query = TblEquipment.query.filter(
+            TblEquipment.guksa_id.in_(guksa_ids))
+
+        if equip_id:
+            equip_query = equip_query.filter(
+                TblEquipment.id == equip_id)
+
+        if sector:
+            equip_query = equip_query.filter(
+                TblEquipment.sector == sector)
+
+        for eq in equip_query.order_by(TblEquipment.id).all():
+            equip_nodes_by_guksa.setdefault(eq.guksa_id, []).append(eq)
+
+    # 3. 노드 데이터 구성
+    nodes = []
+
+    for guksa in guksas:
+        # 가장 많은 장비가 있는 분야 선택 (같은 수면 먼저 등장한 분야)
+        counts = sorted(sector_counts.get(guksa.guksa_id, []))
+        main_sector = max(counts, key=lambda x: x[2])[
+            1] if counts else 'default'
+
+        # 국사 노드 데이터 구성
+        node = {
+            "id": guksa.guksa_id,
+            "label": guksa.guksa,
+            "type": "guksa",
+            "field": main_sector,
+            "equipment_count": equipment_counts.get(guksa.guksa_id, 0)
+        }
+        nodes.append(node)
+
+        for eq in equip_nodes_by_guksa.get(guksa.guksa_id, []):
+            equip_node = {
+                "id": f"e{eq.id}",  # 장비 ID가 국사 ID와 겹치지 않도록 접두어 추가
+                "label": eq.equip_name,
+                "type": "equipment",
+                "field": eq.sector,
+                "parent": guksa.guksa_id,
+                "equip_model": eq.equip_model
+            }
+            nodes.append(equip_node)
+
+    # 4. 링크 데이터 구성
+    links_query = db.session.query(TblLink)
+
+    if guksa_id:
+        # 특정 국사와 연결된 링크만 가져오기
+        guksa_obj = guksas[0]
+        links_query = links_query.filter(
+            (TblLink.local_guksa_name == guksa_obj.guksa_t) |
+            (TblLink.remote_guksa_name == guksa_obj.guksa_t)
+        )
+
+    # 링크 데이터 변환 (국사명 → 국사 ID 사전 조회)
+    edges = []
+
+    for link in links_query.all():
+        local_guksa_id = guksa_id_by_guksa_t.get(link.local_guksa_name)
+        remote_guksa_id = guksa_id_by_guksa.get(link.remote_guksa_name)
+
+        if local_guksa_id is not None and remote_guksa_id is not None:
+            edge = {
+                "id": link.id,
+                "from": local_guksa_id,
+                "to": remote_guksa_id,
+                "type": link.link_type,
+                "updown": link.updown_type,
+                "link_name": link.link_name
+            }
+            edges.append(edge)
+
+    # 5. 전체 네트워크 맵 데이터 반환
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "filtered": {
+            "guksa_id": guksa_id,
+            "equip_id": equip_id,
+            "sector": sector
+        }
+    }
+
+
+def get_topology_version():
+    """국사/장비/링크 테이블의 행 수와 최대 ID로 토폴로지 버전 문자열 생성 (1회 조회)"""
+    row = db.session.query(
+        db.session.query(func.count(TblGuksa.guksa_id)).scalar_subquery(),
+        db.session.query(func.max(TblGuksa.guksa_id)).scalar_subquery(),
+        db.session.query(func.count(TblEquipment.id)).scalar_subquery(),
+        db.session.query(func.max(TblEquipment.id)).scalar_subquery(),
+        db.session.query(func.count(TblLink.id)).scalar_subquery(),
+        db.session.query(func.max(TblLink.id)).scalar_subquery(),
+    ).one()
+
+    return "-".join(str(value or 0) for value in row)
+
+
+def parse_accept_encoding(accept_encoding) -> Dict[str, float]:
+    """Accept-Encoding 헤더 → {인코딩: q값} (q값을 읽을 수 없으면 0으로 보고 사용하지 않음)"""
+    qualities = {}
+    for item in (accept_encoding or "").lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+class NetworkMapSnapshot:
+    """버전별 네트워크 맵 응답 본문 (JSON / gzip / brotli 미리 압축)"""
+
+    def __init__(self, version, body: bytes):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=NETWORK_MAP_GZIP_LEVEL)
+        self.br_body = brotli.compress(body) if brotli else None
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.built_at = time.time()
+
+    def age(self):
+        return time.time() - self.built_at
+
+    def get_etag(self, content_encoding):
+        """Content-Encoding별 ETag (강한 검증자는 인코딩마다 달라야 함)"""
+        suffix = {"gzip": "-gz", "br": "-br"}.get(content_encoding, "")
+        return self.etag + suffix
+
+    def get_body(self, accept_encoding):
+        """
+        Accept-Encoding에 맞는 (본문, Content-Encoding) 반환
+
+        q값이 가장 큰 인코딩을 사용하며(같으면 br 우선), q=0인 인코딩은 사용하지 않습니다.
+        목록에 없는 인코딩은 "*"의 q값을 따릅니다.
+        """
+        qualities = parse_accept_encoding(accept_encoding)
+        default_quality = qualities.get("*", 0.0)
+
+        candidates = [("br", self.br_body), ("gzip", self.gzip_body)]
+        best_body, best_encoding, best_quality = self.body, None, 0.0
+        for content_encoding, body in candidates:
+            quality = qualities.get(content_encoding, default_quality)
+            if body is not None and quality > best_quality:
+                best_body, best_encoding, best_quality = body, content_encoding, quality
+        return best_body, best_encoding
+
+    def make_response(self, request):
+        """ETag/If-None-Match 처리 및 압축 본문 응답 생성 (변경 없으면 304)"""
+        from flask import Response
+
+        body, content_encoding = self.get_body(request.headers.get('Accept-Encoding'))
+        etag = self.get_etag(content_encoding)
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if content_encoding:
+                response.headers['Content-Encoding'] = content_encoding
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # 매번 ETag로 재검증
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+
+class NetworkMapSnapshotStore:
+    """필터 조합별 네트워크 맵 스냅샷 저장소 (토폴로지 버전이 바뀌면 다시 구성)"""
+
+    def __init__(self, refresh_interval=NETWORK_MAP_REFRESH_INTERVAL, version_ttl=NETWORK_MAP_VERSION_TTL,
+                 max_snapshots=NETWORK_MAP_MAX_SNAPSHOTS, max_snapshot_age=NETWORK_MAP_MAX_SNAPSHOT_AGE):
+        self.refresh_interval = refresh_interval
+        self.version_ttl = version_ttl
+        self.max_snapshots = max_snapshots
+        self.max_snapshot_age = max_snapshot_age
+
+        self._snapshots = OrderedDict()  # (guksa_id, equip_id, sector) → NetworkMapSnapshot
+        self._lock = threading.RLock()
+        self._version = None
+        self._version_checked_at = 0.0
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def current_version(self, force=False):
+        """토폴로지 버전 (version_ttl 동안은 마지막 확인 값 사용)"""
+        now = time.monotonic()
+        if force or self._version is None or now - self._version_checked_at >= self.version_ttl:
+            version = get_topology_version()
+            with self._lock:
+                if version != self._version:
+                    if self._version is not None:
+                        logger.info(f"네트워크 맵 토폴로지 버전 변경: {self._version} → {version}")
+                    self._version = version
+                self._version_checked_at = now
+        return self._version
+
+    def get(self, app, guksa_id=None, equip_id=None, sector=None):
+        """
+        스냅샷 조회 (현재 버전 스냅샷이 없으면 구성)
+
+        Returns:
+            NetworkMapSnapshot: 조건에 맞는 국사가 없으면 None
+        """
+        key = (guksa_id or None, equip_id or None, sector or None)
+        version = self.current_version()
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and not self._is_stale(snapshot, version):
+                self._snapshots.move_to_end(key)
+                return snapshot
+
+        return self.build(app, key, version)
+
+    def build(self, app, key, version):
+        """스냅샷 구성 및 저장"""
+        start = time.perf_counter()
+        data = build_network_map(*key)
+        if data is None:
+            return None
+
+        snapshot = NetworkMapSnapshot(version, app.json.dumps(data).encode("utf-8"))
+
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+
+        logger.info(
+            f"네트워크 맵 스냅샷 구성: filter={key}, version={version}, {len(snapshot.body)}B "
+            f"(gzip {len(snapshot.gzip_body)}B), {(time.perf_counter() - start) * 1000:.1f}ms")
+        return snapshot
+
+    def _is_stale(self, snapshot, version):
+        """버전이 바뀌었거나 최대 사용 시간이 지난 스냅샷 (행 수정은 버전에 드러나지 않음)"""
+        return snapshot.version != version or snapshot.age() >= self.max_snapshot_age
+
+    def invalidate(self):
+        """
+        스냅샷 전체 폐기 (행 수정처럼 버전에 드러나지 않는 변경 후 호출)
+
+        Returns:
+            int: 폐기한 스냅샷 수
+        """
+        with self._lock:
+            count = len(self._snapshots)
+            self._snapshots.clear()
+            self._version = None
+        logger.info(f"네트워크 맵 스냅샷 폐기: {count}건")
+        return count
+
+    def start_background_refresh(self, app):
+        """전체 맵 스냅샷 백그라운드 갱신 스레드 시작 (1회만)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, args=(app,), name="NetworkMapSnapshot", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _refresh_loop(self, app):
+        while not self._stop_event.is_set():
+            try:
+                with app.app_context():
+                    version = self.current_version(force=True)
+
+                    with self._lock:
+                        snapshot = self._snapshots.get((None, None, None))
+                        # 이전 버전/최대 사용 시간이 지난 스냅샷은 폐기 (필터 스냅샷은 다음 요청 시 다시 구성)
+                        for key in [key for key, value in self._snapshots.items() if self._is_stale(value, version)]:
+                            del self._snapshots[key]
+
+                    if snapshot is None or self._is_stale(snapshot, version):
+                        self.build(app, (None, None, None), version)
+            except Exception as e:
+                logger.error(f"네트워크 맵 스냅샷 갱신 실패: {str(e)}")
+
+            self._stop_event.wait(self.refresh_interval)
+
+
+_snapshot_store = NetworkMapSnapshotStore()  # 갱신 스레드는 start_refresh_thread에서 시작
+
+
+def get_network_map_snapshot_store() -> NetworkMapSnapshotStore:
+    """네트워크 맵 스냅샷 저장소 조회 (프로세스당 1개)"""
+    return _snapshot_store
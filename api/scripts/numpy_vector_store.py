@@ -0,0 +1,362 @@
+"""
+NumPy 전수 비교 벡터 저장소 모듈
+
+장애사례 코퍼스는 수천~수만 청크 규모라 HNSW 근사 탐색 + SQLite 메타데이터 조회보다
+메모리 맵(mmap)으로 연 임베딩 행렬(float32/float16/int8)과의 내적 전수 비교가 더 빠르고 결과도 항상 같습니다.
+Chroma 컬렉션의 query/get/count/metadata 형식을 그대로 제공하므로
+fault_prediction_core_4에서 VECTOR_DB_BACKEND=numpy로 바꿔 사용할 수 있습니다.
+
+    <버전 디렉토리>/numpy_store/
+        store.json       {"count", "dimensions", "dtype", "space", "collection_metadata", "created_at"}
+        embeddings.npy   (count, dimensions) float32/float16/int8 (np.load mmap_mode="r")
+        scales.npy       int8일 때 행별 역양자화 배율 (float32)
+        sq_norms.npy     행별 제곱 노름 (저장 dtype 기준, float32)
+        records.jsonl    한 줄에 {"id", "document", "metadata"} (임베딩 행 순서)
+
+- 생성: vector_db_creation 적재 완료 후 export_numpy_store (Chroma 컬렉션의 임베딩을 재임베딩 없이 내보냄)
+- 기존 버전: python -m api.scripts.numpy_vector_store [--db-dir DIR] [--dtype float32]
+- 거리: Chroma 컬렉션 hnsw:space와 같은 방식 (l2 = 제곱 거리, ip, cosine)
+- where: 메타데이터 $eq/$ne/$in/$nin, $and/$or (필드 값별 행 번호 색인)
+"""
+
+import os
+import json
+import shutil
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+NUMPY_STORE_DIR = "numpy_store"  # 버전 디렉토리 안의 저장소 디렉토리
+NUMPY_STORE_DTYPE = os.getenv("NUMPY_STORE_DTYPE", "float32")  # 임베딩 저장 형식 (float16/int8: 크기 절반/4분의 1, 질의 시 float32 변환)
+NUMPY_STORE_DTYPES = ("float32", "float16", "int8")
+NUMPY_QUERY_BLOCK_ROWS = 65536  # 한 번에 float32로 변환하여 비교할 행 수 (메모리 상한)
+NUMPY_EXPORT_BATCH = 2000  # Chroma에서 한 번에 내보낼 문서 수
+
+_STORE_FILE = "store.json"
+_EMBEDDINGS_FILE = "embeddings.npy"
+_SCALES_FILE = "scales.npy"
+_SQ_NORMS_FILE = "sq_norms.npy"
+_RECORDS_FILE = "records.jsonl"
+_INT8_MAX = 127.0
+
+
+class NumpyVectorStore:
+    """mmap 임베딩 행렬 전수 비교 저장소 (Chroma 컬렉션 호환 query/get/count)"""
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, _STORE_FILE), "r", encoding="utf-8") as f:
+            info = json.load(f)
+
+        self.path = store_dir
+        self.name = info.get("name", "nw_incidents")
+        self.dtype = info["dtype"]
+        self.space = info.get("space", "l2")
+        self.metadata = info.get("collection_metadata") or {}
+
+        self._matrix = np.load(os.path.join(store_dir, _EMBEDDINGS_FILE), mmap_mode="r")
+        self._sq_norms = np.load(os.path.join(store_dir, _SQ_NORMS_FILE))
+        self._scales = np.load(os.path.join(store_dir, _SCALES_FILE)) if self.dtype == "int8" else None
+
+        self._ids, self._documents, self._metadatas = [], [], []
+        with open(os.path.join(store_dir, _RECORDS_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self._ids.append(record["id"])
+                self._documents.append(record.get("document"))
+                self._metadatas.append(record.get("metadata") or {})
+
+        if len(self._ids) != self._matrix.shape[0]:
+            raise ValueError(f"NumPy 저장소 손상: 문서 {len(self._ids)}개 / 임베딩 {self._matrix.shape[0]}개 ({store_dir})")
+
+        self._id_to_row = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._value_rows = {}  # 메타데이터 필드 → 값 → 행 번호 배열 (where 필터용, 필드별 최초 사용 시 생성)
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def query(self, query_embeddings=None, n_results=10, where=None, include=("metadatas", "documents", "distances"),
+              **kwargs) -> Dict:
+        """Chroma collection.query와 같은 형식 (질의 임베딩 필수, 거리 오름차순 / 같은 거리는 행 순서)"""
+        if query_embeddings is None:
+            raise ValueError("NumPy 저장소 검색은 query_embeddings가 필요합니다")
+
+        rows = self._filter_rows(where)
+        results = {"ids": []}
+        for key in include:
+            results[key] = []
+
+        for query_embedding in np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)):
+            distances = self._distances(query_embedding, rows)
+            n = min(n_results, len(distances))
+            if n < len(distances):
+                top = np.argpartition(distances, n - 1)[:n]
+            else:
+                top = np.arange(len(distances))
+            top = top[np.lexsort((top, distances[top]))]
+
+            selected = top if rows is None else rows[top]
+            results["ids"].append([self._ids[row] for row in selected])
+            self._fill_include(results, include, selected, distances[top])
+        return results
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("metadatas", "documents"), **kwargs) -> Dict:
+        """Chroma collection.get과 같은 형식 (저장 순서)"""
+        rows = self._filter_rows(where)
+        if rows is None:
+            rows = np.arange(len(self._ids))
+        if ids is not None:
+            wanted = {self._id_to_row[chunk_id] for chunk_id in ids if chunk_id in self._id_to_row}
+            rows = np.array([row for row in rows if row in wanted], dtype=np.int64)
+        rows = rows[offset or 0:]
+        if limit is not None:
+            rows = rows[:limit]
+
+        results = {"ids": [self._ids[row] for row in rows]}
+        for key in include:
+            if key == "documents":
+                results[key] = [self._documents[row] for row in rows]
+            elif key == "metadatas":
+                results[key] = [self._metadatas[row] for row in rows]
+            elif key == "embeddings":
+                results[key] = [vector for vector in self._dequantize(rows)]
+        return results
+
+    def _fill_include(self, results, include, rows, distances):
+        for key in include:
+            if key == "distances":
+                results[key].append([float(distance) for distance in distances])
+            elif key == "documents":
+                results[key].append([self._documents[row] for row in rows])
+            elif key == "metadatas":
+                results[key].append([self._metadatas[row] for row in rows])
+            elif key == "embeddings":
+                results[key].append([vector for vector in self._dequantize(rows)])
+
+    def _dequantize(self, rows) -> np.ndarray:
+        """행 번호의 임베딩을 float32로 변환 (mmap에서 해당 행만 읽음)"""
+        block = np.asarray(self._matrix[rows], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[rows, None]
+        return block
+
+    def _distances(self, query_embedding, rows) -> np.ndarray:
+        """행(rows가 None이면 전체)과 질의의 거리 (블록 단위 내적)"""
+        total = len(self._ids) if rows is None else len(rows)
+        dots = np.empty(total, dtype=np.float32)
+        for start in range(0, total, NUMPY_QUERY_BLOCK_ROWS):
+            end = min(total, start + NUMPY_QUERY_BLOCK_ROWS)
+            block_rows = slice(start, end) if rows is None else rows[start:end]
+            block = np.asarray(self._matrix[block_rows], dtype=np.float32)
+            dots[start:end] = block @ query_embedding
+            if self._scales is not None:
+                dots[start:end] *= self._scales[block_rows]
+
+        sq_norms = self._sq_norms if rows is None else self._sq_norms[rows]
+        if self.space == "ip":
+            return 1.0 - dots
+        if self.space == "cosine":
+            norms = np.sqrt(sq_norms) * float(np.linalg.norm(query_embedding))
+            return 1.0 - dots / np.where(norms == 0, 1.0, norms)
+        return np.maximum(sq_norms + float(query_embedding @ query_embedding) - 2.0 * dots, 0.0)
+
+    def _filter_rows(self, where) -> Optional[np.ndarray]:
+        """where 조건에 맞는 행 번호 (조건이 없으면 None: 전체)"""
+        if not where:
+            return None
+        return np.flatnonzero(self._match(where))
+
+    def _match(self, where) -> np.ndarray:
+        mask = np.ones(len(self._ids), dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for child in condition:
+                    mask &= self._match(child)
+            elif key == "$or":
+                any_mask = np.zeros(len(self._ids), dtype=bool)
+                for child in condition:
+                    any_mask |= self._match(child)
+                mask &= any_mask
+            else:
+                mask &= self._match_field(key, condition)
+        return mask
+
+    def _match_field(self, field, condition) -> np.ndarray:
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        value_rows = self._get_value_rows(field)
+        mask = np.ones(len(self._ids), dtype=bool)
+        for operator, value in condition.items():
+            if operator in ("$eq", "$ne"):
+                values = [value]
+            elif operator in ("$in", "$nin"):
+                values = list(value)
+            else:
+                raise ValueError(f"NumPy 저장소에서 지원하지 않는 where 연산자입니다: {operator}")
+
+            matched = np.zeros(len(self._ids), dtype=bool)
+            for item in values:
+                rows = value_rows.get(item)
+                if rows is not None:
+                    matched[rows] = True
+            mask &= matched if operator in ("$eq", "$in") else ~matched
+        return mask
+
+    def _get_value_rows(self, field) -> Dict:
+        value_rows = self._value_rows.get(field)
+        if value_rows is None:
+            grouped = {}
+            for row, metadata in enumerate(self._metadatas):
+                value = metadata.get(field)
+                if value is not None:
+                    grouped.setdefault(value, []).append(row)
+            value_rows = {value: np.array(rows, dtype=np.int64) for value, rows in grouped.items()}
+            self._value_rows[field] = value_rows
+        return value_rows
+
+
+def numpy_store_path(db_dir) -> str:
+    return os.path.join(db_dir, NUMPY_STORE_DIR)
+
+
+def open_numpy_store(db_dir) -> Optional[NumpyVectorStore]:
+    """DB 디렉토리의 NumPy 저장소 열기 (없으면 None)"""
+    store_dir = numpy_store_path(db_dir)
+    if not os.path.exists(os.path.join(store_dir, _STORE_FILE)):
+        return None
+    return NumpyVectorStore(store_dir)
+
+
+def quantize_rows(vectors, dtype):
+    """
+    임베딩 행을 저장 형식으로 변환
+
+    Returns:
+        tuple: (저장 행렬, 행별 배율 또는 None, 저장 값 기준 제곱 노름)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / _INT8_MAX
+        scales[scales == 0] = 1.0
+        stored = np.rint(vectors / scales[:, None]).astype(np.int8)
+        restored = stored.astype(np.float32) * scales[:, None]
+        return stored, scales.astype(np.float32), (restored ** 2).sum(axis=1)
+
+    stored = vectors.astype(dtype)
+    return stored, None, (stored.astype(np.float32) ** 2).sum(axis=1)
+
+
+def export_numpy_store(collection, db_dir, dtype=NUMPY_STORE_DTYPE, batch_size=NUMPY_EXPORT_BATCH) -> Dict:
+    """
+    Chroma 컬렉션을 NumPy 저장소로 내보내기 (재임베딩 없음)
+
+    임시 디렉토리에 쓴 뒤 교체하므로 중간에 실패해도 기존 저장소는 그대로 남습니다.
+
+    Returns:
+        dict: store.json 내용
+    """
+    if dtype not in NUMPY_STORE_DTYPES:
+        raise ValueError(f"지원하지 않는 NumPy 저장 형식입니다: {dtype} (지원: {', '.join(NUMPY_STORE_DTYPES)})")
+
+    store_dir = numpy_store_path(db_dir)
+    tmp_dir = store_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    count = collection.count()
+    matrix = None
+    scales = np.ones(count, dtype=np.float32)
+    sq_norms = np.zeros(count, dtype=np.float32)
+    written = 0
+
+    with open(os.path.join(tmp_dir, _RECORDS_FILE), "w", encoding="utf-8") as records:
+        while written < count:
+            page = collection.get(include=["documents", "metadatas", "embeddings"], limit=batch_size, offset=written)
+            if not page["ids"]:
+                break
+
+            stored, page_scales, page_sq_norms = quantize_rows(page["embeddings"], dtype)
+            if matrix is None:
+                matrix = np.lib.format.open_memmap(os.path.join(tmp_dir, _EMBEDDINGS_FILE), mode="w+",
+                                                   dtype=dtype, shape=(count, stored.shape[1]))
+            end = written + len(page["ids"])
+            matrix[written:end] = stored
+            sq_norms[written:end] = page_sq_norms
+            if page_scales is not None:
+                scales[written:end] = page_scales
+
+            for chunk_id, document, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                records.write(json.dumps({"id": chunk_id, "document": document, "metadata": metadata},
+                                         ensure_ascii=False) + "\n")
+            written = end
+
+    if written != count:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise ValueError(f"Chroma 내보내기 중 문서 수가 바뀌었습니다: {written}/{count}")
+
+    if matrix is None:  # 빈 컬렉션
+        matrix = np.lib.format.open_memmap(os.path.join(tmp_dir, _EMBEDDINGS_FILE), mode="w+", dtype=dtype,
+                                           shape=(0, 0))
+    dimensions = matrix.shape[1]
+    matrix.flush()
+    del matrix
+
+    np.save(os.path.join(tmp_dir, _SQ_NORMS_FILE), sq_norms)
+    if dtype == "int8":
+        np.save(os.path.join(tmp_dir, _SCALES_FILE), scales)
+
+    collection_metadata = dict(collection.metadata or {})
+    info = {
+        "name": collection.name,
+        "count": count,
+        "dimensions": dimensions,
+        "dtype": dtype,
+        "space": collection_metadata.get("hnsw:space", "l2"),
+        "collection_metadata": collection_metadata,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(os.path.join(tmp_dir, _STORE_FILE), "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False)
+
+    # 기존 저장소 교체 (서버가 열어 둔 mmap 때문에 삭제가 실패하면 다음 내보내기 때 정리)
+    if os.path.exists(store_dir):
+        old_dir = store_dir + ".old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(store_dir, old_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+
+    logger.info(f"NumPy 저장소 생성: 문서 {count}개, {dimensions}차원, {dtype} ({store_dir})")
+    return info
+
+
+def main(db_dir=None, dtype=NUMPY_STORE_DTYPE):
+    """기존 버전 디렉토리의 Chroma 컬렉션을 NumPy 저장소로 내보내기 (기본: 활성 버전)"""
+    import chromadb
+    from api.scripts.vector_db_versions import resolve_active_db_dir
+
+    if db_dir is None:
+        _, db_dir = resolve_active_db_dir()
+        if db_dir is None:
+            logger.error("내보낼 벡터DB가 없습니다 (--db-dir 지정)")
+            return
+
+    client = chromadb.PersistentClient(path=db_dir)
+    export_numpy_store(client.get_collection(name="nw_incidents"), db_dir, dtype)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Chroma 벡터DB → NumPy 저장소 내보내기")
+    parser.add_argument("--db-dir", help="벡터DB 디렉토리 (기본: 활성 버전)")
+    parser.add_argument("--dtype", default=NUMPY_STORE_DTYPE, choices=NUMPY_STORE_DTYPES, help="임베딩 저장 형식")
+    args = parser.parse_args()
+
+    main(db_dir=args.db_dir, dtype=args.dtype)
@@ -0,0 +1,238 @@
+"""
+하이브리드 검색 결과 캐시 모듈
+
+hybrid_search_async의 검색 결과를 정규화된 쿼리 지문(fingerprint)으로 보관합니다.
+- 지문: 경보 줄별 normalize_text(공백/순서 무관) + 정렬된 경보 코드 + 분야 필터 + top_k
+- 메모리 계층: OrderedDict 기반 LRU + TTL (O(1) 조회/퇴출)
+- 디스크 계층(선택): SEARCH_RESULT_CACHE_PATH 지정 시 SQLite 파일을 gunicorn 워커 간 공유
+  (값은 JSON으로 저장, 공유 파일을 pickle로 역직렬화하지 않음)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from .fault_prediction_utils import normalize_text, extract_alert_codes_cached
+from .lazy_instance import LazyInstance
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "256"))  # 메모리 최대 항목 수
+SEARCH_RESULT_CACHE_TTL = int(os.getenv("SEARCH_RESULT_CACHE_TTL", "3600"))  # 유지 시간(초)
+SEARCH_RESULT_CACHE_PATH = os.getenv("SEARCH_RESULT_CACHE_PATH", "")  # 공유 디스크 캐시 파일 (빈 값이면 미사용)
+SEARCH_RESULT_DISK_MAX_ROWS = int(os.getenv("SEARCH_RESULT_DISK_MAX_ROWS", "5000"))  # 디스크 최대 항목 수
+SEARCH_RESULT_DISK_PRUNE_EVERY = 100  # 디스크 정리 주기 (저장 횟수)
+
+def _json_default(value):
+    """JSON 직렬화 보조 (NumPy 배열/스칼라는 리스트/파이썬 값으로 변환)"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"JSON으로 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+def build_query_fingerprint(query: str, field_filter: Any = None, top_k: int = 5,
+                            version: Optional[str] = None) -> str:
+    """
+    검색 쿼리의 정규화 지문 생성 (프로세스/워커 간 동일)
+
+    경보 줄은 normalize_text 후 중복 제거/정렬하므로
+    공백 차이나 경보 줄 순서만 다른 경보 내역은 같은 지문이 됩니다.
+    version(벡터DB 버전)이 다르면 다른 지문이 되어 버전 전환 후 이전 결과를 재사용하지 않습니다.
+    """
+    raw_lines = [line for line in (query or "").splitlines() if line.strip()]
+    lines = sorted({normalize_text(line) for line in raw_lines} - {""})
+
+    # 경보 코드는 줄 단위로 추출 (전체 추출 시 20개 제한으로 프로세스마다 선택이 달라질 수 있음)
+    codes = sorted({" ".join(code.split())
+                    for line in raw_lines for code in extract_alert_codes_cached(line)})
+
+    canonical = json.dumps({
+        'lines': lines,
+        'codes': codes,
+        'filter': field_filter,
+        'top_k': top_k,
+        'version': version,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SearchResultCache:
+    """검색 결과 LRU + TTL 캐시 (스레드 안전, 선택적 SQLite 공유 계층)"""
+
+    def __init__(self, max_size=SEARCH_RESULT_CACHE_SIZE, ttl=SEARCH_RESULT_CACHE_TTL,
+                 disk_path=SEARCH_RESULT_CACHE_PATH, disk_max_rows=SEARCH_RESULT_DISK_MAX_ROWS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.disk_path = disk_path or None
+        self.disk_max_rows = disk_max_rows
+        self._entries = OrderedDict()  # 지문 → (저장 시각, 값)
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_path:
+            try:
+                self._init_disk()
+            except sqlite3.Error as e:
+                logger.warning(f"검색 결과 디스크 캐시 초기화 실패, 메모리 캐시만 사용: {e}")
+                self.disk_path = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (메모리 → 디스크 순, 없거나 만료되면 None)"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        entry = self._disk_get(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, entry[0], entry[1])
+        return entry[1]
+
+    def set(self, key: str, value: Any):
+        """캐시 저장 (메모리 + 디스크)"""
+        now = time.time()
+        with self._lock:
+            self._store(key, now, value)
+        self._disk_set(key, now, value)
+
+    def _store(self, key, stored_at, value):
+        """메모리 계층 저장 (락 보유 상태에서 호출, 초과분은 가장 오래 사용하지 않은 항목부터 퇴출)"""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """캐시 전체 삭제 (디스크 포함)"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+
+        if self.disk_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM search_result_cache")
+            except sqlite3.Error as e:
+                logger.warning(f"검색 결과 디스크 캐시 삭제 실패: {e}")
+
+        logger.info(f"검색 결과 캐시 삭제: 메모리 {count}개")
+        return count
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'disk_path': self.disk_path,
+            }
+
+    # 디스크 계층 (SQLite, WAL 모드로 여러 워커 프로세스가 동시에 읽기/쓰기)
+
+    @contextmanager
+    def _connect(self):
+        """요청마다 연결을 열고 커밋 후 닫음 (fork된 워커 간 연결 공유 방지)"""
+        conn = sqlite3.connect(self.disk_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_disk(self):
+        directory = os.path.dirname(self.disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_result_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_search_result_cache_stored_at "
+                "ON search_result_cache (stored_at)")
+
+        logger.info(f"검색 결과 디스크 캐시 사용: {self.disk_path}")
+
+    def _disk_get(self, key, now):
+        if not self.disk_path:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT stored_at, value FROM search_result_cache WHERE key = ? AND stored_at > ?",
+                    (key, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            return row[0], json.loads(row[1])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"검색 결과 디스크 캐시 조회 실패: {e}")
+            return None
+
+    def _disk_set(self, key, stored_at, value):
+        if not self.disk_path:
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % SEARCH_RESULT_DISK_PRUNE_EVERY == 0
+
+        try:
+            text = json.dumps(value, ensure_ascii=False, default=_json_default)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_result_cache (key, stored_at, value) VALUES (?, ?, ?)",
+                    (key, stored_at, text))
+                if prune:
+                    self._disk_prune(conn, stored_at)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"검색 결과 디스크 캐시 저장 실패: {e}")
+
+    def _disk_prune(self, conn, now):
+        """만료 항목 및 최대 항목 수 초과분 삭제"""
+        conn.execute("DELETE FROM search_result_cache WHERE stored_at <= ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM search_result_cache WHERE key IN ("
+            "SELECT key FROM search_result_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_rows,))
+
+
+_search_result_cache = LazyInstance(SearchResultCache)  # 디스크 계층 초기화는 최초 조회 시
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """검색 결과 캐시 조회 (프로세스당 1개)"""
+    return _search_result_cache.get()
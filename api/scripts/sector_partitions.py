@@ -0,0 +1,170 @@
+"""
+장애분야별 벡터 파티션 모듈
+
+분야 필터 검색은 단일 HNSW 인덱스에 Chroma where($in) 조건을 거는 방식이라
+코퍼스가 커질수록 메타데이터 조회 + 필터링 탐색 비용이 커집니다.
+벡터DB 생성 시 본 컬렉션(nw_incidents)과 함께 분야별 컬렉션(nw_incidents__<분야>)에 같은 임베딩을 저장하고
+검색 시 감지된 분야의 파티션만 병렬 조회하여 거리순으로 결합합니다.
+
+- 파티션 기준: 장애분야 값을 FIELD_MAPPING 표준 분야로 변환 (분야 필터와 같은 문서 집합)
+- 표준 분야가 없는 사례는 본 컬렉션에만 저장 (분야 필터에도 걸리지 않음)
+- 분야 필터가 없는 검색은 기존처럼 본 컬렉션 사용
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .fault_prediction_constants import DB_FIELD_TO_STANDARD
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+COLLECTION_NAME = "nw_incidents"
+PARTITION_COLLECTION_PREFIX = f"{COLLECTION_NAME}__"
+# 표준 분야 → 파티션 이름 (Chroma 컬렉션 이름은 영문/숫자만 가능)
+SECTOR_PARTITIONS = {
+    "IP": "ip",
+    "전송": "transmission",
+    "교환": "switching",
+    "MW": "mw",
+    "선로": "cable",
+    "무선": "wireless",
+}
+ALL_PARTITIONS = "*"  # 파티션 정보가 없는 manifest 항목 (전체 파티션에서 삭제)
+PARTITION_QUERY_WORKERS = int(os.getenv("PARTITION_QUERY_WORKERS", "4"))  # 파티션 병렬 조회 스레드 수
+
+# 전역 변수 (스레드는 첫 조회 작업 제출 시 생성됨)
+_executor = ThreadPoolExecutor(max_workers=PARTITION_QUERY_WORKERS, thread_name_prefix="SectorPartition")
+
+
+def partition_for_field(field_value) -> Optional[str]:
+    """장애분야 값의 파티션 이름 (표준 분야가 아니면 None)"""
+    return SECTOR_PARTITIONS.get(DB_FIELD_TO_STANDARD.get(field_value))
+
+
+def partitions_for_field_values(field_values) -> List[str]:
+    """분야 필터 허용 값(장애분야 값 목록)의 파티션 이름 목록"""
+    return sorted({partition_for_field(value) for value in field_values or []} - {None})
+
+
+def partition_collection_name(partition) -> str:
+    return f"{PARTITION_COLLECTION_PREFIX}{partition}"
+
+
+def create_sector_partitions(client, embedding_function, metadata=None) -> Dict:
+    """분야별 파티션 컬렉션 생성 (이미 있으면 그대로 사용)"""
+    return {
+        partition: client.get_or_create_collection(
+            name=partition_collection_name(partition),
+            embedding_function=embedding_function,
+            metadata={**(metadata or {}), "partition": partition},
+        )
+        for partition in SECTOR_PARTITIONS.values()
+    }
+
+
+def open_sector_partitions(client, embedding_function) -> Optional[Dict]:
+    """분야별 파티션 컬렉션 열기 (하나라도 없으면 None: 파티션 이전 버전의 DB)"""
+    existing = {collection.name if hasattr(collection, "name") else collection
+                for collection in client.list_collections()}
+    if any(partition_collection_name(partition) not in existing for partition in SECTOR_PARTITIONS.values()):
+        return None
+
+    return {
+        partition: client.get_collection(name=partition_collection_name(partition),
+                                         embedding_function=embedding_function)
+        for partition in SECTOR_PARTITIONS.values()
+    }
+
+
+def group_by_partition(chunks) -> Dict[str, List[int]]:
+    """청크 인덱스를 파티션별로 분류"""
+    groups = {}
+    for i, chunk in enumerate(chunks):
+        partition = partition_for_field(chunk["metadata"].get("장애분야"))
+        if partition:
+            groups.setdefault(partition, []).append(i)
+    return groups
+
+
+def delete_from_partitions(partitions, ids, partition):
+    """파티션에서 문서 삭제 (partition이 None이면 무시, ALL_PARTITIONS면 전체 파티션)"""
+    if not partitions or not ids:
+        return
+
+    if partition == ALL_PARTITIONS:
+        targets = list(partitions.values())
+    elif partition in partitions:
+        targets = [partitions[partition]]
+    else:
+        return
+
+    for collection in targets:
+        collection.delete(ids=list(ids))
+
+
+def query_partitions(partitions, partition_names, query_embedding, n_results, include) -> Dict:
+    """
+    파티션들을 조회하여 거리순 상위 n_results로 결합 (Chroma query 결과 형식)
+
+    각 파티션에서 n_results개씩 가져오므로 결합 결과는 분야 필터 단일 조회와 같은 상위 문서가 됩니다.
+    """
+    targets = [partitions[name] for name in partition_names if name in partitions]
+
+    def run(collection):
+        return collection.query(query_embeddings=[query_embedding], n_results=n_results, include=include)
+
+    if len(targets) > 1:
+        results = list(get_partition_executor().map(run, targets))
+    else:
+        results = [run(collection) for collection in targets]
+
+    rows = []
+    for result in results:
+        ids = result["ids"][0]
+        for i in range(len(ids)):
+            rows.append((result["distances"][0][i], ids[i], result, i))
+    rows.sort(key=lambda row: row[0])
+    rows = rows[:n_results]
+
+    merged = {"ids": [[row[1] for row in rows]]}
+    for key in include:
+        merged[key] = [[row[2][key][0][row[3]] for row in rows]]
+    return merged
+
+
+def get_partition_executor() -> ThreadPoolExecutor:
+    """파티션 병렬 조회 스레드 풀 조회"""
+    return _executor
+
+
+def backfill_sector_partitions(collection, partitions, batch_size=2000) -> int:
+    """
+    본 컬렉션의 문서를 파티션에 복사 (파티션 이전 버전을 증분 적재할 때, 재임베딩 없음)
+
+    Returns:
+        int: 복사한 문서 수
+    """
+    copied = 0
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas", "embeddings"], limit=batch_size, offset=offset)
+        if not page["ids"]:
+            break
+        offset += len(page["ids"])
+
+        chunks = [{"id": chunk_id, "metadata": metadata or {}}
+                  for chunk_id, metadata in zip(page["ids"], page["metadatas"])]
+        for partition, indices in group_by_partition(chunks).items():
+            partitions[partition].upsert(
+                ids=[page["ids"][i] for i in indices],
+                documents=[page["documents"][i] for i in indices],
+                metadatas=[page["metadatas"][i] for i in indices],
+                embeddings=[page["embeddings"][i] for i in indices],
+            )
+            copied += len(indices)
+
+    logger.info(f"분야별 파티션 생성 (기존 문서 복사): {copied}건")
+    return copied
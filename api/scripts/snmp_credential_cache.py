@@ -0,0 +1,179 @@
+"""
+MW 장비 SNMP 접속 정보 캐시 모듈
+
+tbl_snmp_info를 equip_name 기준으로 한 번의 IN (...) 쿼리로 조회하고,
+조회 결과를 TTL 동안 프로세스 메모리에 보관합니다.
+없는 장비는 SNMP_CREDENTIAL_NEGATIVE_TTL 동안만 보관하여 새로 추가된 행이 빨리 반영되도록 합니다.
+
+tbl_snmp_info가 변경되면 invalidate()로 즉시 무효화합니다.
+캐시는 워커 프로세스마다 있으므로 invalidate()는 표시 파일(SNMP_CREDENTIAL_INVALIDATION_FILE)의
+수정 시각을 갱신하고, 다른 워커는 다음 조회 시 이를 확인하여 전체 무효화합니다.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+SNMP_CREDENTIAL_TTL = int(os.getenv("SNMP_CREDENTIAL_TTL", "300"))  # 캐시 유지 시간(초)
+SNMP_CREDENTIAL_NEGATIVE_TTL = int(os.getenv("SNMP_CREDENTIAL_NEGATIVE_TTL", "30"))  # 없는 장비 캐시 유지 시간(초)
+# 워커 간 무효화 표시 파일 (빈 값이면 invalidate를 처리한 워커만 무효화)
+SNMP_CREDENTIAL_INVALIDATION_FILE = os.getenv("SNMP_CREDENTIAL_INVALIDATION_FILE", "./snmp_credential_invalidated")
+SNMP_QUERY_CHUNK_SIZE = 500  # IN 절 최대 항목 수
+
+class SnmpCredentialCache:
+    """equip_name → SNMP 접속 정보 TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl=SNMP_CREDENTIAL_TTL, negative_ttl=SNMP_CREDENTIAL_NEGATIVE_TTL,
+                 invalidation_file=SNMP_CREDENTIAL_INVALIDATION_FILE):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.invalidation_file = invalidation_file or None
+        self._entries = {}  # equip_name → (만료 시각, 접속 정보 또는 None)
+        self._lock = threading.Lock()
+        self._invalidation_mtime = self._read_invalidation_mtime()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, equip_names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        장비명 목록의 SNMP 접속 정보 조회 (캐시에 없는 장비만 DB 1회 조회)
+
+        Returns:
+            dict: equip_name → {"id", "snmp_ip", "community", "equip_type", "equip_name"} (없으면 None)
+        """
+        self._check_invalidation()
+        names = list(dict.fromkeys(str(name) for name in equip_names))
+        now = time.monotonic()
+
+        result = {}
+        missing = []
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(name)
+                if entry and entry[0] > now:
+                    result[name] = entry[1]
+                else:
+                    missing.append(name)
+            self.hits += len(names) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            loaded = self.load(missing)
+            loaded_at = time.monotonic()
+            with self._lock:
+                for name in missing:
+                    info = loaded.get(name)
+                    self._entries[name] = (loaded_at + (self.ttl if info is not None else self.negative_ttl), info)
+                    result[name] = info
+
+        return result
+
+    def load(self, equip_names) -> Dict[str, Dict]:
+        """tbl_snmp_info 일괄 조회 (equip_name IN (...), 같은 장비명은 id가 가장 작은 행 사용)"""
+        from db.models import TblSnmpInfo
+
+        loaded = {}
+        for start in range(0, len(equip_names), SNMP_QUERY_CHUNK_SIZE):
+            chunk = equip_names[start:start + SNMP_QUERY_CHUNK_SIZE]
+            rows = TblSnmpInfo.query.with_entities(
+                TblSnmpInfo.id,
+                TblSnmpInfo.snmp_ip,
+                TblSnmpInfo.community,
+                TblSnmpInfo.equip_type,
+                TblSnmpInfo.equip_name,
+            ).filter(
+                TblSnmpInfo.equip_name.in_(chunk)
+            ).order_by(TblSnmpInfo.id).all()
+
+            for row in rows:
+                if row.equip_name in loaded:
+                    continue
+                loaded[row.equip_name] = {
+                    'id': row.id,  # TblSnmpInfo의 Primary Key
+                    'snmp_ip': row.snmp_ip,
+                    'community': row.community,
+                    'equip_type': row.equip_type,
+                    'equip_name': row.equip_name
+                }
+
+        logger.info(f"SNMP 접속 정보 DB 조회: 요청 {len(equip_names)}개, 매칭 {len(loaded)}개")
+        return loaded
+
+    def invalidate(self, equip_names: Optional[Iterable[str]] = None):
+        """캐시 무효화 (장비명 미지정 시 전체, 다른 워커는 표시 파일을 통해 전체 무효화)"""
+        with self._lock:
+            if equip_names is None:
+                count = len(self._entries)
+                self._entries.clear()
+            else:
+                count = 0
+                for name in equip_names:
+                    if self._entries.pop(str(name), None) is not None:
+                        count += 1
+
+        self._signal_workers()
+        logger.info(f"SNMP 접속 정보 캐시 무효화: {count}개")
+        return count
+
+    # 워커 간 무효화 (표시 파일 수정 시각)
+
+    def _read_invalidation_mtime(self):
+        if not self.invalidation_file:
+            return None
+        try:
+            return os.stat(self.invalidation_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _signal_workers(self):
+        """표시 파일 수정 시각 갱신 (다른 워커에 무효화 알림)"""
+        if not self.invalidation_file:
+            return
+        try:
+            with open(self.invalidation_file, "a"):
+                pass
+            os.utime(self.invalidation_file)
+            self._invalidation_mtime = self._read_invalidation_mtime()
+        except OSError as e:
+            logger.warning(f"SNMP 접속 정보 캐시 무효화 표시 실패 (다른 워커는 TTL 이후 반영): {e}")
+
+    def _check_invalidation(self):
+        """다른 워커의 무효화 확인 (표시 파일 수정 시각이 바뀌었으면 전체 무효화)"""
+        mtime = self._read_invalidation_mtime()
+        if mtime == self._invalidation_mtime:
+            return
+
+        with self._lock:
+            self._invalidation_mtime = mtime
+            count = len(self._entries)
+            self._entries.clear()
+        logger.info(f"SNMP 접속 정보 캐시 무효화 (다른 워커 요청): {count}개")
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'ttl': self.ttl,
+                'negative_ttl': self.negative_ttl,
+            }
+
+
+_snmp_credential_cache = SnmpCredentialCache()
+
+
+def get_snmp_credential_cache() -> SnmpCredentialCache:
+    """SNMP 접속 정보 캐시 조회 (프로세스당 1개)"""
+    return _snmp_credential_cache
+
+
+def invalidate_snmp_credentials(equip_names: Optional[Iterable[str]] = None):
+    """tbl_snmp_info 변경 시 호출 (장비명 미지정 시 전체 무효화)"""
+    return get_snmp_credential_cache().invalidate(equip_names)
@@ -0,0 +1,360 @@
+"""
+장비 연결 토폴로지 그래프 캐시 모듈
+
+tbl_sub_link 전체를 한 번 읽어 프로세스 메모리에 압축된 배열 형태로 보관합니다.
+
+- 장비 ID는 정수 인덱스로 변환하여 링크의 source/target을 array('i')로 저장
+- 국사명 → 링크 행 인덱스, 장비 인덱스 → 장비 정보(처음 등장한 행 기준) 색인
+- 주기적으로 COUNT(*)/MAX(id)를 확인하여 새로 추가된 행만 증분 로딩
+  (행 수가 줄거나 맞지 않으면 전체 재로딩)
+- 행 수정(up_down, link_equip_id, guksa_name 등)은 COUNT/MAX(id)로 감지되지 않으므로
+  TOPOLOGY_FULL_RELOAD_INTERVAL마다 전체 재로딩하고, 즉시 반영이 필요하면
+  POST /api/topology/invalidate (invalidate()) 호출
+
+alarm_dashboard_equip의 연결 장비 조회는 DB 호출 없이 메모리에서만 처리됩니다.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+TOPOLOGY_REFRESH_INTERVAL = int(os.getenv("TOPOLOGY_REFRESH_INTERVAL", "30"))  # 변경 확인 주기(초)
+TOPOLOGY_FULL_RELOAD_INTERVAL = int(os.getenv("TOPOLOGY_FULL_RELOAD_INTERVAL", "600"))  # 행 수정 반영용 전체 재로딩 주기(초, 0이면 비활성)
+TOPOLOGY_LOAD_BATCH_SIZE = 5000
+
+class TopologyGraph:
+    """tbl_sub_link 기반 장비 연결 그래프 (프로세스 단위 캐시)"""
+
+    def __init__(self, refresh_interval=TOPOLOGY_REFRESH_INTERVAL, full_reload_interval=TOPOLOGY_FULL_RELOAD_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self._lock = threading.RLock()
+        self.version = 0  # 로딩될 때마다 증가
+        self._reset()
+
+    def _reset(self):
+        # 장비 ID ↔ 정수 인덱스
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        # 장비 정보 (처음 등장한 행 기준): (equip_type, equip_name, equip_field, guksa_name, up_down)
+        self.node_info: List[tuple] = []
+
+        # 링크 행 (tbl_sub_link id 순서)
+        self.row_ids = array('i')
+        self.row_source = array('i')
+        self.row_target = array('i')
+        self.row_up_down: List[str] = []
+        self.row_link_name: List[str] = []
+
+        # 국사명 → 링크 행 인덱스
+        self.rows_by_guksa: Dict[str, array] = {}
+
+        self._link_map_cache: Dict[str, Dict] = {}
+        self.row_count = 0
+        self.max_id = 0
+        self._checked_at = None
+        self._loaded_at = None  # 마지막 전체 로딩 시각 (time.monotonic)
+
+    def _intern_node(self, equip_id, info) -> int:
+        index = self.node_index.get(equip_id)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_index[equip_id] = index
+            self.node_ids.append(equip_id)
+            self.node_info.append(info)
+        return index
+
+    def _add_row(self, row):
+        """tbl_sub_link 행 1개를 배열에 추가"""
+        row_index = len(self.row_ids)
+        up_down = sys.intern(row.up_down or '')
+
+        source = self._intern_node(row.equip_id, (
+            row.equip_type, row.equip_name, row.equip_field, row.guksa_name, row.up_down))
+        target = self._intern_node(row.link_equip_id, (
+            row.link_equip_type, row.link_equip_name, row.link_equip_field, row.link_guksa_name,
+            "down" if row.up_down == "up" else "up"))  # 반대 관계
+
+        self.row_ids.append(row.id)
+        self.row_source.append(source)
+        self.row_target.append(target)
+        self.row_up_down.append(up_down)
+        self.row_link_name.append(row.link_name)
+
+        guksa_names = {row.guksa_name, row.link_guksa_name}
+        for guksa_name in guksa_names:
+            rows = self.rows_by_guksa.get(guksa_name)
+            if rows is None:
+                rows = self.rows_by_guksa[guksa_name] = array('i')
+            rows.append(row_index)
+
+        return guksa_names
+
+    def _load_rows(self, after_id=0):
+        """after_id 이후 행 로딩 (변경된 국사명 집합 반환)"""
+        from db.models import TblSubLink
+
+        query = TblSubLink.query.with_entities(
+            TblSubLink.id,
+            TblSubLink.equip_id,
+            TblSubLink.equip_type,
+            TblSubLink.equip_name,
+            TblSubLink.equip_field,
+            TblSubLink.guksa_name,
+            TblSubLink.up_down,
+            TblSubLink.link_equip_id,
+            TblSubLink.link_equip_type,
+            TblSubLink.link_equip_name,
+            TblSubLink.link_equip_field,
+            TblSubLink.link_guksa_name,
+            TblSubLink.link_name,
+        ).filter(TblSubLink.id > after_id).order_by(TblSubLink.id)
+
+        touched = set()
+        for row in query.yield_per(TOPOLOGY_LOAD_BATCH_SIZE):
+            touched |= self._add_row(row)
+            self.max_id = max(self.max_id, row.id)
+
+        return touched
+
+    def _table_state(self):
+        """tbl_sub_link 행 수 / 최대 id 조회"""
+        from db.models import db, TblSubLink
+        from sqlalchemy import func
+
+        count, max_id = db.session.query(
+            func.count(TblSubLink.id), func.max(TblSubLink.id)).one()
+        return count or 0, max_id or 0
+
+    def _full_reload_due(self, now) -> bool:
+        """전체 재로딩 주기 경과 여부 (행 수정 반영용)"""
+        return bool(self.full_reload_interval) and self._loaded_at is not None \
+            and now - self._loaded_at >= self.full_reload_interval
+
+    def refresh(self, force=False):
+        """변경 확인 후 필요 시 증분/전체 로딩"""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+                return
+
+            count, max_id = self._table_state()
+
+            if force or self._checked_at is None or count < self.row_count or max_id < self.max_id \
+                    or self._full_reload_due(now):
+                # 최초 로딩, 행 삭제 또는 전체 재로딩 주기 경과 → 전체 재로딩
+                start = time.perf_counter()
+                self._reset()
+                self._load_rows()
+                self._loaded_at = time.monotonic()
+                self.version += 1
+                logger.info(
+                    f"토폴로지 그래프 전체 로딩: 링크 {len(self.row_ids)}개, 장비 {len(self.node_ids)}개, "
+                    f"{(time.perf_counter() - start) * 1000:.1f}ms")
+
+            elif count != self.row_count or max_id != self.max_id:
+                # 새로 추가된 행만 로딩
+                previous_rows = len(self.row_ids)
+                touched = self._load_rows(self.max_id)
+                for guksa_name in touched:
+                    self._link_map_cache.pop(guksa_name, None)
+                self.version += 1
+                logger.info(
+                    f"토폴로지 그래프 증분 로딩: 링크 {len(self.row_ids) - previous_rows}개 추가, 국사 {len(touched)}개 갱신")
+
+                if len(self.row_ids) != count:
+                    # id 순서가 아닌 변경(중간 삭제 후 추가 등) → 다음 확인 시 전체 재로딩
+                    logger.warning("토폴로지 그래프 행 수 불일치: 전체 재로딩 예정")
+                    self._checked_at = None
+                    self.row_count = -1
+                    return
+
+            self.row_count = count
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """다음 조회 시 전체 재로딩 (tbl_sub_link 행 수정/삭제 후 호출)"""
+        with self._lock:
+            self._checked_at = None
+            self.row_count = -1
+        logger.info("토폴로지 그래프 무효화: 다음 조회 시 전체 재로딩")
+
+    def get_link_map(self, guksa_name) -> Dict[str, List[Dict]]:
+        """
+        국사별 양방향 링크 맵 (load_links_by_guksa와 같은 형식, 읽기 전용으로 사용)
+
+        Returns:
+            dict: equip_id → [{"target_equip_id", "up_down", "link_name"}]
+        """
+        self.refresh()
+
+        link_map = self._link_map_cache.get(guksa_name)
+        if link_map is not None:
+            return link_map
+
+        with self._lock:
+            link_map = {}
+            processed_pairs = set()
+
+            for row_index in self.rows_by_guksa.get(guksa_name, ()):
+                source = self.row_source[row_index]
+                target = self.row_target[row_index]
+                link_name = self.row_link_name[row_index]
+
+                # 중복 링크 방지 (장비 쌍 정렬 + 링크명)
+                source_id = self.node_ids[source]
+                target_id = self.node_ids[target]
+                pair_key = (min(source_id, target_id), max(source_id, target_id), link_name)
+                if pair_key in processed_pairs:
+                    continue
+                processed_pairs.add(pair_key)
+
+                up_down = self.row_up_down[row_index]
+
+                # 원본 방향 / 역방향 (up_down 반대로)
+                link_map.setdefault(source_id, []).append({
+                    'target_equip_id': target_id,
+                    'up_down': up_down,
+                    'link_name': link_name
+                })
+                link_map.setdefault(target_id, []).append({
+                    'target_equip_id': source_id,
+                    'up_down': 'down' if up_down == 'up' else 'up',
+                    'link_name': link_name
+                })
+
+            self._link_map_cache[guksa_name] = link_map
+
+        return link_map
+
+    def get_equipment_info(self, equip_id) -> Optional[Dict]:
+        """장비 정보 (tbl_sub_link에서 처음 등장한 행 기준, target이면 up_down 반대)"""
+        self.refresh()
+
+        with self._lock:
+            index = self.node_index.get(equip_id)
+            if index is None:
+                return None
+
+            equip_type, equip_name, equip_field, guksa_name, up_down = self.node_info[index]
+
+        return {
+            "equip_id": equip_id,
+            "equip_type": equip_type or "UNKNOWN",
+            "equip_name": equip_name or equip_id,
+            "equip_field": equip_field or "UNKNOWN",
+            "guksa_name": guksa_name or "UNKNOWN",
+            "up_down": up_down or "unknown"
+        }
+
+    def stats(self) -> Dict:
+        """그래프 통계"""
+        return {
+            'links': len(self.row_ids),
+            'equipments': len(self.node_ids),
+            'guksa': len(self.rows_by_guksa),
+            'cached_link_maps': len(self._link_map_cache),
+            'version': self.version,
+            'max_id': self.max_id,
+            'loaded_seconds_ago': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+        }
+
+
+_topology_graph = TopologyGraph()  # DB 로딩은 최초 조회(refresh) 시
+
+
+def get_topology_graph() -> TopologyGraph:
+    """토폴로지 그래프 조회 (프로세스당 1개)"""
+    return _topology_graph
+
+
+# 연결 장비 탐색 방향 (link_map의 up_down 값 기준)
+TRAVERSAL_DIRECTIONS = {
+    'both': None,  # 상/하위 모두
+    'up': 'up',  # up_down == 'up' 연결만
+    'down': 'down',  # up_down == 'down' 연결만
+}
+TRAVERSAL_MAX_DEPTH = 200  # 요청으로 받을 수 있는 최대 탐색 깊이
+
+
+def traverse_connected_links(link_map, equip_id, direction='both', max_depth=50) -> Dict[str, Dict]:
+    """
+    중앙 장비에서 연결된 모든 링크 탐색 (반복 DFS, 재귀 없음)
+
+    재귀 구현과 같은 순서/결과를 유지합니다.
+    - 바로 이전(부모) 장비로 되돌아가는 연결은 건너뜀
+    - 이미 반대 방향으로 추가된 링크(target → source, 같은 링크명)는 제외 (set 조회)
+    - max_depth를 넘는 장비는 방문하지 않음
+
+    Args:
+        link_map (dict): equip_id → [{"target_equip_id", "up_down", "link_name"}]
+        equip_id: 중앙 장비 ID
+        direction (str): 'both' | 'up' | 'down'
+        max_depth (int): 최대 탐색 깊이
+
+    Returns:
+        dict: "source:::target:::link_name:::up_down" → {"source", "target", "link_name", "up_down"}
+    """
+    if direction not in TRAVERSAL_DIRECTIONS:
+        raise ValueError(f"지원하지 않는 탐색 방향: {direction}")
+    up_down_filter = TRAVERSAL_DIRECTIONS[direction]
+
+    result = {}
+    added_edges = set()  # (source, target, link_name)
+    visited = set()
+
+    if equip_id not in link_map or max_depth < 0:
+        return result
+
+    # (현재 장비, 깊이, 부모 장비, 연결 목록 반복자)
+    visited.add(equip_id)
+    stack = [(equip_id, 0, None, iter(link_map[equip_id]))]
+
+    while stack:
+        current_equip_id, depth, parent_equip_id, connections = stack[-1]
+
+        connection = next(connections, None)
+        if connection is None:
+            stack.pop()
+            continue
+
+        target_equip_id = connection['target_equip_id']
+        up_down = connection['up_down']
+        link_name = connection['link_name']
+
+        # 부모 노드로의 역방향 연결은 건너뛰기
+        if target_equip_id == parent_equip_id:
+            continue
+
+        if up_down_filter is not None and up_down != up_down_filter:
+            continue
+
+        # 이미 같은 링크가 반대 방향으로 있으면 건너뛰기
+        if (target_equip_id, current_equip_id, link_name) not in added_edges:
+            added_edges.add((current_equip_id, target_equip_id, link_name))
+            result[f"{current_equip_id}:::{target_equip_id}:::{link_name}:::{up_down}"] = {
+                'source': current_equip_id,
+                'target': target_equip_id,
+                'link_name': link_name,
+                'up_down': up_down
+            }
+
+        # 하위 노드 탐색 (현재 노드를 부모로 전달)
+        if target_equip_id in visited or depth + 1 > max_depth:
+            continue
+
+        visited.add(target_equip_id)
+        stack.append((target_equip_id, depth + 1, current_equip_id,
+                      iter(link_map.get(target_equip_id, ()))))
+
+    return result
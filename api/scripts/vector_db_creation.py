@@ -3,19 +3,69 @@
 
 이 모듈은 JSON 형식의 장애사례 데이터를 읽어 
 ChromaDB 벡터 데이터베이스로 최적화하여 저장합니다.
+
+실행: python -m api.scripts.vector_db_creation [--incremental | --resume-from CHECKPOINT] [--no-activate]
+                                              [--no-embedding-cache]
+     (임베딩 백엔드는 EMBEDDING_BACKEND 환경변수로 선택, 원본은 RAG_DOCUMENT의 .json 배열 또는 .jsonl)
+
+적재는 항상 새 버전 디렉토리(VECTOR_DB_ROOT/<버전>)에서 이루어지고 완료 후 활성 버전(active.json)을 전환하므로
+실행 중인 서버는 재시작 없이 새 버전으로 교체됩니다 (vector_db_versions 참고).
+
+원본은 스트리밍으로 읽어 묶음(INGEST_WINDOW_CASES) 단위로 청크 생성/임베딩/저장하므로
+메모리 사용량은 사례 수가 아니라 묶음 크기에 비례합니다.
+
+--incremental: 활성 버전을 새 버전으로 복사한 뒤 새로 추가/변경된 사례만 임베딩하여 upsert하고
+               rag_data.json에서 삭제된 사례는 컬렉션에서 제거 (장애번호별 내용 해시 manifest 기준)
+--resume-from: 중단된 전체 생성을 체크포인트(버전 디렉토리의 ingest_checkpoint.json) 다음 사례부터 이어서 적재
+--no-activate: 적재만 하고 전환은 POST /api/vector_db/activate로 수행
+
+원본은 버전 디렉토리에 사례 스냅샷(fault_cases.json/.jsonl)으로 복사한 뒤 스냅샷에서 읽으며,
+서버의 어휘 색인(lexical_index)도 활성 버전의 스냅샷을 사용하므로 두 검색이 같은 사례 집합을 봅니다.
+
+문서 임베딩은 (모델 + 텍스트) 해시 기준 영구 캐시(EMBEDDING_CACHE_PATH, embedding_cache)를 거치므로
+재생성 시 새로 추가/변경된 텍스트만 인코딩합니다 (--no-embedding-cache로 끌 수 있음).
+
+적재 후 같은 버전 디렉토리에 NumPy 전수 비교 저장소(numpy_store, NUMPY_STORE_DTYPE 형식)를 함께 생성합니다
+(서버에서 VECTOR_DB_BACKEND=numpy로 사용, numpy_vector_store 참고).
 """
 
 import os
 import json
+import argparse
 import chromadb
-from chromadb.utils import embedding_functions
-import uuid
-import shutil
 import re
 import logging
 from tqdm import tqdm
 import time
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from api.scripts.embedding_backends import create_embedding_backend
+from api.scripts.embedding_cache import CachedEmbeddingFunction, get_embedding_cache
+from api.scripts.fault_case_loader import iter_fault_cases, source_fingerprint
+from api.scripts.fault_prediction_utils import build_rerank_features
+from api.scripts.lexical_index import case_content_hash
+from api.scripts.numpy_vector_store import export_numpy_store
+from api.scripts.sector_partitions import (
+    ALL_PARTITIONS,
+    backfill_sector_partitions,
+    create_sector_partitions,
+    delete_from_partitions,
+    group_by_partition,
+    open_sector_partitions,
+    partition_for_field,
+)
+from api.scripts.vector_db_versions import (
+    activate_version,
+    clone_version,
+    create_version_dir,
+    find_case_snapshot,
+    resolve_active_db_dir,
+    snapshot_cases,
+)
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,11 +76,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # 상수 정의
-VECTOR_DB_DIR = "./chroma_db"
-VECTOR_DB_NEW_DIR = "./chroma_db_new"
-RAG_DOCUMENT = r"D:\aidetector\static\rag_document\rag_data.json"
+RAG_DOCUMENT = os.getenv("RAG_DOCUMENT", r"D:\aidetector\static\rag_document\rag_data.json")
 EMBEDDING_MODEL = "intfloat/multilingual-e5-base"  # 임베딩 모델 선택
-BATCH_SIZE = 20  # 너무 크면 ChromaDB에서 OOM 에러 발생 가능
+INGEST_MANIFEST_FILE = "ingest_manifest.json"  # 장애번호별 내용 해시/문서 ID 기록 (DB 디렉토리에 저장)
+INGEST_CHECKPOINT_FILE = "ingest_checkpoint.json"  # 전체 생성 진행 위치 (--resume-from으로 재개)
+INGEST_WINDOW_CASES = int(os.getenv("INGEST_WINDOW_CASES", "256"))  # 파이프라인 1묶음 사례 수 (메모리 상한)
+INGEST_WRITE_BATCH = 2000  # Chroma add/upsert 1회 최대 문서 수 (임베딩은 미리 계산하여 전달)
+INGEST_PROCESS_WORKERS = int(os.getenv("INGEST_PROCESS_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
 
 # 분야별 키워드 맵 - 추론 개선을 위한 추가 데이터
 FIELD_KEYWORDS = {
@@ -69,30 +121,14 @@ FIELD_KEYWORDS = {
     ],
 }
 
-def create_chroma_client():
-    """ChromaDB 클라이언트 생성 및 설정"""
-    db_dir = VECTOR_DB_DIR
-    try:
-        if os.path.exists(db_dir):
-            logger.info(f"기존 DB 디렉토리 제거: {db_dir}")
-            shutil.rmtree(db_dir)
-    except Exception as e:
-        logger.error(f"주 DB 경로 오류: {e}, 대체 경로 사용")
-        db_dir = VECTOR_DB_NEW_DIR
-
-    os.makedirs(db_dir, exist_ok=True)
+def create_chroma_client(db_dir):
+    """ChromaDB 클라이언트 생성 (버전 디렉토리)"""
     logger.info(f"DB 디렉토리: {db_dir}")
-
     try:
-        client = chromadb.PersistentClient(path=db_dir)
-        try:
-            client.delete_collection("nw_incidents")
-        except:
-            pass
-        return client, db_dir
+        return chromadb.PersistentClient(path=db_dir)
     except Exception as e:
         logger.error(f"Chroma 클라이언트 오류: {e}")
-        return None, None
+        return None
 
 
 def extract_alert_codes(alert_text):
@@ -203,6 +239,10 @@ def create_metadata(fault_case):
                 metadata["접수키워드"] = ", ".join(extract_key_phrases(fault_case[key]))
             elif key == "장애분석":
                 metadata["분석키워드"] = ", ".join(extract_key_phrases(fault_case[key]))
+
+    # 하이브리드 재순위용 특징 사전 계산 (정규화 텍스트, 경보 코드, 분야)
+    metadata.update(build_rerank_features(
+        metadata.get("경보현황", ""), metadata.get("장애분석", ""), metadata.get("장애접수내역", "")))
     
     return metadata
 
@@ -269,89 +309,375 @@ def create_documents(fault_case):
     return docs
 
 
+def make_chunk_id(fault_number, doc_type):
+    """문서 ID 생성 (장애번호 + 문서 유형, 재실행해도 같은 ID)"""
+    return f"{fault_number}_{doc_type}"
+
+
+def build_case_chunks(case):
+    """사례 하나의 청크 목록 생성 (메타데이터에 내용 해시 포함)"""
+    metadata = create_metadata(case)
+    metadata["content_hash"] = case_content_hash(case)
+
+    return [{
+        "id": make_chunk_id(case['장애번호'], doc["type"]),
+        "text": doc["text"],
+        "metadata": {**metadata, "doc_type": doc["type"]}
+    } for doc in create_documents(case)]
+
+
+def dedupe_fault_cases(fault_cases):
+    """장애번호 중복 제거 (같은 장애번호는 마지막 사례 사용)"""
+    unique_cases = {}
+    for case in fault_cases:
+        fault_number = case.get('장애번호')
+        if fault_number in (None, ""):
+            logger.warning(f"장애번호 없는 사례 제외: {case.get('장애명', '')}")
+            continue
+        if fault_number in unique_cases:
+            logger.warning(f"중복 장애번호 {fault_number}: 마지막 사례 사용")
+        unique_cases[fault_number] = case
+    return list(unique_cases.values())
+
+
 def create_embedding_chunks(fault_cases):
     """효율적인 임베딩을 위한 청크 생성"""
     all_chunks = []
     
     for case in fault_cases:
-        metadata = create_metadata(case)
-        documents = create_documents(case)
-        
-        for doc in documents:
-            doc_id = f"{case['장애번호']}_{doc['type']}_{uuid.uuid4()}"
-            all_chunks.append({
-                "id": doc_id,
-                "text": doc["text"],
-                "metadata": {**metadata, "doc_type": doc["type"]}
-            })
+        all_chunks.extend(build_case_chunks(case))
     
     return all_chunks
 
 
-def batch_save_to_db(collection, chunks, batch_size=BATCH_SIZE):
-    """배치 처리를 통한 DB 저장 최적화"""
-    total_chunks = len(chunks)
-    total_batches = (total_chunks + batch_size - 1) // batch_size
-    
-    for i in tqdm(range(0, total_chunks, batch_size), desc="벡터DB 저장", total=total_batches):
-        batch = chunks[i:i+batch_size]
-        
-        batch_ids = [item["id"] for item in batch]
-        batch_docs = [item["text"] for item in batch]
-        batch_metadatas = [item["metadata"] for item in batch]
-        
-        try:
-            collection.add(
-                ids=batch_ids,
-                documents=batch_docs,
-                metadatas=batch_metadatas,
-            )
-            logger.info(f"✅ {len(batch_ids)}건 저장 완료")
-        except Exception as e:
-            logger.error(f"🔥 배치 저장 오류: {e}")
-            time.sleep(1)  # 오류 발생 시 잠시 대기
+def build_window_chunks(fault_cases):
+    """사례 묶음의 청크 생성 (프로세스 풀 작업 단위, 묶음 안 장애번호 중복은 마지막 사례 사용)"""
+    return create_embedding_chunks(dedupe_fault_cases(fault_cases))
+
+
+def iter_windows(fault_cases, window_cases):
+    """사례 스트림을 window_cases 크기 묶음으로 나누기"""
+    iterator = iter(fault_cases)
+    while True:
+        window = list(islice(iterator, window_cases))
+        if not window:
+            return
+        yield window
+
+
+def encode_texts(embedding_function, texts):
+    """문서 임베딩 (백엔드의 encode로 큰 배치 인코딩)"""
+    encode = getattr(embedding_function, "encode", None)
+    return encode(texts) if encode else embedding_function(texts)
+
+
+def write_chunks(write, chunks, embeddings):
+    """
+    사전 계산된 임베딩과 함께 Chroma에 저장 (실패 시 절반으로 나눠 재시도, 재임베딩 없음)
+
+    Returns:
+        list: 저장에 실패한 문서 ID
+    """
+    try:
+        write(
+            ids=[chunk["id"] for chunk in chunks],
+            documents=[chunk["text"] for chunk in chunks],
+            metadatas=[chunk["metadata"] for chunk in chunks],
+            embeddings=embeddings,
+        )
+        return []
+    except Exception as e:
+        if len(chunks) == 1:
+            logger.error(f"🔥 단건 저장 오류 ({chunks[0]['id']}): {e}")
+            return [chunks[0]["id"]]
+
+        logger.warning(f"배치 저장 오류 ({len(chunks)}건), 나눠서 재시도: {e}")
+        half = len(chunks) // 2
+        return (write_chunks(write, chunks[:half], embeddings[:half])
+                + write_chunks(write, chunks[half:], embeddings[half:]))
+
+
+def write_partition_chunks(partitions, mode, chunks, embeddings, skip_ids, write_batch):
+    """
+    본 컬렉션에 저장된 청크를 분야별 파티션에도 같은 임베딩으로 저장
+
+    Returns:
+        list: 파티션 저장에 실패한 문서 ID
+    """
+    failed = []
+    for partition, indices in group_by_partition(chunks).items():
+        indices = [i for i in indices if chunks[i]["id"] not in skip_ids]
+        write = getattr(partitions[partition], mode)
+        for start in range(0, len(indices), write_batch):
+            batch = indices[start:start + write_batch]
+            failed += write_chunks(write, [chunks[i] for i in batch], [embeddings[i] for i in batch])
+    return failed
+
+
+def pipelined_ingest(collection, fault_cases, embedding_function, mode="add", on_window_written=None,
+                     window_cases=INGEST_WINDOW_CASES, process_workers=INGEST_PROCESS_WORKERS, partitions=None):
+    """
+    파이프라인 적재: 청크 생성(프로세스 풀) → 대용량 배치 인코딩 → Chroma 저장(별도 스레드)
+
+    fault_cases는 리스트 또는 스트림(iter_fault_cases 등)이며 window_cases 단위로 흘려보냅니다.
+    생성은 2개 묶음까지만 미리, 저장 대기는 2개 묶음까지만 두어 메모리 사용량이 코퍼스 크기와 무관하게 유지됩니다.
+
+    Args:
+        mode: "add" 또는 "upsert" (같은 장애번호가 여러 묶음에 나올 수 있으면 upsert)
+        on_window_written: 묶음 저장 후 호출 (chunks, 실패 문서 ID 목록, 지금까지 저장된 입력 사례 수),
+                           저장 스레드에서 입력 순서대로 실행
+        partitions: 분야별 파티션 컬렉션 (sector_partitions, 지정 시 같은 임베딩으로 함께 저장)
+
+    Returns:
+        dict: 처리량 통계 (docs/s, embeddings/s, 단계별 시간)
+    """
+    write = collection.upsert if mode == "upsert" else collection.add
+    write_batch = min(INGEST_WRITE_BATCH, collection._client.get_max_batch_size()) \
+        if hasattr(collection, "_client") else INGEST_WRITE_BATCH
+    total = len(fault_cases) if hasattr(fault_cases, "__len__") else None
+
+    stats = {"cases": 0, "documents": 0, "failed": 0,
+             "build_time": 0.0, "encode_time": 0.0, "write_time": 0.0}
+    write_queue = queue.Queue(maxsize=2)
+    writer_errors = []
+
+    def writer():
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+            chunks, embeddings, cases_done = item
+            if writer_errors:
+                continue  # 오류 발생 후에는 남은 묶음을 비우기만 함
+
             try:
-                # 단건 저장 시도
-                for j in range(len(batch_ids)):
-                    try:
-                        collection.add(
-                            ids=[batch_ids[j]],
-                            documents=[batch_docs[j]],
-                            metadatas=[batch_metadatas[j]],
-                        )
-                    except Exception as e2:
-                        logger.error(f"🔥 단건 저장 오류: {e2}")
-            except:
-                logger.error("단건 저장도 실패")
-                pass
-
-
-def preprocess_cases_parallel(fault_cases, max_workers=4):
-    """병렬 처리를 통한 사례 전처리 최적화"""
-    all_chunks = []
-    
-    def process_case(case):
-        metadata = create_metadata(case)
-        documents = create_documents(case)
-        case_chunks = []
-        
-        for doc in documents:
-            doc_id = f"{case['장애번호']}_{doc['type']}_{uuid.uuid4()}"
-            case_chunks.append({
-                "id": doc_id,
-                "text": doc["text"],
-                "metadata": {**metadata, "doc_type": doc["type"]}
-            })
-        
-        return case_chunks
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        chunk_lists = list(executor.map(process_case, fault_cases))
-    
-    for chunk_list in chunk_lists:
-        all_chunks.extend(chunk_list)
-    
-    return all_chunks
+                start = time.perf_counter()
+                failed = []
+                for i in range(0, len(chunks), write_batch):
+                    failed += write_chunks(write, chunks[i:i + write_batch], embeddings[i:i + write_batch])
+                stats["documents"] += len(chunks) - len(failed)
+                if partitions:
+                    failed += write_partition_chunks(partitions, mode, chunks, embeddings, set(failed), write_batch)
+                stats["write_time"] += time.perf_counter() - start
+                stats["failed"] += len(set(failed))
+
+                if on_window_written:
+                    on_window_written(chunks, failed, cases_done)
+            except Exception as e:
+                writer_errors.append(e)
+
+    # 사례 수가 적으면 프로세스 풀 기동 비용이 더 크므로 현재 프로세스에서 생성
+    use_pool = process_workers > 1 and (total is None or total > window_cases)
+    pool = ProcessPoolExecutor(max_workers=process_workers) if use_pool else None
+
+    def submit(window):
+        stats["cases"] += len(window)
+        if pool:
+            future = pool.submit(build_window_chunks, window)
+        else:
+            future = Future()
+            future.set_result(build_window_chunks(window))
+        return future, stats["cases"]
+
+    start_time = time.perf_counter()
+    writer_thread = threading.Thread(target=writer, name="VectorDbWriter", daemon=True)
+    writer_thread.start()
+
+    try:
+        window_iter = iter_windows(fault_cases, window_cases)
+        pending = deque(submit(window) for window in islice(window_iter, 2))
+
+        with tqdm(total=total, desc="벡터DB 저장") as progress:
+            cases_written = 0
+            while pending:
+                start = time.perf_counter()
+                future, cases_done = pending.popleft()
+                chunks = future.result()
+                next_window = next(window_iter, None)
+                if next_window is not None:
+                    pending.append(submit(next_window))
+                stats["build_time"] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                embeddings = encode_texts(embedding_function, [chunk["text"] for chunk in chunks])
+                stats["encode_time"] += time.perf_counter() - start
+
+                write_queue.put((chunks, embeddings, cases_done))
+                progress.update(cases_done - cases_written)
+                cases_written = cases_done
+                if writer_errors:
+                    break
+    finally:
+        write_queue.put(None)
+        writer_thread.join()
+        if pool:
+            pool.shutdown()
+
+    if writer_errors:
+        raise writer_errors[0]
+
+    elapsed = time.perf_counter() - start_time
+    stats["elapsed"] = elapsed
+    stats["docs_per_sec"] = stats["documents"] / elapsed if elapsed else 0.0
+    stats["embeddings_per_sec"] = (stats["documents"] + stats["failed"]) / stats["encode_time"] \
+        if stats["encode_time"] else 0.0
+    logger.info(f"적재 처리량: 문서 {stats['documents']}건 {stats['docs_per_sec']:.1f} docs/s, "
+                f"인코딩 {stats['embeddings_per_sec']:.1f} embeddings/s "
+                f"(생성 대기 {stats['build_time']:.1f}s, 인코딩 {stats['encode_time']:.1f}s, "
+                f"저장 {stats['write_time']:.1f}s, 전체 {elapsed:.1f}s)")
+    return stats
+
+
+def build_manifest(chunks):
+    """청크 목록으로 manifest 구성 (장애번호 → 내용 해시, 분야별 파티션, 문서 ID 목록)"""
+    manifest = {}
+    for chunk in chunks:
+        entry = manifest.setdefault(str(chunk["metadata"]["장애번호"]), {
+            "fault_number": chunk["metadata"]["장애번호"],
+            "hash": chunk["metadata"].get("content_hash"),
+            "partition": partition_for_field(chunk["metadata"].get("장애분야")),
+            "ids": [],
+        })
+        entry["ids"].append(chunk["id"])
+    return manifest
+
+
+def load_manifest(db_dir, collection):
+    """manifest 로드 (없으면 컬렉션 메타데이터에서 재구성)"""
+    path = os.path.join(db_dir, INGEST_MANIFEST_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"manifest 로드 오류, 컬렉션에서 재구성: {e}")
+
+    existing = collection.get(include=["metadatas"])
+    manifest = build_manifest([{"id": chunk_id, "metadata": metadata}
+                               for chunk_id, metadata in zip(existing["ids"], existing["metadatas"])
+                               if metadata and metadata.get("장애번호") not in (None, "")])
+    logger.info(f"manifest 재구성: 사례 {len(manifest)}건 (기존 문서 {len(existing['ids'])}개)")
+    return manifest
+
+
+def save_manifest(db_dir, manifest):
+    """manifest 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = os.path.join(db_dir, INGEST_MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """전체 생성 체크포인트 로드 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"체크포인트 로드 오류 ({path}): {e}")
+        return None
+
+
+def save_checkpoint(db_dir, checkpoint):
+    """전체 생성 체크포인트 저장 (원본 파일 정보, 저장 완료된 입력 사례 수)"""
+    path = os.path.join(db_dir, INGEST_CHECKPOINT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def make_manifest_updater(collection, db_dir, manifest, checkpoint=None, partitions=None):
+    """
+    pipelined_ingest의 묶음 저장 콜백 생성
+
+    저장된 사례를 manifest에 반영하고 내용 변경으로 없어진 섹션 문서(분야가 바뀐 경우 이전 파티션 문서)를 삭제한 뒤
+    manifest(및 체크포인트)를 저장합니다. 저장에 실패한 사례는 반영하지 않습니다 (다음 실행에서 다시 처리).
+    """
+    start_offset = checkpoint["cases_done"] if checkpoint else 0
+
+    def on_window_written(chunks, failed_ids, cases_done):
+        failed_keys = {str(chunk["metadata"]["장애번호"]) for chunk in chunks if chunk["id"] in failed_ids}
+        window_manifest = {key: entry for key, entry in build_manifest(chunks).items() if key not in failed_keys}
+
+        stale_ids = []
+        for key, entry in window_manifest.items():
+            previous = manifest.get(key)
+            if previous is None:
+                continue
+            ids = [chunk_id for chunk_id in previous["ids"] if chunk_id not in entry["ids"]]
+            stale_ids += ids
+
+            previous_partition = previous.get("partition", ALL_PARTITIONS)
+            if previous_partition != entry["partition"]:
+                delete_from_partitions(partitions, previous["ids"], previous_partition)
+            else:
+                delete_from_partitions(partitions, ids, previous_partition)
+        if stale_ids:
+            collection.delete(ids=stale_ids)
+
+        manifest.update(window_manifest)
+        save_manifest(db_dir, manifest)
+
+        if checkpoint is not None:
+            checkpoint["cases_done"] = start_offset + cases_done
+            save_checkpoint(db_dir, checkpoint)
+
+    return on_window_written
+
+
+def ingest_incremental(collection, fault_cases, db_dir, embedding_function, partitions=None):
+    """
+    증분 적재: 새로 추가/변경된 사례만 임베딩하여 upsert, 삭제된 사례 제거
+
+    fault_cases는 스트림으로 한 번만 순회하며 변경된 사례만 파이프라인으로 흘려보냅니다.
+    저장 묶음마다 manifest를 저장하여 중단 후 재실행해도 남은 사례만 처리합니다.
+
+    Returns:
+        dict: 추가/변경/삭제/유지 사례 수와 upsert 문서 수
+    """
+    manifest = load_manifest(db_dir, collection)
+    known_keys = set(manifest)
+    seen_keys = set()
+    counts = {"added": 0, "changed": 0, "unchanged": 0}
+
+    def iter_changed_cases():
+        for case in fault_cases:
+            fault_number = case.get('장애번호')
+            if fault_number in (None, ""):
+                logger.warning(f"장애번호 없는 사례 제외: {case.get('장애명', '')}")
+                continue
+
+            key = str(fault_number)
+            duplicate = key in seen_keys
+            if duplicate:
+                logger.warning(f"중복 장애번호 {fault_number}: 마지막 사례 사용")
+            seen_keys.add(key)
+
+            entry = manifest.get(key)
+            if entry is not None and entry.get("hash") == case_content_hash(case):
+                counts["unchanged"] += not duplicate
+                continue
+            if not duplicate:
+                counts["added" if key not in known_keys else "changed"] += 1
+            yield case
+
+    stats = pipelined_ingest(collection, iter_changed_cases(), embedding_function, mode="upsert",
+                             on_window_written=make_manifest_updater(collection, db_dir, manifest,
+                                                                     partitions=partitions),
+                             partitions=partitions)
+
+    removed_keys = [key for key in manifest if key not in seen_keys]
+    if removed_keys:
+        removed_ids = [chunk_id for key in removed_keys for chunk_id in manifest[key]["ids"]]
+        collection.delete(ids=removed_ids)
+        for key in removed_keys:
+            entry = manifest.pop(key)
+            delete_from_partitions(partitions, entry["ids"], entry.get("partition", ALL_PARTITIONS))
+        save_manifest(db_dir, manifest)
+
+    return {**counts, "removed": len(removed_keys), "upserted_documents": stats["documents"]}
 
 
 def optimize_collection(collection):
@@ -366,60 +692,150 @@ def optimize_collection(collection):
         logger.warning(f"인덱스 최적화 중 오류 (무시 가능): {e}")
 
 
-def main():
-    """메인 실행 함수"""
+def main(incremental=False, resume_from=None, activate=True, use_embedding_cache=True):
+    """
+    메인 실행 함수
+
+    실행 중인 서버가 사용하는 DB는 건드리지 않고 새 버전 디렉토리에 적재한 뒤 활성 버전으로 전환합니다.
+
+    Args:
+        incremental: True면 활성 버전을 복사하여 변경분만 반영
+        resume_from: 중단된 전체 생성의 체크포인트 파일 경로 (저장 완료된 사례 다음부터 이어서 적재)
+        activate: False면 적재만 하고 전환은 관리 API(/api/vector_db/activate)로 수행
+        use_embedding_cache: False면 임베딩 캐시(embedding_cache)를 거치지 않고 모든 문서를 인코딩
+    """
     start_time = time.time()
     
-    # 1. JSON 파일 로드
+    # 1. 원본 파일 확인 (.json 배열 또는 .jsonl, 스트리밍으로 읽음)
     json_path = RAG_DOCUMENT
     if not os.path.exists(json_path):
         logger.error(f"JSON 파일을 찾을 수 없습니다: {json_path}")
         return
 
-    # 2. ChromaDB 클라이언트 생성
-    client, db_dir = create_chroma_client()
+    checkpoint = None
+    if resume_from:
+        checkpoint = load_checkpoint(resume_from)
+        if checkpoint is None:
+            return
+        if checkpoint.get("source") != source_fingerprint(json_path):
+            logger.error("체크포인트 이후 원본 파일이 변경되어 이어서 적재할 수 없습니다 "
+                         "(전체 재생성 또는 --incremental 사용)")
+            return
+        if checkpoint.get("completed"):
+            logger.info(f"이미 완료된 적재입니다: {resume_from}")
+            return
+        logger.info(f"체크포인트에서 재개: 입력 사례 {checkpoint['cases_done']}건 이후부터")
+
+    # 2. 적재할 버전 디렉토리 (전체: 새 버전, 증분: 활성 버전 복사본, 재개: 체크포인트의 버전)
+    if checkpoint:
+        db_dir = os.path.dirname(os.path.abspath(resume_from))
+        version = os.path.basename(db_dir)
+    elif incremental:
+        active_version, active_dir = resolve_active_db_dir()
+        if active_version is None:
+            logger.error("증분 적재할 활성 벡터DB가 없습니다 (전체 생성 먼저 실행)")
+            return
+        version, db_dir = clone_version(active_dir)
+    else:
+        version, db_dir = create_version_dir()
+
+    # 원본 사례 스냅샷 (적재는 스냅샷에서 읽고 서버 어휘 색인도 같은 스냅샷을 사용, 재개 시에는 처음 만든 스냅샷 사용)
+    cases_path = find_case_snapshot(db_dir) if checkpoint else None
+    if cases_path is None:
+        cases_path = snapshot_cases(json_path, db_dir)
+
+    # 3. ChromaDB 클라이언트 생성
+    client = create_chroma_client(db_dir)
     if not client:
         return
 
-    # 3. 임베딩 함수 설정
-    ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=EMBEDDING_MODEL
+    # 4. 임베딩 함수 설정 (질의와 같은 백엔드, EMBEDDING_BACKEND로 선택)
+    #    텍스트가 같은 문서는 임베딩 캐시에서 재사용 (청크/메타데이터/인덱스 설정만 바뀐 재생성은 인코딩 없음)
+    ef = create_embedding_backend(model_name=EMBEDDING_MODEL)
+    if use_embedding_cache:
+        ef = CachedEmbeddingFunction(ef, get_embedding_cache())
+
+    # 5. 컬렉션 생성 (이미 있으면 그대로 사용)
+    collection = client.get_or_create_collection(
+        name="nw_incidents",
+        embedding_function=ef,
+        metadata={"description": "통신장비 장애사례 데이터"},
     )
 
-    # 4. 컬렉션 생성
-    try:
-        collection = client.create_collection(
-            name="nw_incidents",
-            embedding_function=ef,
-            metadata={"description": "통신장비 장애사례 데이터"},
-        )
-    except:
-        collection = client.get_collection(name="nw_incidents", embedding_function=ef)
+    # 분야별 파티션 컬렉션 (파티션 이전 버전을 복사한 경우 본 컬렉션 문서를 복사하여 생성)
+    partitions = open_sector_partitions(client, ef)
+    if partitions is None:
+        partitions = create_sector_partitions(client, ef, metadata=collection.metadata)
+        backfill_sector_partitions(collection, partitions, INGEST_WRITE_BATCH)
+
+    # 6. 데이터 스트림 (전체를 메모리에 올리지 않고 묶음 단위로 처리)
+    fault_cases = iter_fault_cases(cases_path)
 
-    # 5. 데이터 로드
     try:
-        with open(json_path, "r", encoding="utf-8-sig") as f:
-            fault_cases = json.load(f)
-            logger.info(f"장애사례 {len(fault_cases)}건 로드 완료")
+        if incremental:
+            result = ingest_incremental(collection, fault_cases, db_dir, ef, partitions)
+            logger.info(f"증분 적재 완료: {result}, 버전: {version}")
+        else:
+            # 7~8. 청크 생성(프로세스 풀) → 대용량 배치 인코딩 → DB 저장 파이프라인
+            #      묶음마다 manifest와 체크포인트를 저장하며, 재개 시 다시 저장되는 묶음은 upsert로 덮어씀
+            if checkpoint:
+                manifest = load_manifest(db_dir, collection)
+                fault_cases = islice(fault_cases, checkpoint["cases_done"], None)
+            else:
+                manifest = {}
+                checkpoint = {"source": source_fingerprint(json_path), "cases_done": 0, "completed": False}
+                save_checkpoint(db_dir, checkpoint)
+
+            stats = pipelined_ingest(collection, fault_cases, ef, mode="upsert",
+                                     on_window_written=make_manifest_updater(collection, db_dir, manifest, checkpoint,
+                                                                             partitions),
+                                     partitions=partitions)
+
+            checkpoint["completed"] = True
+            save_checkpoint(db_dir, checkpoint)
+
+            # 9. 컬렉션 최적화
+            optimize_collection(collection)
+            logger.info(f"총 {stats['documents']}건 문서가 저장되었습니다 (사례 {checkpoint['cases_done']}건). "
+                        f"버전: {version}, DB 위치: {db_dir}")
     except Exception as e:
-        logger.error(f"JSON 로드 오류: {e}")
+        # 원본 파싱(ValueError)/파일(OSError) 외 인코더·DB 저장 오류는 원인 확인을 위해 traceback 포함
+        logger.error(f"적재 오류: {type(e).__name__}: {e}", exc_info=not isinstance(e, (OSError, ValueError)))
         return
+    finally:
+        # 중단(예외, Ctrl+C 포함)된 전체 생성은 저장된 체크포인트에서 이어서 적재 가능
+        if checkpoint and not checkpoint.get("completed"):
+            logger.error(f"--resume-from {os.path.join(db_dir, INGEST_CHECKPOINT_FILE)} 로 이어서 적재할 수 있습니다")
 
-    # 6. 병렬 처리로 청크 생성
-    all_chunks = preprocess_cases_parallel(fault_cases)
-    logger.info(f"총 {len(all_chunks)}개 청크 생성 완료")
+    # 10. NumPy 전수 비교 저장소 내보내기 (VECTOR_DB_BACKEND=numpy 서버용, 실패해도 Chroma 컬렉션은 사용 가능)
+    try:
+        export_numpy_store(collection, db_dir)
+    except (OSError, ValueError) as e:
+        logger.warning(f"NumPy 저장소 생성 실패 (Chroma 검색은 영향 없음): {e}")
 
-    # 7. 배치 처리로 DB 저장
-    batch_save_to_db(collection, all_chunks, BATCH_SIZE)
+    # 11. 활성 버전 전환 (서버는 active.json 변경을 감지하여 새 버전으로 교체)
+    if activate:
+        activate_version(version)
+    else:
+        logger.info(f"활성 버전 전환 생략: POST /api/vector_db/activate {{\"version\": \"{version}\"}}")
 
-    # 8. 컬렉션 최적화
-    optimize_collection(collection)
+    if use_embedding_cache:
+        cache_stats = ef.cache.stats()
+        logger.info(f"임베딩 캐시: 적중 {cache_stats['hits']}건, 인코딩 {cache_stats['misses']}건 "
+                    f"(적중률 {cache_stats['hit_rate']:.1%}), 전체 {cache_stats['entries']}건 ({cache_stats['path']})")
 
-    end_time = time.time()
-    total_time = end_time - start_time
-    logger.info(f"총 {len(all_chunks)}건 문서가 저장되었습니다. DB 위치: {db_dir}")
-    logger.info(f"처리 시간: {total_time:.2f}초")
+    logger.info(f"처리 시간: {time.time() - start_time:.2f}초")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="장애사례 벡터DB 생성")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true", help="변경된 사례만 반영 (활성 버전 복사본에 적용)")
+    mode.add_argument("--resume-from", metavar="CHECKPOINT",
+                      help=f"중단된 전체 생성 재개 (버전 디렉토리의 {INGEST_CHECKPOINT_FILE})")
+    parser.add_argument("--no-activate", action="store_true", help="적재 후 활성 버전으로 전환하지 않음")
+    parser.add_argument("--no-embedding-cache", action="store_true", help="임베딩 캐시를 사용하지 않고 전체 인코딩")
+    args = parser.parse_args()
+
+    main(incremental=args.incremental, resume_from=args.resume_from, activate=not args.no_activate,
+         use_embedding_cache=not args.no_embedding_cache)
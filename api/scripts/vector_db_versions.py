@@ -0,0 +1,193 @@
+"""
+벡터DB 버전 관리 모듈 (blue/green 전환)
+
+벡터DB를 실행 중인 서버 밑에서 지우고 다시 만드는 대신 버전별 디렉토리에 생성한 뒤
+활성 버전 파일(active.json)을 원자적으로 교체하여 전환합니다.
+
+    VECTOR_DB_ROOT/
+        active.json            {"version", "path", "activated_at", "previous"}
+        20261017-093000/       Chroma PersistentClient 디렉토리 (버전별)
+            fault_cases.json   적재한 원본 사례 스냅샷 (어휘 색인이 같은 사례 집합을 사용)
+        20261017-120500/
+
+- 생성(vector_db_creation): 새 버전 디렉토리에 적재 후 activate_version
+- 서버(fault_prediction_core_4): active.json 변경을 감지하면 새 컬렉션으로 교체 (진행 중 요청은 이전 버전 사용)
+- active.json이 없으면 기존 경로(./chroma_db, ./chroma_db_new)를 그대로 사용
+"""
+
+import os
+import re
+import json
+import shutil
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+VECTOR_DB_ROOT = os.getenv("VECTOR_DB_ROOT", "./chroma_versions")
+VECTOR_DB_DIR = "./chroma_db"  # 버전 관리 이전 경로 (active.json이 없을 때 사용)
+VECTOR_DB_NEW_DIR = "./chroma_db_new"
+ACTIVE_VERSION_FILE = "active.json"
+VECTOR_DB_KEEP_VERSIONS = int(os.getenv("VECTOR_DB_KEEP_VERSIONS", "3"))  # 보관할 버전 수 (활성/직전 버전은 항상 보관)
+LEGACY_VERSION = "legacy"
+CASE_SNAPSHOT_NAME = "fault_cases"  # 버전 디렉토리의 원본 사례 스냅샷 파일명 (확장자는 원본과 동일)
+CASE_SNAPSHOT_EXTENSIONS = (".json", ".jsonl", ".ndjson")
+
+_VERSION_PATTERN = re.compile(r"^\d{8}-\d{6}(?:-\d+)?$")
+
+
+def read_active_version(root=VECTOR_DB_ROOT) -> Optional[Dict]:
+    """활성 버전 정보 조회 (없거나 읽을 수 없으면 None)"""
+    path = os.path.join(root, ACTIVE_VERSION_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"활성 버전 파일 로드 오류 ({path}): {e}")
+        return None
+
+
+def resolve_active_db_dir(root=VECTOR_DB_ROOT) -> Tuple[Optional[str], Optional[str]]:
+    """
+    현재 사용할 벡터DB 경로 조회
+
+    Returns:
+        tuple: (버전, DB 디렉토리), active.json이 없으면 기존 경로("legacy"), 찾을 수 없으면 (None, None)
+    """
+    active = read_active_version(root)
+    if active:
+        path = os.path.join(root, active.get("version", ""))
+        if os.path.isdir(path):
+            return active["version"], path
+        logger.error(f"활성 버전 디렉토리를 찾을 수 없습니다: {path}")
+        return None, None
+
+    for legacy_dir in (VECTOR_DB_DIR, VECTOR_DB_NEW_DIR):
+        if os.path.exists(legacy_dir):
+            return LEGACY_VERSION, legacy_dir
+
+    return None, None
+
+
+def create_version_dir(root=VECTOR_DB_ROOT) -> Tuple[str, str]:
+    """새 버전 디렉토리 생성 (버전명: 생성 시각)"""
+    os.makedirs(root, exist_ok=True)
+    base = datetime.now().strftime("%Y%m%d-%H%M%S")
+    version = base
+    suffix = 1
+    while True:
+        path = os.path.join(root, version)
+        try:
+            os.makedirs(path)
+            return version, path
+        except FileExistsError:
+            suffix += 1
+            version = f"{base}-{suffix}"
+
+
+def clone_version(source_dir, root=VECTOR_DB_ROOT) -> Tuple[str, str]:
+    """기존 DB 디렉토리를 새 버전으로 복사 (증분 적재는 복사본에 반영 후 전환)"""
+    version, path = create_version_dir(root)
+    shutil.copytree(source_dir, path, dirs_exist_ok=True)
+    logger.info(f"벡터DB 복사: {source_dir} → {path}")
+    return version, path
+
+
+def snapshot_cases(source_path, db_dir) -> str:
+    """원본 사례 파일을 버전 디렉토리에 복사 (다른 확장자의 이전 스냅샷은 삭제)"""
+    extension = os.path.splitext(source_path)[1].lower()
+    if extension not in CASE_SNAPSHOT_EXTENSIONS:
+        extension = ".json"
+
+    for other in CASE_SNAPSHOT_EXTENSIONS:
+        other_path = os.path.join(db_dir, CASE_SNAPSHOT_NAME + other)
+        if other != extension and os.path.exists(other_path):
+            os.remove(other_path)
+
+    path = os.path.join(db_dir, CASE_SNAPSHOT_NAME + extension)
+    tmp_path = path + ".tmp"
+    shutil.copyfile(source_path, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def find_case_snapshot(db_dir) -> Optional[str]:
+    """버전 디렉토리의 원본 사례 스냅샷 경로 (스냅샷 도입 이전 버전이면 None)"""
+    for extension in CASE_SNAPSHOT_EXTENSIONS:
+        path = os.path.join(db_dir, CASE_SNAPSHOT_NAME + extension)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def list_versions(root=VECTOR_DB_ROOT) -> List[Dict]:
+    """버전 목록 (오래된 순)"""
+    if not os.path.isdir(root):
+        return []
+
+    active = read_active_version(root) or {}
+    return [{
+        "version": name,
+        "path": os.path.join(root, name),
+        "active": name == active.get("version"),
+    } for name in sorted(os.listdir(root))
+        if _VERSION_PATTERN.match(name) and os.path.isdir(os.path.join(root, name))]
+
+
+def activate_version(version, root=VECTOR_DB_ROOT, keep=VECTOR_DB_KEEP_VERSIONS) -> Dict:
+    """
+    활성 버전 전환 (active.json 원자적 교체, 오래된 버전 정리)
+
+    Raises:
+        ValueError: 버전 디렉토리가 없는 경우
+    """
+    path = os.path.join(root, version)
+    if not _VERSION_PATTERN.match(version or "") or not os.path.isdir(path):
+        raise ValueError(f"벡터DB 버전을 찾을 수 없습니다: {version}")
+
+    current = read_active_version(root) or {}
+    previous = current.get("version")
+    if previous == version:  # 같은 버전 재활성화 시 직전 버전 유지
+        previous = current.get("previous")
+
+    active = {
+        "version": version,
+        "path": os.path.abspath(path),
+        "activated_at": datetime.now().isoformat(timespec="seconds"),
+        "previous": previous,
+    }
+
+    active_path = os.path.join(root, ACTIVE_VERSION_FILE)
+    tmp_path = active_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(active, f, ensure_ascii=False)
+    os.replace(tmp_path, active_path)
+    logger.info(f"벡터DB 활성 버전 전환: {active['previous']} → {version}")
+
+    prune_versions(root, keep)
+    return active
+
+
+def prune_versions(root=VECTOR_DB_ROOT, keep=VECTOR_DB_KEEP_VERSIONS) -> List[str]:
+    """오래된 버전 삭제 (최근 keep개와 활성/직전 버전은 보관)"""
+    active = read_active_version(root) or {}
+    protected = {active.get("version"), active.get("previous")}
+    versions = [entry["version"] for entry in list_versions(root)]
+
+    removed = []
+    for version in versions[:max(0, len(versions) - keep)]:
+        if version in protected:
+            continue
+        try:
+            shutil.rmtree(os.path.join(root, version))
+            removed.append(version)
+        except OSError as e:
+            logger.warning(f"벡터DB 버전 삭제 실패 ({version}): {e}")
+
+    if removed:
+        logger.info(f"오래된 벡터DB 버전 삭제: {removed}")
+    return removed
@@ -75,11 +75,18 @@ app.register_blueprint(cable_bp)
 app.register_blueprint(zmqtest_bp)
 
 
-from api.scripts.llm_loader_2 import initialize_llm
-# 서버 시작 시 LLM 모델 초기화 (1회만 수행)
-print("LLM 모델 초기화 중...")
-initialize_llm()
-print("LLM 모델 초기화 완료")
+from api.scripts.llm_loader_2 import LLM_LOAD_MODE, get_llm_status, initialize_llm, start_llm_loading
+# 서버 시작 시 LLM 모델 초기화 (기본: 백그라운드 로딩, 준비 여부는 /ready에서 확인)
+if LLM_LOAD_MODE == "eager":
+    print("LLM 모델 초기화 중...")
+    initialize_llm()
+    print("LLM 모델 초기화 완료")
+elif LLM_LOAD_MODE == "background":
+    print(f"LLM 모델 백그라운드 로딩 시작: {start_llm_loading()}")
+
+from api.scripts.lexical_index import LEXICAL_STATE_READY, get_lexical_index
+# 서버 시작 시 장애사례 어휘 색인 백그라운드 생성 (활성 벡터DB 버전의 사례, 준비 여부는 /ready에서 확인)
+print(f"장애사례 어휘 색인 백그라운드 생성 시작: {get_lexical_index().stats()['state']}")
 
 
 # AppDu health_check 함수 절대 지우지 말것 
@@ -91,6 +98,28 @@ def health_check():
     else:
         return json.dumps({'returnCode': 'NG', 'message': 'Method ' + request.method + ' not allowed.'}), 405
 
+# readiness: LLM/어휘 색인 준비 전·실패 시 503 (liveness는 health_check)
+# LLM_READY_REQUIRED=0, LEXICAL_READY_REQUIRED=0이면 해당 상태와 무관하게 OK
+@app.route('/ready', methods = ['GET'])
+def ready():
+    llm_status = get_llm_status()
+    if llm_status['state'] in ('not_loaded', 'failed'):
+        # lazy 모드는 첫 요청 전까지 로딩하지 않으므로 readiness 확인 시 로딩 시작 (실패 후 재시도 간격은 로더에서 관리)
+        start_llm_loading()
+        llm_status = get_llm_status()
+    lexical_status = get_lexical_index().stats()
+
+    waiting = []
+    if os.environ.get('LLM_READY_REQUIRED', '1') != '0' and llm_status['state'] != 'ready':
+        waiting.append('LLM ' + llm_status['state'])
+    if os.environ.get('LEXICAL_READY_REQUIRED', '1') != '0' and lexical_status['state'] != LEXICAL_STATE_READY:
+        waiting.append('lexical index ' + lexical_status['state'])
+
+    if not waiting:
+        return json.dumps({'returnCode': 'OK', 'llm': llm_status, 'lexical_index': lexical_status})
+    return json.dumps({'returnCode': 'NG', 'message': ', '.join(waiting), 'llm': llm_status,
+                       'lexical_index': lexical_status}), 503
+
 if __name__ == '__main__':
     with app.app_context():
         # 앱 컨텍스트 내에서 모델 초기화
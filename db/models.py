@@ -178,7 +178,7 @@ class TblSnmpInfo(db.Model):
     equip_id = db.Column(db.Integer, db.ForeignKey(
         'tbl_equipment.id'), nullable=False)
 
-    equip_name = db.Column(db.String(100))
+    equip_name = db.Column(db.String(100), index=True)
     equip_type = db.Column(db.String(100))
     snmp_ip = db.Column(db.String(50))
     community = db.Column(db.String(50))
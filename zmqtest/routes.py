@@ -10,9 +10,10 @@ import pymysql
 import pandas as pd
 import numpy as np
 
-import zmq
 import json
 
+from api.scripts.mw_zmq_poller import MwPollError, MwPollTimeout, get_mw_zmq_poller
+
 zmqtest_bp = Blueprint("zmqtest", __name__, template_folder="../templates/zmqtest")
 
 
@@ -23,12 +24,8 @@ def index():
     print("=========================================")
     print("zmq Page on")
 
-    context = zmq.Context()
-    socket = context.socket(zmq.REQ)
-    socket.connect("tcp://10.58.241.61:5555")
-
-    # ⏱️ 5초(5000ms) 타임아웃 설정
-    socket.setsockopt(zmq.RCVTIMEO, 5000)
+    # 요청마다 Context/소켓을 새로 만들지 않고 공용 폴러 재사용
+    poller = get_mw_zmq_poller("tcp://10.58.241.61:5555")
 
     req = {
         "target_ip": "10.48.0.70",
@@ -37,12 +34,14 @@ def index():
     }
 
     try:
-        socket.send_string(json.dumps(req))
-        res = socket.recv_string()
-        print("📡 응답:", res)
-    except zmq.Again:
-        print("❌ 응답 없음! 타임아웃 발생") 
-    
+        # ⏱️ 5초(5000ms) 타임아웃 설정
+        res = poller.request(req, timeout_ms=5000)
+        print("📡 응답:", json.dumps(res, ensure_ascii=False))
+    except MwPollTimeout:
+        print("❌ 응답 없음! 타임아웃 발생")
+    except MwPollError as e:
+        print("❌ 소켓 통신 오류:", str(e))
+
 
     return render_template("zmqtest/index.html")
 